@@ -42,6 +42,7 @@ class CenterGroup(CenterAdaptor):
         self.__is_active = active
         self.__center_portal: Optional[ProjectAdaptor] = None
         self.__redcap_param_repo: Optional[REDCapParametersRepository] = None
+        self.__projects: Dict[str, ProjectAdaptor] = {}
 
     @classmethod
     def create_from_group(cls, *, proxy: FlywheelProxy,
@@ -121,10 +122,12 @@ class CenterGroup(CenterAdaptor):
         metadata_project = center_group.get_metadata()
         assert metadata_project, "expecting metadata project"
         metadata_project.add_admin_users(center_group.get_user_access())
-        metadata_project.update_info({
-            'adcid': center.adcid,
-            'active': center.active
-        })
+        center_metadata = {'adcid': center.adcid, 'active': center.active}
+        metadata_info = metadata_project.get_info() or {}
+        if any(
+                metadata_info.get(key) != value
+                for key, value in center_metadata.items()):
+            metadata_project.update_info(center_metadata)
 
         center_group.add_center_portal()
         return center_group
@@ -382,18 +385,49 @@ class CenterGroup(CenterAdaptor):
         Args:
           redcap_project: the REDCap project input
         """
+        self.add_redcap_projects([redcap_project])
+
+    def add_redcap_projects(
+            self, redcap_projects: List['REDCapProjectInput']) -> None:
+        """Adds the REDCap projects to the center group.
+
+        The project metadata for the center is read once, and written once
+        after all of the projects are added.
+
+        Args:
+          redcap_projects: the REDCap project inputs
+        Raises:
+          CenterError: if info in portal project is not in expected format
+        """
         project_info = self.get_project_info()
+        added = [
+            self.__add_redcap_project_to(project_info, redcap_project)
+            for redcap_project in redcap_projects
+        ]
+        if any(added):
+            self.update_project_info(project_info)
+
+    def __add_redcap_project_to(self, project_info: 'CenterProjectMetadata',
+                                redcap_project: 'REDCapProjectInput') -> bool:
+        """Adds the REDCap project to the project metadata.
+
+        Args:
+          project_info: the project metadata for the center
+          redcap_project: the REDCap project input
+        Returns:
+          True if the project was added. False, otherwise
+        """
         study_info = project_info.studies.get(redcap_project.study_id, None)
         if not study_info:
             log.warning('no study info for study %s in center %s',
                         redcap_project.study_id, self.label)
-            return
+            return False
 
         ingest_project = study_info.get_ingest(redcap_project.project_label)
         if not ingest_project:
             log.warning('no ingest project for study %s in center %s',
                         redcap_project.study_id, self.label)
-            return
+            return False
 
         if isinstance(ingest_project, FormIngestProjectMetadata):
             form_ingest_project = ingest_project  # get any existing redcap metadata
@@ -406,7 +440,7 @@ class CenterGroup(CenterAdaptor):
 
         study_info.add_ingest(form_ingest_project)
         project_info.add(study_info)
-        self.update_project_info(project_info)
+        return True
 
     def get_project_info(self) -> 'CenterProjectMetadata':
         """Gets the portal info for this center.
@@ -455,17 +489,25 @@ class CenterGroup(CenterAdaptor):
         """Adds a project with the label to this group and returns the
         corresponding ProjectAdaptor.
 
+        Projects added through this object are remembered, so adding the
+        same project again does not repeat the lookup and permission updates.
+
         Args:
           label: the label for the project
         Returns:
           the ProjectAdaptor for the project
         """
+        project = self.__projects.get(label)
+        if project:
+            return project
+
         project = self.get_project(label)
         if not project:
             raise CenterError(f"failed to create project {self.label}/{label}")
 
         project.add_tags(self.get_tags())
         project.add_admin_users(self.get_user_access())
+        self.__projects[label] = project
         return project
 
     def add_user_roles(self, user: User, auth_email: str,
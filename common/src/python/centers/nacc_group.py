@@ -1,6 +1,8 @@
 """Singleton class representing NACC with a FW group."""
 import logging
-from typing import List, Optional
+from contextlib import contextmanager
+from threading import RLock
+from typing import Iterator, List, Optional
 
 from flywheel.models.group import Group
 from flywheel.models.user import User
@@ -33,6 +35,10 @@ class NACCGroup(CenterAdaptor):
         super().__init__(group=group, proxy=proxy)
         self.__admin_project: Optional[ProjectAdaptor] = None
         self.__redcap_param_repo: Optional[REDCapParametersRepository] = None
+        self.__center_map: Optional[CenterMapInfo] = None
+        self.__center_map_lock = RLock()
+        self.__batch_depth = 0
+        self.__center_map_changed = False
 
     @classmethod
     def create(cls,
@@ -77,58 +83,124 @@ class NACCGroup(CenterAdaptor):
                   active: bool) -> None:
         """Adds the adcid-group correspondence.
 
+        The center map is written to the metadata project unless the center
+        is unchanged, or the call is within a center_map_batch block.
+
         Args:
           adcid: the ADC ID
           group_label: the label for the center group
           group_id: the ID for the center group
           active: active or inactive status for the center.
         """
-        metadata = self.get_metadata()
-        center_map = self.get_center_map()
-        center_map.add(
-            adcid,
-            CenterInfo(adcid=adcid,
-                       name=group_label,
-                       group=group_id,
-                       active=active))
+        center_info = CenterInfo(adcid=adcid,
+                                 name=group_label,
+                                 group=group_id,
+                                 active=active)
+        with self.__center_map_lock:
+            center_map = self.__get_cached_center_map()
+            if center_map.get(adcid) == center_info:
+                log.info('Center %s unchanged in center map', adcid)
+                return
+
+            center_map.add(adcid, center_info)
+            self.__center_map_changed = True
+            if self.__batch_depth == 0:
+                self.__write_center_map()
+
+    @contextmanager
+    def center_map_batch(self) -> Iterator[None]:
+        """Defers writes of the center map until the end of the block, so
+        that centers added within the block are written with one update.
+
+        The map is written when the block exits, including on an exception,
+        so that centers that were created are not left out of the map.
+
+        Blocks may be nested, in which case the map is written when the
+        outermost block exits.
+        """
+        with self.__center_map_lock:
+            self.__batch_depth += 1
+        try:
+            yield
+        finally:
+            with self.__center_map_lock:
+                self.__batch_depth -= 1
+                if self.__batch_depth == 0 and self.__center_map_changed:
+                    self.__write_center_map()
+
+    def __write_center_map(self) -> None:
+        """Writes the cached center map to the metadata project info."""
+        assert self.__center_map is not None, "expecting loaded center map"
         exclude = {'centers': {'__all__': {'tags'}}}
-        metadata.update_info(center_map.model_dump(exclude=exclude))
+        self.get_metadata().update_info(
+            self.__center_map.model_dump(exclude=exclude))
+        self.__center_map_changed = False
+
+    def __get_cached_center_map(self) -> CenterMapInfo:
+        """Returns the center map, reading it from the metadata project the
+        first time it is needed.
+
+        Returns:
+          the cached center map
+        """
+        with self.__center_map_lock:
+            if self.__center_map is None:
+                self.__center_map = self.__read_center_map()
+
+            return self.__center_map
+
+    def __read_center_map(self) -> CenterMapInfo:
+        """Reads the center map from the metadata project info.
+
+        Returns:
+          the center map. Empty if the info cannot be parsed
+        """
+        project = self.get_metadata()
+        info = project.get_info()
+
+        if not info:
+            return CenterMapInfo(centers={})
+
+        try:
+            return CenterMapInfo.model_validate(info)
+        except ValidationError as error:
+            log.error('unable to parse center table: %s', str(error))
+            return CenterMapInfo(centers={})
+
+    def clear_center_map_cache(self) -> None:
+        """Discards the cached center map, so that it is read again from the
+        metadata project."""
+        with self.__center_map_lock:
+            if self.__center_map_changed:
+                log.warning('Discarding unwritten center map changes')
+            self.__center_map = None
+            self.__center_map_changed = False
 
     def get_center_map(self,
                        center_filter: Optional[List[str]] = None
                        ) -> CenterMapInfo:
         """Returns the adcid-group map.
 
+        The map is read from the metadata project once and cached.
+
         Args:
             center_filter: Optional list of ADCIDs to filter on for a mapping subset
         Returns:
           dictionary mapping adcid to adcid-group label correspondence
         """
-        project = self.get_metadata()
-        info = project.get_info()
-
-        if not info:
-            return CenterMapInfo(centers={})
+        with self.__center_map_lock:
+            centers = dict(self.__get_cached_center_map().centers)
 
         if center_filter:
             log.info(
                 f"Filtering mapping to the following centers: {center_filter}")
-            if 'centers' not in info:
-                log.error("Expected 'centers' attribute in metadata info")
-                return CenterMapInfo(centers={})
-
-            info['centers'] = {
-                adcid: data
-                for adcid, data in info['centers'].items()
-                if adcid in center_filter
+            centers = {
+                adcid: center_info
+                for adcid, center_info in centers.items()
+                if str(adcid) in center_filter
             }
-        try:
-            center_map = CenterMapInfo.model_validate(info)
-        except ValidationError as error:
-            log.error('unable to parse center table: %s', str(error))
-            center_map = CenterMapInfo(centers={})
 
-        return center_map
+        return CenterMapInfo(centers=centers)
 
     def get_adcid(self, group_id: str) -> Optional[int]:
         """Returns the ADCID for the center group.
@@ -1,8 +1,9 @@
 """Utilities to handle dates."""
 
 import re
-from datetime import datetime
-from typing import List, Optional
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Pattern
 
 from dateutil import parser
 
@@ -10,6 +11,19 @@ DATE_FORMATS = ['%m/%d/%Y', '%m-%d-%Y', '%Y/%m/%d', '%Y-%m-%d']
 DATE_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])$"
 DEFAULT_DATE_FORMAT = '%Y-%m-%d'
 
+# Patterns for the DATE_FORMATS that dateutil parses without ambiguity.
+# Years are limited to four digits, since strptime would accept fewer.
+DATE_FORMAT_PATTERNS: Dict[str, Pattern[str]] = {
+    '%m/%d/%Y':
+    re.compile(r"^(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>[1-9]\d{3})$"),
+    '%m-%d-%Y':
+    re.compile(r"^(?P<month>\d{1,2})-(?P<day>\d{1,2})-(?P<year>[1-9]\d{3})$"),
+    '%Y/%m/%d':
+    re.compile(r"^(?P<year>[1-9]\d{3})/(?P<month>\d{1,2})/(?P<day>\d{1,2})$"),
+    '%Y-%m-%d':
+    re.compile(r"^(?P<year>[1-9]\d{3})-(?P<month>\d{1,2})-(?P<day>\d{1,2})$")
+}
+
 
 def parse_date(*, date_string: str, formats: List[str]) -> datetime:
     """Parses the date string against the list of formats.
@@ -34,6 +48,26 @@ def parse_date(*, date_string: str, formats: List[str]) -> datetime:
 def convert_date(*, date_string: str, date_format: str) -> Optional[str]:
     """Convert the date string to desired format.
 
+    Uses a shared DateNormalizer for the date format.
+
+    Args:
+        date_string: a date as a string
+        date_format: desired date format
+
+    Returns:
+        Converted date string or None if conversion failed
+    """
+    normalizer = _NORMALIZERS.get(date_format)
+    if not normalizer:
+        normalizer = DateNormalizer(date_format=date_format)
+        _NORMALIZERS[date_format] = normalizer
+
+    return normalizer.normalize(date_string)
+
+
+def parse_convert_date(*, date_string: str, date_format: str) -> Optional[str]:
+    """Convert the date string to desired format using the dateutil parser.
+
     Args:
         date_string: a date as a string
         date_format: desired date format
@@ -51,6 +85,124 @@ def convert_date(*, date_string: str, date_format: str) -> Optional[str]:
         return None
 
 
+class DateNormalizer:
+    """Converts date strings to a date format.
+
+    Tries the DATE_FORMATS first, starting with the format most often matched
+    so far, and only uses the dateutil parser for other strings.
+    Results are memoized, so a normalizer should be used for a single file or
+    column of dates.
+    """
+
+    def __init__(self,
+                 date_format: str = DEFAULT_DATE_FORMAT,
+                 cache_size: int = 10000) -> None:
+        """Initializes the normalizer.
+
+        Args:
+          date_format: desired date format
+          cache_size: the maximum number of memoized date strings
+        """
+        self.__date_format = date_format
+        self.__cache_size = cache_size
+        self.__cache: Dict[str, Optional[str]] = {}
+        self.__formats = list(DATE_FORMAT_PATTERNS.keys())
+        self.__format_counts: Counter[str] = Counter()
+
+    @property
+    def dominant_format(self) -> Optional[str]:
+        """Returns the input format matched most often, if any."""
+        if not self.__format_counts:
+            return None
+
+        return self.__formats[0]
+
+    def __match_format(self, date_string: str) -> Optional[date]:
+        """Matches the date string against the known formats.
+
+        Moves a matched format to the front once it has matched more strings
+        than the current first format.
+
+        Args:
+          date_string: a date as a string
+        Returns:
+          the date if the string matches a format. None, otherwise.
+        """
+        for index, date_format in enumerate(self.__formats):
+            match = DATE_FORMAT_PATTERNS[date_format].match(date_string)
+            if not match:
+                continue
+
+            try:
+                result = date(int(match.group('year')),
+                              int(match.group('month')),
+                              int(match.group('day')))
+            except ValueError:
+                return None
+
+            self.__format_counts[date_format] += 1
+            if index > 0 and (self.__format_counts[date_format]
+                              > self.__format_counts[self.__formats[0]]):
+                self.__formats.insert(0, self.__formats.pop(index))
+
+            return result
+
+        return None
+
+    def normalize(self, date_string: str) -> Optional[str]:
+        """Convert the date string to the date format of this normalizer.
+
+        Args:
+            date_string: a date as a string
+
+        Returns:
+            Converted date string or None if conversion failed
+        """
+        if not isinstance(date_string, str):
+            return parse_convert_date(date_string=date_string,
+                                      date_format=self.__date_format)
+
+        if date_string in self.__cache:
+            return self.__cache[date_string]
+
+        matched_date = self.__match_format(date_string)
+        if matched_date:
+            result: Optional[str] = matched_date.strftime(self.__date_format)
+        else:
+            result = parse_convert_date(date_string=date_string,
+                                        date_format=self.__date_format)
+
+        if len(self.__cache) >= self.__cache_size:
+            self.__cache.clear()
+        self.__cache[date_string] = result
+
+        return result
+
+    def normalize_column(self, values: Iterable[Any]) -> List[Optional[str]]:
+        """Converts a column of date strings to the date format.
+
+        Each distinct string is converted once.
+
+        Args:
+          values: the date strings
+        Returns:
+          the list of converted strings, with None where conversion failed
+        """
+        column = list(values)
+        converted = {
+            value: self.normalize(value)
+            for value in set(column) if isinstance(value, str)
+        }
+        return [
+            converted[value]
+            if isinstance(value, str) else self.normalize(value)
+            for value in column
+        ]
+
+
+_NORMALIZERS: Dict[str, DateNormalizer] = {}
+
+
 class DateFormatException(Exception):
 
     def __init__(self, formats: List[str]) -> None:
@@ -2,15 +2,21 @@
 center."""
 
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
-from flywheel_adaptor.flywheel_proxy import ProjectAdaptor
+from flywheel.rest import ApiException
+from flywheel_adaptor.flywheel_proxy import DEFAULT_MAX_WORKERS, ProjectAdaptor
 from keys.keys import MetadataKeys
 from pydantic import BaseModel, ValidationError
 from typing_extensions import override
 
 from enrollment.enrollment_subject import EnrollmentSubject
-from enrollment.enrollment_transfer import EnrollmentError, TransferRecord
+from enrollment.enrollment_transfer import (
+    EnrollmentError,
+    EnrollmentRecord,
+    TransferRecord,
+)
 
 log = logging.getLogger(__name__)
 
@@ -102,3 +108,53 @@ class EnrollmentProject(ProjectAdaptor):
         """
         return EnrollmentSubject.create_from(
             subject=super().add_subject(label))
+
+    def add_enrollments(
+            self,
+            records: List[EnrollmentRecord],
+            max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, str]:
+        """Adds a subject with enrollment information for each record.
+
+        Lists existing subjects once, then creates the missing subjects and
+        writes enrollment information concurrently.
+
+        Args:
+          records: the enrollment records, which must have NACCIDs
+          max_workers: the maximum number of concurrent requests
+        Returns:
+          error messages keyed by NACCID for records that were not added
+        """
+        errors: Dict[str, str] = {}
+        existing = self.get_subject_labels()
+        new_records: Dict[str, EnrollmentRecord] = {}
+        for record in records:
+            assert record.naccid, "enrollment record must have NACCID"
+            if record.naccid in existing:
+                errors[record.naccid] = (
+                    f'Subject with NACCID {record.naccid} exists')
+                continue
+            new_records[record.naccid] = record
+
+        subjects = self.add_subjects(new_records.keys(),
+                                     max_workers=max_workers)
+        for naccid in new_records:
+            if naccid not in subjects:
+                errors[naccid] = f'Failed to add subject for NACCID {naccid}'
+
+        def enroll(naccid: str) -> Optional[str]:
+            subject = EnrollmentSubject.create_from(subjects[naccid])
+            try:
+                subject.add_enrollment(new_records[naccid])
+            except (ApiException, EnrollmentError) as error:
+                log.error('Failed to add enrollment for %s: %s', naccid, error)
+                return f'Failed to add enrollment for NACCID {naccid}'
+            return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for naccid, error in zip(subjects.keys(),
+                                     executor.map(enroll, subjects.keys()),
+                                     strict=True):
+                if error:
+                    errors[naccid] = error
+
+        return errors
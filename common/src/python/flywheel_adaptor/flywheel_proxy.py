@@ -2,8 +2,9 @@
 """Defines project creation functions for calls to Flywheel."""
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from json.decoder import JSONDecodeError
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
 
 import flywheel
 from flywheel import (
@@ -28,10 +29,14 @@ from flywheel.view_builder import ViewBuilder
 from fw_client import FWClient
 from fw_utils import AttrDict
 
+from flywheel_adaptor.lookup_cache import DEFAULT_CACHE_SIZE, LookupCache
 from flywheel_adaptor.subject_adaptor import SubjectAdaptor
 
 log = logging.getLogger(__name__)
 
+# maximum number of concurrent requests for bulk container operations
+DEFAULT_MAX_WORKERS = 8
+
 
 class FlywheelError(Exception):
     """Exception class for Flywheel errors."""
@@ -40,24 +45,33 @@ class FlywheelError(Exception):
 # pylint: disable=(too-many-public-methods)
 class FlywheelProxy:
     """Defines a proxy object for group and project creation on a Flywheel
-    instance."""
+    instance.
+
+    Lookups of groups by ID, projects by group and label, and gears by name
+    are cached.
+    Methods that create or modify groups and projects invalidate the cached
+    lookups for the container.
+    """
 
     def __init__(self,
                  client: Client,
                  fw_client: Optional[FWClient] = None,
-                 dry_run: bool = True) -> None:
+                 dry_run: bool = True,
+                 cache_size: int = DEFAULT_CACHE_SIZE) -> None:
         """Initializes a flywheel proxy object.
 
         Args:
           client: the Flywheel SDK client
           fw-client: the fw-client client
           dry_run: whether proxy will be used for a dry run
+          cache_size: the maximum number of cached lookups
         """
         self.__fw = client
         self.__fw_client = fw_client
         self.__dry_run = dry_run
         self.__project_roles: Optional[Mapping[str, RoleOutput]] = None
         self.__project_admin_role: Optional[RoleOutput] = None
+        self.__cache = LookupCache(cache_size)
 
     @property
     def dry_run(self):
@@ -68,6 +82,28 @@ class FlywheelProxy:
         """
         return self.__dry_run
 
+    def invalidate_group(self, group_id: str) -> None:
+        """Removes cached lookups for the group.
+
+        Args:
+          group_id: the group ID
+        """
+        self.__cache.invalidate('group', group_id)
+
+    def invalidate_project(self, *, group_id: str, project_label: str) -> None:
+        """Removes cached lookups for the project.
+
+        Args:
+          group_id: the group ID
+          project_label: the project label
+        """
+        self.__cache.invalidate('projects', group_id, project_label)
+        self.__cache.invalidate('project', group_id, project_label)
+
+    def log_cache_stats(self) -> None:
+        """Logs the hit rate of the lookup cache."""
+        self.__cache.log_stats('Flywheel lookup')
+
     def find_projects(self, *, group_id: str,
                       project_label: str) -> List[flywheel.Project]:
         """Finds a flywheel project with a given label, within a group ID if
@@ -80,8 +116,10 @@ class FlywheelProxy:
         Returns:
             existing: a list of all matching projects.
         """
-        return self.__fw.projects.find(
-            f"parents.group={group_id},label={project_label}")
+        return self.__cache.get(
+            ('projects', group_id, project_label),
+            lambda: self.__fw.projects.find(f"parents.group={group_id},"
+                                            f"label={project_label}"))
 
     def find_groups(self, group_id: str) -> List[flywheel.Group]:
         """Searches for and returns a group if it exists.
@@ -93,7 +131,9 @@ class FlywheelProxy:
             the group (or empty list if not found)
         """
         try:
-            return self.__fw.groups.find(f'_id={group_id}')
+            return self.__cache.get(
+                ('group', group_id),
+                lambda: self.__fw.groups.find(f'_id={group_id}'))
         except ApiException as error:
             raise FlywheelError(
                 f"Cannot get group {group_id}: {error}") from error
@@ -237,6 +277,7 @@ class FlywheelProxy:
         # we must fw.get_group() with ID string to get the actual Group object.
         group = self.__fw.get_group(added_group_id)
         log.info("success")
+        self.__cache.put(('group', group_id), [group])
 
         return group
 
@@ -258,7 +299,9 @@ class FlywheelProxy:
                       project_label)
             return None
 
-        project = group.projects.find_first(f"label={project_label}")
+        project = self.__cache.get(
+            ('project', group.id, project_label),
+            lambda: group.projects.find_first(f"label={project_label}"))
         if project:
             log.info('Project %s/%s exists', group.id, project_label)
             return project
@@ -276,6 +319,7 @@ class FlywheelProxy:
             log.error('Failed to create project %s: %s', project_ref, exc)
             return None
         log.info('success')
+        self.invalidate_project(group_id=group.id, project_label=project_label)
 
         return project
 
@@ -333,6 +377,7 @@ class FlywheelProxy:
             return
 
         self.__fw.add_role_to_group(group.id, role)
+        self.invalidate_group(group.id)
 
     def get_project_gear_rules(self,
                                project: flywheel.Project) -> List[GearRule]:
@@ -587,7 +632,8 @@ class FlywheelProxy:
         Returns:
             Any: Flywheel gear object
         """
-        return self.__fw.lookup(f'gears/{gear_name}')
+        return self.__cache.get(('gear', gear_name),
+                                lambda: self.__fw.lookup(f'gears/{gear_name}'))
 
     def find_job(self, search_str: str) -> Optional[Job]:
         """Find the first Job matching the search string.
@@ -741,6 +787,7 @@ class GroupAdaptor:
             return
 
         self._group.add_tag(tag)
+        self._fw.invalidate_group(self.id)
 
     def add_tags(self, tags: Iterable[str]) -> None:
         """Adds the tags to the group.
@@ -810,16 +857,21 @@ class GroupAdaptor:
                         new_permission.id)
             return
 
+        existing_permissions = [
+            perm for perm in self._group.permissions
+            if perm.id == new_permission.id
+        ]
+        if (existing_permissions
+                and existing_permissions[0].access == new_permission.access):
+            return
+
         if self._fw.dry_run:
             log.info('Dry Run: would add access %s for user %s to group %s',
                      new_permission.access, new_permission.id,
                      self._group.label)
             return
 
-        existing_permissions = [
-            perm for perm in self._group.permissions
-            if perm.id == new_permission.id
-        ]
+        self._fw.invalidate_group(self.id)
         if not existing_permissions:
             self._group.add_permission(new_permission)
             return
@@ -913,10 +965,22 @@ class ProjectError(Exception):
 class ProjectAdaptor:
     """Defines an adaptor for a flywheel project."""
 
-    def __init__(self, *, project: flywheel.Project,
-                 proxy: FlywheelProxy) -> None:
+    def __init__(self,
+                 *,
+                 project: flywheel.Project,
+                 proxy: FlywheelProxy,
+                 subject_index: bool = False) -> None:
+        """Initializes the adaptor for the project.
+
+        Args:
+          project: the project
+          proxy: the Flywheel proxy
+          subject_index: whether to look up subjects in an in-memory index
+        """
         self._project = project
         self._fw = proxy
+        self.__use_subject_index = subject_index
+        self.__subject_index: Optional[Dict[str, flywheel.Subject]] = None
 
     @classmethod
     def create(cls, proxy: FlywheelProxy, group_id: str,
@@ -942,6 +1006,7 @@ class ProjectAdaptor:
 
     def __pull_project(self) -> None:
         """Pulls the referenced project from Flywheel instance."""
+        self.__invalidate()
         projects = self._fw.find_projects(group_id=self.group,
                                           project_label=self.label)
         if not projects:
@@ -949,6 +1014,11 @@ class ProjectAdaptor:
 
         self._project = projects[0]
 
+    def __invalidate(self) -> None:
+        """Removes cached lookups of the project from the proxy."""
+        self._fw.invalidate_project(group_id=self.group,
+                                    project_label=self.label)
+
     @property
     def proxy(self) -> FlywheelProxy:
         """Returns the flywheel proxy object."""
@@ -982,6 +1052,7 @@ class ProjectAdaptor:
         """
         if tag not in self._project.tags:
             self._project.add_tag(tag)
+            self.__invalidate()
 
     def add_tags(self, tags: Iterable[str]) -> None:
         """Adds given tags to the enclosed project.
@@ -999,6 +1070,7 @@ class ProjectAdaptor:
           state: the copyable state to set
         """
         self._project.update(copyable=state)
+        self.__invalidate()
 
     def set_description(self, description: str) -> None:
         """Sets the description of the project.
@@ -1007,6 +1079,7 @@ class ProjectAdaptor:
           description: the project description
         """
         self._project.update(description=description)
+        self.__invalidate()
 
     def get_file(self, name: str):
         """Gets the file from the enclosed project.
@@ -1021,6 +1094,7 @@ class ProjectAdaptor:
     def reload(self):
         """Forces a reload on the project."""
         self._project = self._project.reload()
+        self.__invalidate()
 
     def read_file(self, name: str) -> bytes:
         """Reads file from the named file.
@@ -1039,6 +1113,7 @@ class ProjectAdaptor:
           file_spec: the file specification
         """
         self._project.upload_file(file_spec)
+        self.__invalidate()
 
     def get_user_roles(self, user_id: str) -> List[str]:
         """Gets the list of user role ids in this project.
@@ -1278,6 +1353,7 @@ class ProjectAdaptor:
         """
         log.info("updating info for project %s", self._project.label)
         self._project.update_info(info)
+        self.__invalidate()
 
     def get_custom_project_info(
             self, key_path: str) -> Optional[Any | Dict[str, Any]]:
@@ -1299,26 +1375,120 @@ class ProjectAdaptor:
 
         return info
 
+    def enable_subject_index(self) -> None:
+        """Turns on the in-memory subject index for this project.
+
+        The index is loaded with a single listing of the project subjects on
+        the first lookup, and afterwards subjects are found by label without
+        a search request.
+        """
+        self.__use_subject_index = True
+
+    def clear_subject_index(self) -> None:
+        """Discards the subject index so that it is reloaded on next use."""
+        self.__subject_index = None
+
+    def __get_subject_index(self) -> Dict[str, flywheel.Subject]:
+        """Returns the subject index, loading it if needed.
+
+        Returns:
+          the subjects of this project keyed by label
+        """
+        if self.__subject_index is None:
+            self.__subject_index = {
+                subject.label: subject
+                for subject in self._project.subjects.iter()
+            }
+            log.info('Indexed %s subjects in %s/%s', len(self.__subject_index),
+                     self.group, self.label)
+
+        return self.__subject_index
+
     def add_subject(self, label: str) -> SubjectAdaptor:
         """Adds a subject with the given label.
 
+        If the subject index is in use and the subject was added after the
+        index was loaded, returns the existing subject.
+
         Args:
           label: the subject label
         Returns:
           the created Subject object
         """
-        return SubjectAdaptor(self._project.add_subject(label=label))
+        try:
+            subject = self._project.add_subject(label=label)
+        except ApiException as error:
+            if self.__subject_index is None or error.status != 409:
+                raise
+
+            subject = self._project.subjects.find_first(f'label={label}')
+            if not subject:
+                raise
+
+        if self.__subject_index is not None:
+            self.__subject_index[label] = subject
+
+        return SubjectAdaptor(subject)
 
     def find_subject(self, label: str) -> Optional[SubjectAdaptor]:
         """Finds the subject with the label.
 
+        Uses the subject index if enabled.
+
         Args:
           label: the subject label
         Returns:
           the Subject object with the label. None, otherwise
         """
-        subject = self._project.subjects.find_first(f'label={label}')
+        if self.__use_subject_index:
+            subject = self.__get_subject_index().get(label)
+        else:
+            subject = self._project.subjects.find_first(f'label={label}')
         if subject:
             return SubjectAdaptor(subject)
 
         return None
+
+    def get_subject_labels(self) -> Set[str]:
+        """Returns the labels of all subjects in this project.
+
+        Returns:
+          the set of subject labels
+        """
+        if self.__use_subject_index:
+            return set(self.__get_subject_index().keys())
+
+        return {subject.label for subject in self._project.subjects.iter()}
+
+    def add_subjects(self,
+                     labels: Iterable[str],
+                     max_workers: int = DEFAULT_MAX_WORKERS
+                     ) -> Dict[str, SubjectAdaptor]:
+        """Adds subjects with the given labels concurrently.
+
+        Subjects that cannot be created are logged and omitted from the
+        result.
+
+        Args:
+          labels: the subject labels
+          max_workers: the maximum number of concurrent requests
+        Returns:
+          the created subjects keyed by label
+        """
+
+        def create(label: str) -> Optional[SubjectAdaptor]:
+            try:
+                return self.add_subject(label)
+            except ApiException as error:
+                log.error('Failed to add subject %s to %s/%s: %s', label,
+                          self.group, self.label, error)
+                return None
+
+        unique_labels = list(dict.fromkeys(labels))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            subjects = executor.map(create, unique_labels)
+            return {
+                label: subject
+                for label, subject in zip(unique_labels, subjects, strict=True)
+                if subject
+            }
@@ -0,0 +1,119 @@
+"""Defines a size-bounded cache for lookups of Flywheel containers.
+
+Keys are tuples whose first element is the kind of lookup, for instance
+`('group', group_id)`, so that all entries for a container can be invalidated
+by a key prefix.
+"""
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Tuple, TypeVar
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+
+CacheKey = Tuple[Hashable, ...]
+T = TypeVar('T')
+
+
+class LookupCache:
+    """Least-recently-used cache of lookup results with hit counts."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Initializes an empty cache.
+
+        Args:
+          max_size: the maximum number of entries kept in the cache
+        """
+        self.__max_size = max_size
+        self.__entries: OrderedDict[CacheKey, Any] = OrderedDict()
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups answered by the cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups not answered by the cache."""
+        return self.__misses
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: CacheKey, load: Callable[[], T]) -> T:
+        """Returns the cached value for the key, or loads and caches the value
+        if the key is not in the cache.
+
+        Exceptions raised by the load function are not cached.
+
+        Args:
+          key: the lookup key
+          load: the function to load the value
+        Returns:
+          the value for the key
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__hits += 1
+                self.__entries.move_to_end(key)
+                return self.__entries[key]
+            self.__misses += 1
+
+        value = load()
+        self.put(key, value)
+        return value
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        """Sets the cached value for the key.
+
+        Removes the least recently used entry if the cache is full.
+
+        Args:
+          key: the lookup key
+          value: the value
+        """
+        if self.__max_size <= 0:
+            return
+
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, *prefix: Hashable) -> None:
+        """Removes the entries with keys that start with the prefix.
+
+        Removes all entries if no prefix is given.
+
+        Args:
+          prefix: the leading elements of the keys to remove
+        """
+        with self.__lock:
+            if not prefix:
+                self.__entries.clear()
+                return
+
+            for key in [
+                    key for key in self.__entries
+                    if key[:len(prefix)] == prefix
+            ]:
+                del self.__entries[key]
+
+    def log_stats(self, name: str) -> None:
+        """Logs the hit rate of the cache.
+
+        Args:
+          name: the name of the cache for the log message
+        """
+        lookups = self.__hits + self.__misses
+        if not lookups:
+            return
+
+        log.info('%s cache: %s hits, %s misses (%.1f%% hit rate)', name,
+                 self.__hits, self.__misses, 100.0 * self.__hits / lookups)
@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 from dates.form_dates import DATE_PATTERN
 from flywheel.file_spec import FileSpec
 from flywheel.finder import Finder
+from flywheel.models.acquisition import Acquisition
 from flywheel.models.file_entry import FileEntry
 from flywheel.models.session import Session
 from flywheel.models.subject import Subject
@@ -80,10 +81,17 @@ class ParticipantVisits(BaseModel):
 
 
 class SubjectAdaptor:
-    """Base wrapper class for flywheel subject."""
+    """Base wrapper class for flywheel subject.
+
+    Sessions and acquisitions of the subject are cached by label when first
+    looked up, and the cache is kept up to date when containers are created
+    or files uploaded through this adaptor.
+    """
 
     def __init__(self, subject: Subject) -> None:
         self._subject = subject
+        self.__sessions: Optional[Dict[str, Session]] = None
+        self.__acquisitions: Dict[str, Dict[str, Acquisition]] = {}
 
     @property
     def info(self) -> Dict[str, Any]:
@@ -124,19 +132,70 @@ class SubjectAdaptor:
         Returns:
           the added session
         """
-        return self._subject.add_session(label=label)
+        session = self._subject.add_session(label=label)
+        if self.__sessions is not None:
+            self.__sessions[label] = session
+        self.__acquisitions[label] = {}
+        return session
 
     def find_session(self, label: str) -> Optional[Session]:
         """Finds the session with specified label.
 
+        Sessions of the subject are listed on the first lookup.
+
         Args:
           label: the label for the session
 
         Returns:
           Session container or None
         """
+        if self.__sessions is None:
+            self.__sessions = {}
+            for session in self.sessions.iter():
+                self.__sessions.setdefault(session.label, session)
+
+        return self.__sessions.get(label)
+
+    def find_acquisition(self, *, session: Session,
+                         acquisition_label: str) -> Optional[Acquisition]:
+        """Finds the acquisition with specified label in the session.
+
+        Acquisitions of the session are listed on the first lookup.
+
+        Args:
+          session: the session of this subject
+          acquisition_label: the label for the acquisition
+        Returns:
+          Acquisition container or None
+        """
+        acquisitions = self.__acquisitions.get(session.label)
+        if acquisitions is None:
+            acquisitions = {}
+            for acquisition in session.acquisitions.iter():
+                acquisitions.setdefault(acquisition.label, acquisition)
+            self.__acquisitions[session.label] = acquisitions
+
+        return acquisitions.get(acquisition_label)
+
+    def add_acquisition(self, *, session: Session,
+                        acquisition_label: str) -> Acquisition:
+        """Adds and returns a new acquisition in the session.
+
+        Args:
+          session: the session of this subject
+          acquisition_label: the label for the acquisition
+        Returns:
+          the added acquisition
+        """
+        acquisition = session.add_acquisition(label=acquisition_label)
+        self.__acquisitions.setdefault(session.label,
+                                       {})[acquisition_label] = acquisition
+        return acquisition
 
-        return self.sessions.find_first(f'label={label}')
+    def clear_cache(self) -> None:
+        """Discards the cached sessions and acquisitions of this subject."""
+        self.__sessions = None
+        self.__acquisitions.clear()
 
     def update(self, info: Dict[str, Any]) -> None:
         """Updates the info object for this subject.
@@ -254,13 +313,14 @@ class SubjectAdaptor:
                 session_label, self.label)
             session = self.add_session(session_label)
 
-        acquisition = session.acquisitions.find_first(
-            f'label={acquisition_label}')
+        acquisition = self.find_acquisition(
+            session=session, acquisition_label=acquisition_label)
         if not acquisition:
             log.info(
                 'Acquisition %s does not exist in session %s, '
                 'creating a new acquisition', acquisition_label, session_label)
-            acquisition = session.add_acquisition(label=acquisition_label)
+            acquisition = self.add_acquisition(
+                session=session, acquisition_label=acquisition_label)
 
         if skip_duplicates:
             existing_file = acquisition.get_file(filename)
@@ -278,6 +338,8 @@ class SubjectAdaptor:
         try:
             acquisition.upload_file(record_file_spec)
             acquisition = acquisition.reload()
+            self.__acquisitions.setdefault(session.label,
+                                           {})[acquisition_label] = acquisition
             return acquisition.get_file(filename)
         except ApiException as error:
             raise SubjectError(
@@ -323,8 +385,8 @@ class SubjectAdaptor:
         if not session:
             return None
 
-        acquisition = session.acquisitions.find_first(
-            f'label={acquisition_label}')
+        acquisition = self.find_acquisition(
+            session=session, acquisition_label=acquisition_label)
         if not acquisition:
             return None
 
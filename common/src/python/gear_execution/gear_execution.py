@@ -28,12 +28,19 @@ class ClientWrapper:
         self.__client = client
         self.__fw_client: Optional[FWClient] = None
         self.__dry_run = dry_run
+        self.__proxy: Optional[FlywheelProxy] = None
 
     def get_proxy(self) -> FlywheelProxy:
-        """Returns a proxy object for this client object."""
-        return FlywheelProxy(client=self.__client,
-                             fw_client=self.__fw_client,
-                             dry_run=self.__dry_run)
+        """Returns a proxy object for this client object.
+
+        The same proxy is returned by each call so that lookups cached by the
+        proxy are shared.
+        """
+        if self.__proxy is None:
+            self.__proxy = FlywheelProxy(client=self.__client,
+                                         fw_client=self.__fw_client,
+                                         dry_run=self.__dry_run)
+        return self.__proxy
 
     def set_fw_client(self, fw_client: FWClient) -> None:
         """Sets the FWClient needed by some proxy methods.
@@ -42,6 +49,7 @@ class ClientWrapper:
           fw_client: the FWClient object
         """
         self.__fw_client = fw_client
+        self.__proxy = None
 
     @property
     def host(self) -> str:
@@ -340,6 +348,7 @@ class GearEngine:
                 visitor = gear_type.create(
                     context=context, parameter_store=self.parameter_store)
                 visitor.run(context)
+                visitor.proxy.log_cache_stats()
         except GearExecutionError as error:
             log.error('Error: %s', error)
             sys.exit(1)
@@ -0,0 +1,288 @@
+"""Identifier repository that keeps an in-memory index of identifiers.
+
+Wraps another repository so that identifiers referenced by a batch of rows
+can be resolved up front with bulk queries, and later lookups for the same
+identifiers do not go back to the underlying repository.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    overload,
+)
+
+from pydantic import ValidationError
+
+from identifiers.identifiers_repository import (
+    IdentifierQueryObject,
+    IdentifierRepository,
+    IdentifierRepositoryError,
+)
+from identifiers.model import IdentifierList, IdentifierObject
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+CenterKey = Tuple[int, str]
+K = TypeVar('K')
+
+
+def center_key(adcid: int | str, ptid: str) -> Optional[CenterKey]:
+    """Returns the index key for the ADCID, PTID pair.
+
+    Args:
+      adcid: the center ID, which may be the string from a CSV row
+      ptid: the participant ID assigned by the center
+    Returns:
+      the key for the pair. None if the ADCID is not an integer
+    """
+    try:
+        return int(adcid), ptid
+    except (TypeError, ValueError):
+        return None
+
+
+class CachedIdentifierRepository(IdentifierRepository):
+    """Identifier repository that indexes identifiers from another repository.
+
+    Lookups are answered from the index when possible. For a center whose
+    identifiers have been listed, a PTID that is not in the index is known not
+    to exist.
+    """
+
+    def __init__(self,
+                 repo: IdentifierRepository,
+                 max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        """Initializes the index for the repository.
+
+        Args:
+          repo: the underlying repository
+          max_workers: the maximum number of concurrent lookups in prefetch
+        """
+        self.__repo = repo
+        self.__max_workers = max_workers
+        self.__naccids: Dict[str, Optional[IdentifierObject]] = {}
+        self.__guids: Dict[str, Optional[IdentifierObject]] = {}
+        self.__ptids: Dict[CenterKey, Optional[IdentifierObject]] = {}
+        self.__centers: Set[int] = set()
+        self.__unverified: Set[CenterKey] = set()
+
+    def __add(self, identifier: IdentifierObject) -> None:
+        """Adds the identifier to the index.
+
+        Args:
+          identifier: the identifier object
+        """
+        self.__naccids[identifier.naccid] = identifier
+        self.__ptids[(identifier.adcid, identifier.ptid)] = identifier
+        self.__unverified.discard((identifier.adcid, identifier.ptid))
+        if identifier.guid:
+            self.__guids[identifier.guid] = identifier
+
+    def prefetch(
+        self,
+        *,
+        adcids: Iterable[int] = (),
+        naccids: Iterable[str] = (),
+        guids: Iterable[str] = (),
+        ptids: Iterable[CenterKey] = ()
+    ) -> None:
+        """Loads the referenced identifiers into the index.
+
+        Identifiers for each center are listed with paged queries.
+        Remaining NACCIDs, GUIDs and ADCID, PTID pairs that are not in the
+        index are looked up concurrently.
+        Failed lookups are logged and left for later lookups to report.
+
+        Args:
+          adcids: the centers whose identifiers should be listed
+          naccids: the NACCIDs to look up
+          guids: the GUIDs to look up
+          ptids: the ADCID, PTID pairs to look up
+        """
+        for adcid in set(adcids) - self.__centers:
+            try:
+                identifiers = self.__repo.list(adcid=adcid)
+            except IdentifierRepositoryError as error:
+                log.warning('Unable to list identifiers for ADCID %s: %s',
+                            adcid, error)
+                continue
+
+            for identifier in identifiers:
+                self.__add(identifier)
+            self.__centers.add(adcid)
+            log.info('Loaded %s identifiers for ADCID %s', len(identifiers),
+                     adcid)
+
+        self.__fetch(keys=naccids,
+                     index=self.__naccids,
+                     lookup=lambda naccid: self.__repo.get(naccid=naccid))
+        self.__fetch(keys=guids,
+                     index=self.__guids,
+                     lookup=lambda guid: self.__repo.get(guid=guid))
+        self.__fetch(
+            keys=[key for key in ptids if key[0] not in self.__centers],
+            index=self.__ptids,
+            lookup=lambda key: self.__repo.get(adcid=key[0], ptid=key[1]))
+
+    def __fetch(self, *, keys: Iterable[K],
+                index: Dict[K, Optional[IdentifierObject]],
+                lookup: Callable[[K], Optional[IdentifierObject]]) -> None:
+        """Looks up the keys missing from the index concurrently.
+
+        Args:
+          keys: the keys to look up
+          index: the index for the keys
+          lookup: the function to look up a single key
+        """
+        missing = [key for key in set(keys) if key not in index]
+        if not missing:
+            return
+
+        def safe_lookup(key: K) -> Tuple[K, bool, Optional[IdentifierObject]]:
+            # keys are not validated, so a malformed key is left as a miss
+            # and is reported when the row is processed
+            try:
+                return key, True, lookup(key)
+            except (IdentifierRepositoryError, ValidationError) as error:
+                log.warning('Unable to look up identifier %s: %s', key, error)
+                return key, False, None
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            for key, found, identifier in executor.map(safe_lookup, missing):
+                if not found:
+                    continue
+                index[key] = identifier
+                if identifier:
+                    self.__add(identifier)
+
+    def create(self, adcid: int, ptid: str,
+               guid: Optional[str]) -> IdentifierObject:
+        """Creates an Identifier in the repository, and adds it to the index.
+
+        Args:
+          adcid: the center id
+          ptid: the center participant ID
+          guid: the NIA GUID
+        Returns:
+          the created identifier
+        """
+        identifier = self.__repo.create(adcid=adcid, ptid=ptid, guid=guid)
+        self.__add(identifier)
+        return identifier
+
+    def create_list(
+            self, identifiers: List[IdentifierQueryObject]) -> IdentifierList:
+        """Adds a list of identifiers to the repository, and adds the created
+        identifiers to the index.
+
+        If creation fails, some of the identifiers may have been created, so
+        later lookups for the ADCID, PTID pairs use the underlying repository.
+
+        Args:
+          identifiers: the list of Identifiers
+        Returns:
+          the list of created identifiers
+        Raises:
+          IdentifierRepositoryError if the underlying repository fails
+        """
+        try:
+            created = self.__repo.create_list(identifiers)
+        except IdentifierRepositoryError:
+            self.__unverified.update(
+                (query.adcid, query.ptid) for query in identifiers)
+            raise
+
+        for identifier in created:
+            self.__add(identifier)
+        return created
+
+    @overload
+    def get(self, *, naccid: str) -> Optional[IdentifierObject]:
+        ...
+
+    @overload
+    def get(self, *, guid: str) -> Optional[IdentifierObject]:
+        ...
+
+    @overload
+    def get(self, *, adcid: int, ptid: str) -> Optional[IdentifierObject]:
+        ...
+
+    def get(self,
+            *,
+            naccid: Optional[str] = None,
+            adcid: Optional[int] = None,
+            ptid: Optional[str] = None,
+            guid: Optional[str] = None) -> Optional[IdentifierObject]:
+        """Returns Identifier object for the IDs given.
+
+        Uses the index if the identifier has been loaded, and otherwise
+        looks up and indexes the identifier in the underlying repository.
+
+        Args:
+          naccid: the NACCID
+          adcid: the center ID
+          ptid: the participant ID assigned by the center
+          guid: the NIA GUID
+        Returns:
+          the identifier for the naccid, the adcid-ptid pair or the guid
+        Raises:
+          IdentifierRepositoryError: if the lookup fails
+          TypeError: if the arguments are nonsensical
+        """
+        if naccid is not None:
+            if naccid not in self.__naccids:
+                self.__naccids[naccid] = self.__repo.get(naccid=naccid)
+            return self.__naccids[naccid]
+
+        if adcid is not None and ptid:
+            key = center_key(adcid, ptid)
+            if key is None:
+                return self.__repo.get(adcid=adcid, ptid=ptid)
+            if key not in self.__unverified:
+                if key in self.__ptids:
+                    return self.__ptids[key]
+                if key[0] in self.__centers:
+                    return None
+
+            self.__ptids[key] = self.__repo.get(adcid=adcid, ptid=ptid)
+            self.__unverified.discard(key)
+            return self.__ptids[key]
+
+        if guid:
+            if guid not in self.__guids:
+                self.__guids[guid] = self.__repo.get(guid=guid)
+            return self.__guids[guid]
+
+        raise TypeError("Invalid arguments")
+
+    @overload
+    def list(self, adcid: int) -> List[IdentifierObject]:
+        ...
+
+    @overload
+    def list(self) -> List[IdentifierObject]:
+        ...
+
+    def list(self, adcid: Optional[int] = None) -> List[IdentifierObject]:
+        """Returns the list of all identifiers in the underlying repository.
+
+        Args:
+          adcid: the ADCID used for filtering
+        Returns:
+          List of all identifiers in the repository
+        """
+        if adcid is None:
+            return self.__repo.list()
+
+        return self.__repo.list(adcid=adcid)
@@ -0,0 +1,129 @@
+"""Methods to transform a CSV file in chunks of columns.
+
+Provides an alternative to the row visitor in `inputs.csv_reader` for one-shot
+transformations of large files. The file is read in chunks as data frames so
+that a transformation can be applied to whole columns at once, and each chunk
+is written to the output before the next is read.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from csv import Error, reader
+from typing import List, TextIO
+
+import pandas as pd
+from outputs.errors import (
+    ErrorWriter,
+    empty_file_error,
+    malformed_file_error,
+    missing_header_error,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+def normalize_header(header: List[str]) -> List[str]:
+    """Normalizes the column names of a header.
+
+    Args:
+      header: the list of column names
+    Returns:
+      the column names stripped of whitespace and in lower case
+    """
+    return [column.strip().lower() for column in header]
+
+
+class ColumnarVisitor(ABC):
+    """Abstract class for a visitor for chunks of rows in a CSV file."""
+
+    @abstractmethod
+    def visit_header(self, header: List[str]) -> bool:
+        """Checks the normalized header.
+
+        Args:
+          header: list of normalized header names
+        Returns:
+          True if the header has all required fields, False otherwise
+        """
+        return True
+
+    @abstractmethod
+    def visit_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Transforms a chunk of rows.
+
+        The columns of the chunk have the normalized header names, and all
+        values are strings.
+
+        Args:
+          chunk: the data frame for consecutive rows of the file
+        Returns:
+          the data frame with the transformed rows
+        """
+        return chunk
+
+
+def transform_csv(*,
+                  input_file: TextIO,
+                  output_file: TextIO,
+                  error_writer: ErrorWriter,
+                  visitor: ColumnarVisitor,
+                  delimiter: str = ',',
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> bool:
+    """Reads the CSV file in chunks, applies the visitor to each chunk, and
+    writes the transformed chunks to the output stream.
+
+    Only one chunk is held in memory at a time.
+
+    Args:
+      input_file: the input stream for the CSV file
+      output_file: the output stream for the transformed CSV
+      error_writer: the ErrorWriter for the input file
+      visitor: the visitor
+      delimiter: expected delimiter for the CSV
+      chunk_size: the number of rows in each chunk
+    Returns:
+      True if the input file was processed without error, False otherwise
+    """
+    try:
+        header = next(reader(input_file, delimiter=delimiter), None)
+    except Error as error:
+        error_writer.write(malformed_file_error(str(error)))
+        return False
+
+    if header is None:
+        error_writer.write(empty_file_error())
+        return False
+    if not any(column.strip() for column in header):
+        error_writer.write(missing_header_error())
+        return False
+
+    header = normalize_header(header)
+    if not visitor.visit_header(header):
+        return False
+
+    write_header = True
+    count = 0
+    try:
+        chunks = pd.read_csv(input_file,
+                             sep=delimiter,
+                             header=None,
+                             names=header,
+                             dtype=str,
+                             keep_default_na=False,
+                             chunksize=chunk_size)
+        for chunk in chunks:
+            result = visitor.visit_chunk(chunk)
+            result.to_csv(output_file,
+                          header=write_header,
+                          index=False,
+                          lineterminator='\n')
+            write_header = False
+            count += len(chunk)
+    except (pd.errors.ParserError, ValueError) as error:
+        error_writer.write(malformed_file_error(str(error)))
+        return False
+
+    log.info('Transformed %s rows', count)
+    return True
@@ -0,0 +1,228 @@
+"""Defines a cache for parameters pulled from the AWS SSM parameter store.
+
+Parameters are cached by full parameter name along with the paths that have
+been loaded, so that a single load of a hierarchy can answer any later lookup
+under that hierarchy.
+The cache can be saved to and loaded from an encrypted file, which allows
+short-lived gear containers to share parameters pulled by an earlier run.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+log = logging.getLogger(__name__)
+
+
+def normalize_path(path: str) -> str:
+    """Removes any trailing delimiter from the parameter path.
+
+    Args:
+      path: the parameter path
+    Returns:
+      the path without a trailing '/'
+    """
+    return path[:-1] if path.endswith('/') else path
+
+
+class ParameterCache:
+    """In-process cache of parameter values with a time-to-live."""
+
+    def __init__(self, ttl: float) -> None:
+        """Initializes an empty cache.
+
+        Args:
+          ttl: the number of seconds a loaded path is considered current
+        """
+        self.__ttl = ttl
+        self.__parameters: Dict[str, Any] = {}
+        self.__paths: Dict[str, float] = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups answered by the cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups not answered by the cache."""
+        return self.__misses
+
+    def __is_current(self, load_time: float) -> bool:
+        """Indicates whether a path loaded at the time is still current."""
+        return time.time() - load_time < self.__ttl
+
+    def is_loaded(self, path: str) -> bool:
+        """Indicates whether all parameters under the path are in the cache.
+
+        A path is loaded if the path or one of its ancestors was loaded
+        within the time-to-live of the cache.
+
+        Args:
+          path: the parameter path
+        Returns:
+          True if the parameters under the path are cached. False, otherwise
+        """
+        path = normalize_path(path)
+        for loaded_path, load_time in self.__paths.items():
+            if not self.__is_current(load_time):
+                continue
+            if path == loaded_path or path.startswith(loaded_path + '/'):
+                self.__hits += 1
+                return True
+
+        self.__misses += 1
+        return False
+
+    def add(self, path: str, parameters: Dict[str, Any]) -> None:
+        """Adds the parameters loaded for the path to the cache.
+
+        Replaces any cached parameters under the path.
+
+        Args:
+          path: the loaded parameter path
+          parameters: the parameter values keyed by full parameter name
+        """
+        path = normalize_path(path)
+        for name in self.__names_under(path):
+            self.__parameters.pop(name)
+
+        self.__parameters.update(parameters)
+        self.__paths[path] = time.time()
+
+    def update(self, name: str, value: Any) -> None:
+        """Sets the value of the parameter if the parameter path is cached.
+
+        Args:
+          name: the full parameter name
+          value: the parameter value
+        """
+        if self.is_loaded(name):
+            self.__parameters[name] = value
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Removes the path and any cached parameters under the path.
+
+        Removes all parameters if no path is given.
+
+        Args:
+          path: the parameter path
+        """
+        if path is None:
+            self.__parameters.clear()
+            self.__paths.clear()
+            return
+
+        path = normalize_path(path)
+        for name in self.__names_under(path):
+            self.__parameters.pop(name)
+        for loaded_path in list(self.__paths.keys()):
+            if loaded_path == path or loaded_path.startswith(path + '/'):
+                self.__paths.pop(loaded_path)
+
+    def __names_under(self, path: str) -> list[str]:
+        """Returns the cached parameter names at or under the path."""
+        return [
+            name for name in self.__parameters
+            if name == path or name.startswith(path + '/')
+        ]
+
+    def get_parameter(self, name: str) -> Any:
+        """Returns the cached value for the named parameter.
+
+        Args:
+          name: the full parameter name
+        Returns:
+          the value if the parameter is cached. None, otherwise
+        """
+        return self.__parameters.get(name)
+
+    def get_parameters(self, path: str) -> Dict[str, Any]:
+        """Returns the cached parameters under the path.
+
+        Args:
+          path: the parameter path
+        Returns:
+          the parameter values keyed by full parameter name
+        """
+        path = normalize_path(path)
+        return {
+            name: self.__parameters[name]
+            for name in self.__names_under(path)
+        }
+
+    def save(self, filepath: str, key: str) -> None:
+        """Writes the current contents of the cache to an encrypted file.
+
+        Args:
+          filepath: the path of the cache file
+          key: the passphrase for encrypting the file
+        """
+        paths = {
+            path: load_time
+            for path, load_time in self.__paths.items()
+            if self.__is_current(load_time)
+        }
+        contents = json.dumps({
+            'paths': paths,
+            'parameters': self.__parameters
+        })
+        token = get_fernet(key).encrypt(contents.encode('utf-8'))
+        descriptor = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                             0o600)
+        with os.fdopen(descriptor, 'wb') as cache_file:
+            cache_file.write(token)
+
+    def load(self, filepath: str, key: str) -> bool:
+        """Loads the cache contents from an encrypted file.
+
+        Paths in the file that are no longer current are ignored.
+
+        Args:
+          filepath: the path of the cache file
+          key: the passphrase for decrypting the file
+        Returns:
+          True if the file was loaded. False, otherwise
+        """
+        if not os.path.exists(filepath):
+            return False
+
+        try:
+            with open(filepath, 'rb') as cache_file:
+                contents = get_fernet(key).decrypt(cache_file.read())
+            cache_object: Dict[str, Any] = json.loads(contents)
+        except (OSError, InvalidToken, ValueError) as error:
+            log.warning('Ignoring parameter cache file %s: %s', filepath,
+                        error)
+            return False
+
+        for path, load_time in cache_object.get('paths', {}).items():
+            if not self.__is_current(load_time):
+                continue
+            self.__paths[path] = load_time
+            self.__parameters.update({
+                name: value
+                for name, value in cache_object.get('parameters', {}).items()
+                if name == path or name.startswith(path + '/')
+            })
+
+        return True
+
+
+def get_fernet(key: str) -> Fernet:
+    """Creates the Fernet cipher for the passphrase.
+
+    Args:
+      key: the passphrase
+    Returns:
+      the cipher using a key derived from the passphrase
+    """
+    digest = hashlib.sha256(key.encode('utf-8')).digest()
+    return Fernet(base64.urlsafe_b64encode(digest))
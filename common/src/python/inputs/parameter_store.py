@@ -1,6 +1,6 @@
 """Module for getting proxy object for AWS SSM parameter store object."""
 import logging
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from botocore.exceptions import ClientError, ParamValidationError  # type: ignore
 from pydantic import TypeAdapter, ValidationError
@@ -8,6 +8,7 @@ from ssm_parameter_store import EC2ParameterStore
 from typing_extensions import Type, TypedDict, TypeVar
 
 from inputs.environment import get_environment_variable
+from inputs.parameter_cache import ParameterCache, normalize_path
 
 log = logging.getLogger(__name__)
 
@@ -67,11 +68,26 @@ P = TypeVar('P', bound=TypedDict)  # type: ignore
 
 
 class ParameterStore:
-    """Wrapper class for parameter store to pull particular parameters."""
-
-    def __init__(self, parameter_store: EC2ParameterStore) -> None:
+    """Wrapper class for parameter store to pull particular parameters.
+
+    Parameters are cached for `cache_ttl` seconds. Use `prefetch` to load
+    all parameters under a path with a single paginated request.
+    If a cache file and key are given, the cache is loaded from the encrypted
+    file on creation and saved after each request to the parameter store.
+    """
+
+    def __init__(self,
+                 parameter_store: EC2ParameterStore,
+                 cache_ttl: float = 300,
+                 cache_file: Optional[str] = None,
+                 cache_key: Optional[str] = None) -> None:
         self.__store = parameter_store
         self.__client = parameter_store.client  # type: ignore
+        self.__cache = ParameterCache(ttl=cache_ttl)
+        self.__cache_file = cache_file if cache_key else None
+        self.__cache_key = cache_key
+        if self.__cache_file and self.__cache_key:
+            self.__cache.load(self.__cache_file, self.__cache_key)
 
     @classmethod
     def create_from_environment(cls) -> 'ParameterStore':
@@ -79,6 +95,10 @@ class ParameterStore:
         set. Expects AWS_SECRET_ACCESS_KEY, AWS_ACCESS_KEY_ID, and
         AWS_DEFAULT_REGION.
 
+        Optionally uses PARAMETER_CACHE_TTL for the number of seconds cached
+        parameters are kept, and PARAMETER_CACHE_FILE and PARAMETER_CACHE_KEY
+        for the location and passphrase of the encrypted cache file.
+
         Returns:
             parameter store object if credentials are valid, and None otherwise
         Raises:
@@ -90,10 +110,103 @@ class ParameterStore:
         if not secret_key or not access_id or not region:
             raise ParameterError("Environment variables not found")
 
+        cache_ttl = get_environment_variable('PARAMETER_CACHE_TTL')
+        try:
+            ttl = float(cache_ttl) if cache_ttl else 300
+        except ValueError as error:
+            raise ParameterError(
+                f"Invalid parameter cache TTL {cache_ttl}") from error
+
         return ParameterStore(
             EC2ParameterStore(aws_access_key_id=access_id,
                               aws_secret_access_key=secret_key,
-                              region_name=region))
+                              region_name=region),
+            cache_ttl=ttl,
+            cache_file=get_environment_variable('PARAMETER_CACHE_FILE'),
+            cache_key=get_environment_variable('PARAMETER_CACHE_KEY'))
+
+    def __save_cache(self) -> None:
+        """Saves the cache to the cache file if one is set."""
+        if not self.__cache_file or not self.__cache_key:
+            return
+
+        try:
+            self.__cache.save(self.__cache_file, self.__cache_key)
+        except OSError as error:
+            log.warning('Failed to save parameter cache to %s: %s',
+                        self.__cache_file, error)
+
+    def __load_path(self, path: str) -> Dict[str, Any]:
+        """Returns all parameters under the path keyed by full parameter name.
+
+        Pulls the parameters from the parameter store unless the path is
+        cached.
+
+        Args:
+          path: the parameter path
+        Returns:
+          the dictionary of parameters under the path
+        Raises:
+          ClientError, ParamValidationError if the parameter request fails
+        """
+        path = normalize_path(path)
+        if self.__cache.is_loaded(path):
+            return self.__cache.get_parameters(path)
+
+        parameters = self.__store.get_parameters_by_path(path=path + '/',
+                                                         decrypt=True,
+                                                         strip_path=False)
+        self.__cache.add(path, parameters)
+        self.__save_cache()
+        return parameters
+
+    def __get_parameters_by_path(self, path: str) -> Dict[str, Any]:
+        """Returns the parameters under the path keyed by the last component
+        of the parameter name.
+
+        Args:
+          path: the parameter path
+        Returns:
+          the dictionary of parameters under the path
+        """
+        return {
+            name.split('/')[-1]: value
+            for name, value in self.__load_path(path).items()
+        }
+
+    def prefetch(self, path: str) -> int:
+        """Loads all parameters under the path into the cache.
+
+        Later requests for parameters under the path are answered from the
+        cache until the time-to-live expires.
+
+        Args:
+          path: the parameter path
+        Returns:
+          the number of parameters loaded
+        Raises:
+          ParameterError if the parameters cannot be retrieved
+        """
+        try:
+            return len(self.__load_path(path))
+        except (ClientError, ParamValidationError) as error:
+            raise ParameterError(
+                f"Failed to retrieve parameters at {path}: {error}") from error
+
+    def clear_cache(self, path: Optional[str] = None) -> None:
+        """Removes cached parameters under the path, or all parameters if no
+        path is given.
+
+        Args:
+          path: the parameter path
+        """
+        self.__cache.invalidate(path)
+        self.__save_cache()
+
+    def log_cache_statistics(self) -> None:
+        """Logs the number of parameter lookups answered by the cache."""
+        log.info('Parameter cache hits: %s, misses: %s', self.__cache.hits,
+                 self.__cache.misses)
 
     def get_parameters(self, *, param_type: Type[P], parameter_path: str) -> P:
         """Pulls the parameters at the path and checks that they match the
@@ -110,7 +223,13 @@ class ParameterStore:
         parameter_path = (parameter_path if parameter_path.endswith('/') else
                           parameter_path + '/')
 
-        parameters = self.__store.get_parameters_by_path(path=parameter_path)
+        try:
+            parameters = self.__get_parameters_by_path(parameter_path)
+        except (ClientError, ParamValidationError) as error:
+            raise ParameterError(
+                f"Failed to retrieve parameters at {parameter_path}: {error}"
+            ) from error
+
         type_adapter = TypeAdapter(param_type)
         try:
             return type_adapter.validate_python(parameters)
@@ -134,6 +253,13 @@ class ParameterStore:
         path_prefix = (path_prefix[:-1]
                        if path_prefix.endswith('/') else path_prefix)
         parameter_path = f'{path_prefix}/{parameter_name}'
+        if self.__cache.is_loaded(parameter_path):
+            apikey = self.__cache.get_parameter(parameter_path)
+            if not apikey or not isinstance(apikey, str):
+                raise ParameterError("No API Key found")
+
+            return apikey
+
         try:
             parameter = self.__store.get_parameter(parameter_path,
                                                    decrypt=True)
@@ -145,6 +271,8 @@ class ParameterStore:
         if not apikey:
             raise ParameterError("No API Key found")
 
+        self.__cache.add(parameter_path, {parameter_path: apikey})
+        self.__save_cache()
         return apikey
 
     def get_all_redcap_parameters_at_path(
@@ -171,13 +299,15 @@ class ParameterStore:
 
         redcap_params = {}
         try:
-            parameters = self.__store.get_parameters_with_hierarchy(
-                base_path, decrypt=True)
+            flat_parameters = self.__load_path(base_path)
         except (ClientError, ParamValidationError) as error:
             raise ParameterError(
                 f"Failed to retrieve parameters at {base_path}: {error}"
             ) from error
 
+        parameters = get_hierarchy(base_path=base_path,
+                                   parameters=flat_parameters)
+
         for key, prj_params in parameters.items():
             if prefix and not key.startswith(prefix):
                 log.warning('Unexpected parameter %s at path %s', key,
@@ -239,8 +369,7 @@ class ParameterStore:
 
         param_path = base_path + 'pid_' + str(pid)
         try:
-            prj_params = self.__store.get_parameters_by_path(param_path,
-                                                             decrypt=True)
+            prj_params = self.__get_parameters_by_path(param_path)
         except (ClientError, ParamValidationError) as error:
             raise ParameterError(
                 f"Failed to retrieve parameters at {param_path}") from error
@@ -332,10 +461,15 @@ class ParameterStore:
                                         Type='SecureString',
                                         Overwrite=True)
         except Exception as error:
+            self.clear_cache(param_path)
             raise ParameterError(
                 f"Failed to store parameters at {param_path}: {error}"
             ) from error
 
+        self.__cache.update(param_name_url, url)
+        self.__cache.update(param_name_token, token)
+        self.__save_cache()
+
     def get_comanage_parameters(self, param_path: str) -> CoManageParameters:
         """Pulls comanage parameters from the SSM parameter store at the given
         path.
@@ -378,3 +512,29 @@ class ParameterStore:
         """
         return self.get_parameters(param_type=URLParameter,
                                    parameter_path=param_path)
+
+
+def get_hierarchy(*, base_path: str, parameters: Dict[str,
+                                                      Any]) -> Dict[str, Any]:
+    """Converts parameters keyed by full name to nested dictionaries keyed by
+    the components of the parameter name relative to the base path.
+
+    Args:
+      base_path: the base path of the parameters
+      parameters: the parameter values keyed by full parameter name
+    Returns:
+      the nested dictionary of parameters
+    """
+    base_path = normalize_path(base_path)
+    result: Dict[str, Any] = {}
+    for name, value in parameters.items():
+        key_segments = name[len(base_path) + 1:].split('/')
+        node = result
+        for key_segment in key_segments[:-1]:
+            node = node.setdefault(key_segment, {})
+            if not isinstance(node, dict):
+                break
+        if isinstance(node, dict):
+            node[key_segments[-1]] = value
+
+    return result
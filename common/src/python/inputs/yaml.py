@@ -1,12 +1,35 @@
-"""Defines utilities for parsing YAML input."""
+"""Defines utilities for parsing YAML input.
+
+Uses the libyaml loader and dumper when PyYAML is built with libyaml.
+Machine-produced files may instead be written as JSON, which is much faster to
+parse, and are loaded with the same error reporting as YAML files.
+"""
+import json
 import logging
-from typing import Any, List
+from typing import Any, List, TextIO
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # type: ignore
+
 log = logging.getLogger(__name__)
 
 
+def is_json_file(filename: str) -> bool:
+    """Indicates whether the file name has a JSON extension.
+
+    Args:
+      filename: the file name
+    Returns:
+      True if the file name ends with .json. False, otherwise
+    """
+    return filename.lower().endswith('.json')
+
+
 def load_all_from_stream(stream) -> List[Any]:
     """Gets list of objects from the IO stream.
 
@@ -19,7 +42,7 @@ def load_all_from_stream(stream) -> List[Any]:
       List of lists of objects created from file or None if an error occurs
     """
     try:
-        doc_iter = yaml.safe_load_all(stream)
+        doc_iter = yaml.load_all(stream, Loader=SafeLoader)
         return [doc for doc in doc_iter]
     except yaml.MarkedYAMLError as error:
         mark = error.problem_mark
@@ -40,7 +63,7 @@ def load_from_stream(stream) -> Any:
       Object created from file or None if an error occurs
     """
     try:
-        return yaml.safe_load(stream)
+        return yaml.load(stream, Loader=SafeLoader)
     except yaml.MarkedYAMLError as error:
         mark = error.problem_mark
         if mark:
@@ -51,6 +74,63 @@ def load_from_stream(stream) -> Any:
         raise YAMLReadError(f'Error in YAML file: {error}') from error
 
 
+def load_from_json_stream(stream: TextIO) -> Any:
+    """Loads object from the JSON IO stream.
+
+    Args:
+      stream: IO stream
+    Returns:
+      Object created from file
+    Raises:
+      YAMLReadError if the stream is not valid JSON
+    """
+    try:
+        return json.load(stream)
+    except json.JSONDecodeError as error:
+        raise YAMLReadError(f'Error in JSON: line {error.lineno}, '
+                            f'column {error.colno}') from error
+
+
+def load_from_file(filepath: str) -> Any:
+    """Loads object from the file, which is read as JSON if the name has a
+    JSON extension, and as YAML otherwise.
+
+    Args:
+      filepath: the path of the file
+    Returns:
+      Object created from file
+    Raises:
+      YAMLReadError if the file cannot be read or parsed
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as input_file:
+            if is_json_file(filepath):
+                return load_from_json_stream(input_file)
+
+            return load_from_stream(input_file)
+    except OSError as error:
+        raise YAMLReadError(
+            f'Error reading file {filepath}: {error}') from error
+
+
+def dump_to_text(data: Any, *, json_format: bool = False) -> str:
+    """Serializes the object as YAML, or as JSON if indicated.
+
+    Args:
+      data: the object to serialize
+      json_format: whether to serialize as JSON
+    Returns:
+      the serialized text
+    """
+    if json_format:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+    return yaml.dump(data,
+                     Dumper=SafeDumper,
+                     allow_unicode=True,
+                     default_flow_style=False)
+
+
 class YAMLReadError(Exception):
     """Exception class for errors that occur when reading objects from a YAML
     file."""
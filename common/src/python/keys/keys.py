@@ -68,6 +68,9 @@ class MetadataKeys:
     LBD_LONG = 'LBD-v3.0'
     LBD_SHORT = 'LBD-v3.1'
     TRANSFERS = 'transfers'
+    CONTENT_HASH = 'content_hash'
+    SOURCE_ETAG = 'source_etag'
+    SOURCE_ADCIDS = 'source_adcids'
 
 
 class SysErrorCodes:
@@ -1,5 +1,6 @@
 import logging
-from typing import List, Optional
+import time
+from typing import List, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
@@ -9,6 +10,12 @@ from serialization.case import camel_case
 
 log = logging.getLogger(__name__)
 
+# SES accepts at most 50 destinations in a bulk templated email
+MAX_BULK_DESTINATIONS = 50
+
+# the SES default for production accounts, used if the quota is unavailable
+DEFAULT_MAX_SEND_RATE = 14.0
+
 
 def create_ses_client():
     """Creates a boto3 SES client if the AWS credentials are set.
@@ -38,6 +45,16 @@ class DestinationModel(BaseModel):
     cc_addresses: Optional[List[str]] = None
     bcc_addresses: Optional[List[str]] = None
 
+    def recipient_count(self) -> int:
+        """Returns the number of recipients, which SES counts against the
+        send rate.
+
+        Returns:
+          the number of to, cc and bcc addresses
+        """
+        return (len(self.to_addresses) + len(self.cc_addresses or []) +
+                len(self.bcc_addresses or []))
+
 
 class MessageComponent(BaseModel):
     """Defines a model for message components for the boto3 SES client."""
@@ -55,12 +72,41 @@ class TemplateDataModel(BaseModel):
     url: Optional[str] = None
 
 
+class BulkEmailStatus(BaseModel):
+    """Defines the send status for one destination of a bulk email."""
+    to_addresses: List[str]
+    status: str
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """Indicates whether the message was accepted by SES."""
+        return self.status == 'Success'
+
+
+EmailMessage = Tuple[DestinationModel, TemplateDataModel]
+
+
 class EmailClient:
     """Wrapper for boto3 SES client."""
 
-    def __init__(self, client, source: str) -> None:
+    def __init__(self,
+                 client,
+                 source: str,
+                 max_send_rate: Optional[float] = None) -> None:
+        """Initializes the email client.
+
+        Args:
+          client: the boto3 SES client
+          source: the source email address
+          max_send_rate: the maximum number of recipients per second for
+          bulk sends. If not given, the send quota of the account is used
+        """
         self.__client = client
         self.__source = source
+        self.__max_send_rate = max_send_rate
+        self.__next_send_time = 0.0
 
     def send(
         self,
@@ -98,6 +144,106 @@ class EmailClient:
         log.info("Sent mail %s", message_id)
         return message_id
 
+    def send_bulk(
+            self,
+            configuration_set_name: str,
+            template: str,
+            messages: List[EmailMessage],
+            chunk_size: int = MAX_BULK_DESTINATIONS) -> List[BulkEmailStatus]:
+        """Sends the templated messages using SES bulk sending.
+
+        Messages are sent in chunks of at most chunk_size destinations, and
+        chunks are throttled to the maximum send rate.
+        A chunk that fails is reported as failed for each destination, and
+        the remaining chunks are still sent.
+
+        Args:
+          configuration_set_name: the SES configuration set
+          template: the name of the SES template
+          messages: the destination and template data for each message
+          chunk_size: the maximum number of destinations per request
+        Returns:
+          the send status for each message, in the order of the messages
+        """
+        assert 0 < chunk_size <= MAX_BULK_DESTINATIONS, "invalid chunk size"
+
+        statuses: List[BulkEmailStatus] = []
+        for start in range(0, len(messages), chunk_size):
+            chunk = messages[start:start + chunk_size]
+            self.__throttle(
+                sum(destination.recipient_count() for destination, _ in chunk))
+            try:
+                response = self.__client.send_bulk_templated_email(
+                    Source=self.__source,
+                    ConfigurationSetName=configuration_set_name,
+                    Template=template,
+                    DefaultTemplateData='{}',
+                    Destinations=[{
+                        'Destination':
+                        destination.model_dump(by_alias=True,
+                                               exclude_none=True),
+                        'ReplacementTemplateData':
+                        template_data.model_dump_json(exclude_none=True)
+                    } for destination, template_data in chunk])
+            except ClientError as error:
+                log.error("Failed to send %s %s emails: %s", len(chunk),
+                          template, error)
+                statuses.extend(
+                    BulkEmailStatus(to_addresses=destination.to_addresses,
+                                    status='Failed',
+                                    error=str(error))
+                    for destination, _ in chunk)
+                continue
+
+            for (destination, _), status in zip(chunk,
+                                                response['Status'],
+                                                strict=True):
+                statuses.append(
+                    BulkEmailStatus(to_addresses=destination.to_addresses,
+                                    status=status['Status'],
+                                    message_id=status.get('MessageId'),
+                                    error=status.get('Error')))
+
+        log.info("Sent %s of %s %s emails",
+                 len([status for status in statuses if status.success]),
+                 len(messages), template)
+        return statuses
+
+    def __get_max_send_rate(self) -> float:
+        """Returns the maximum send rate, reading the send quota of the
+        account the first time it is needed.
+
+        Returns:
+          the maximum number of recipients per second
+        """
+        if self.__max_send_rate is None:
+            try:
+                quota = self.__client.get_send_quota()
+                self.__max_send_rate = float(
+                    quota.get('MaxSendRate') or DEFAULT_MAX_SEND_RATE)
+            except ClientError as error:
+                log.warning(
+                    "Unable to get send quota, using %s per second: "
+                    "%s", DEFAULT_MAX_SEND_RATE, error)
+                self.__max_send_rate = DEFAULT_MAX_SEND_RATE
+
+        return self.__max_send_rate
+
+    def __throttle(self, recipient_count: int) -> None:
+        """Waits until the recipients can be sent without exceeding the
+        maximum send rate.
+
+        Args:
+          recipient_count: the number of recipients about to be sent
+        """
+        now = time.monotonic()
+        if self.__next_send_time > now:
+            time.sleep(self.__next_send_time - now)
+            now = self.__next_send_time
+
+        self.__next_send_time = (now +
+                                 recipient_count / self.__get_max_send_rate())
+
 
 class EmailSendError(Exception):
     """Error class for error during sending email."""
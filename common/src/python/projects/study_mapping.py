@@ -23,12 +23,18 @@ For studies for which data shared externally by the coordinating center, there
 is an additional release stage where data across centers is consolidated.
 To represent this a study release group is created with a single "master"
 project for managing the consolidated data.
+
+Centers are mapped concurrently, and a failure for one center does not stop
+the mapping of the other centers.
 """
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from centers.center_group import (
+    CenterError,
     CenterGroup,
     DistributionProjectMetadata,
     IngestProjectMetadata,
@@ -36,7 +42,9 @@ from centers.center_group import (
     StudyMetadata,
 )
 from centers.nacc_group import NACCGroup
+from flywheel.rest import ApiException
 from flywheel_adaptor.flywheel_proxy import (
+    FlywheelError,
     FlywheelProxy,
     GroupAdaptor,
     ProjectAdaptor,
@@ -46,6 +54,8 @@ from projects.study import Study, StudyVisitor
 
 log = logging.getLogger(__name__)
 
+DEFAULT_MAX_WORKERS = 4
+
 
 class StudyMapper(ABC):
     """Defines the interface for classes that map study objects to FW
@@ -246,13 +256,28 @@ class DistributionMapper(StudyMapper):
 
 
 class StudyMappingVisitor(StudyVisitor):
+    """Study visitor that maps studies to center pipeline projects.
+
+    Center groups are looked up once and reused for all studies visited.
+    """
 
-    def __init__(self, flywheel_proxy: FlywheelProxy,
-                 admin_group: NACCGroup) -> None:
+    def __init__(self,
+                 flywheel_proxy: FlywheelProxy,
+                 admin_group: NACCGroup,
+                 max_workers: int = DEFAULT_MAX_WORKERS) -> None:
         self.__admin_group = admin_group
         self.__fw = flywheel_proxy
+        self.__max_workers = max_workers
         self.__study: Optional[Study] = None
         self.__mapper: Optional[StudyMapper] = None
+        self.__centers: Dict[str, Optional[CenterGroup]] = {}
+        self.__errors: Dict[str, str] = {}
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        """The error messages keyed by center ID for centers that could not
+        be mapped."""
+        return self.__errors
 
     def visit_study(self, study: Study) -> None:
         """Creates FW containers for the study.
@@ -275,12 +300,58 @@ class StudyMappingVisitor(StudyVisitor):
         if study.mode == 'distribution':
             self.__mapper = DistributionMapper(study)
 
-        for center_id in study.centers:
-            self.visit_center(center_id)
+        center_ids = list(dict.fromkeys(study.centers))
+        start = time.time()
+        with ThreadPoolExecutor(
+                max_workers=max(1, self.__max_workers)) as executor:
+            messages = list(executor.map(self.__map_center, center_ids))
+
+        failures = 0
+        for center_id, message in zip(center_ids, messages, strict=True):
+            if message:
+                failures += 1
+                self.__errors[center_id] = message
+        log.info('Mapped study %s to %s of %s centers in %.1f seconds',
+                 study.name,
+                 len(center_ids) - failures, len(center_ids),
+                 time.time() - start)
 
         assert self.__mapper
         self.__mapper.map_study_pipelines()
 
+    def __map_center(self, center_id: str) -> Optional[str]:
+        """Maps the study to the center, isolating any failure.
+
+        Args:
+          center_id: the ID of the center
+        Returns:
+          the error message if the center could not be mapped. None, otherwise
+        """
+        try:
+            self.visit_center(center_id)
+        except (ApiException, CenterError, FlywheelError) as error:
+            assert self.__study, "study must be set"
+            log.error('Failed to map study %s to center %s: %s',
+                      self.__study.name, center_id, error)
+            return str(error)
+
+        return None
+
+    def __get_center(self, center_id: str) -> Optional[CenterGroup]:
+        """Returns the center group for the center ID.
+
+        Args:
+          center_id: the ID of the center
+        Returns:
+          the center group if the group exists. None, otherwise
+        """
+        if center_id not in self.__centers:
+            group_adaptor = self.__fw.find_group(center_id)
+            self.__centers[center_id] = (CenterGroup.create_from_group_adaptor(
+                adaptor=group_adaptor) if group_adaptor else None)
+
+        return self.__centers[center_id]
+
     def visit_center(self, center_id: str) -> None:
         """Creates projects within the center for the study.
 
@@ -290,12 +361,11 @@ class StudyMappingVisitor(StudyVisitor):
         assert self.__study, "study must be set"
         assert self.__mapper, "mapper must be set"
 
-        group_adaptor = self.__fw.find_group(center_id)
-        if not group_adaptor:
+        center = self.__get_center(center_id)
+        if not center:
             log.warning("No group found with center ID %s", center_id)
             return
 
-        center = CenterGroup.create_from_group_adaptor(adaptor=group_adaptor)
         portal_info = center.get_project_info()
         study_info = portal_info.get(self.__study)
 
@@ -1,25 +1,99 @@
 """Defines the process for copying a set of gear rules from a source project,
 the template, to other projects.
 
+Copying is done in two phases.
+The plan phase loads the state of the template and destination projects in
+bulk and computes the changes needed to make the destination match the
+template.
+The apply phase makes only those changes, so that pushing a template to a
+project that is up to date makes no changes.
+
 Based on code written by David Parker, davidparker@flywheel.io
 """
 import logging
 import re
 from string import Template
-from typing import Dict, List, Optional
+from threading import Lock
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import flywheel
 from flywheel import DataView, FileEntry, FixedInput, GearRule, GearRuleInput
+from flywheel.models.roles_role_assignment import RolesRoleAssignment
 from flywheel_adaptor.flywheel_proxy import FlywheelProxy, ProjectAdaptor
 from fw_utils import AttrDict
 
 log = logging.getLogger()
 
+RULE_PROPERTIES = [
+    "gear_id", "role_id", "config", "auto_update", "any", "all", "_not",
+    "disabled", "compute_provider_id", "triggering_input"
+]
+VIEW_PROPERTIES = [
+    "columns", "label", "sort", "error_column", "file_spec", "filter",
+    "group_by", "include_ids", "include_labels", "missing_data_strategy"
+]
+
+
+# pylint: disable=(too-many-instance-attributes)
+class TemplatePlan:
+    """The changes needed to make a destination project match a template."""
+
+    def __init__(self) -> None:
+        self.files: List[FileEntry] = []
+        self.rules_to_remove: List[GearRule] = []
+        self.rules_to_add: List[GearRule] = []
+        self.rules_to_update: List[GearRule] = []
+        self.views_to_add: List[DataView] = []
+        self.views_to_modify: List[Tuple[DataView, DataView]] = []
+        self.apps: Optional[List[AttrDict]] = None
+        self.role_assignments: List[RolesRoleAssignment] = []
+        self.description: Optional[str] = None
+        self.copyable: Optional[bool] = None
+
+    def is_empty(self) -> bool:
+        """Indicates whether the plan has no changes.
+
+        Returns:
+          True if there are no changes. False, otherwise
+        """
+        return not self.report()
+
+    def report(self) -> List[str]:
+        """Returns a description of each change in the plan.
+
+        Returns:
+          the list of change descriptions
+        """
+        changes = [f"copy file {file.name}" for file in self.files]
+        changes.extend(f"remove rule {rule.name}"
+                       for rule in self.rules_to_remove)
+        changes.extend(f"add rule {rule.name}" for rule in self.rules_to_add)
+        changes.extend(f"update rule {rule.name}"
+                       for rule in self.rules_to_update)
+        changes.extend(f"add dataview {view.label}"
+                       for view in self.views_to_add)
+        changes.extend(f"modify dataview {view.label}"
+                       for view, _ in self.views_to_modify)
+        if self.apps is not None:
+            changes.append("set viewer apps")
+        changes.extend(f"add roles for user {assignment.id}"
+                       for assignment in self.role_assignments)
+        if self.description is not None:
+            changes.append("set description")
+        if self.copyable is not None:
+            changes.append(f"set copyable to {self.copyable}")
+
+        return changes
+
 
 # pylint: disable=(too-few-public-methods)
 class TemplateProject:
     """Function object to copy gear rules and associated files from a source
-    template project to other projects."""
+    template project to other projects.
+
+    Rules, apps, dataviews and input files are loaded from the source project
+    once, and may be shared by threads copying to different destinations.
+    """
 
     def __init__(self, *, proxy: FlywheelProxy, project: flywheel.Project):
         """Initializes the template object.
@@ -33,6 +107,9 @@ class TemplateProject:
         self.__rules: List[GearRule] = []
         self.__dataviews: List[DataView] = []
         self.__apps: List[AttrDict] = []
+        self.__files: Dict[str, Optional[FileEntry]] = {}
+        self.__file_contents: Dict[str, bytes] = {}
+        self.__lock = Lock()
 
     def get_pattern(self) -> Optional[str]:
         """Returns the regex pattern for the prefix this template applies to.
@@ -73,12 +150,68 @@ class TemplateProject:
           destination: project to copy to
           value_map: optional map for substitutions for description template
         """
-        self.copy_rules(destination)
-        self.copy_users(destination)
+        self.apply(destination=destination,
+                   plan=self.plan(destination, value_map=value_map))
+
+    def plan(self,
+             destination: ProjectAdaptor,
+             *,
+             value_map: Optional[Dict[str, str]] = None) -> TemplatePlan:
+        """Computes the changes to copy the template to the destination.
+
+        Covers rules and input files, users, the description, apps and the
+        copyable setting. Dataviews are only copied by `copy_dataviews`.
+
+        Args:
+          destination: project to copy to
+          value_map: optional map for substitutions for description template
+        Returns:
+          the plan with the changes for the destination
+        """
+        plan = TemplatePlan()
+        self.__plan_rules(plan=plan, destination=destination)
+        self.__plan_users(plan=plan, destination=destination)
         if value_map:
-            self.copy_description(destination=destination, values=value_map)
-        self.copy_apps(destination)
-        self.copy_copyable_setting(destination)
+            self.__plan_description(plan=plan,
+                                    destination=destination,
+                                    values=value_map)
+        self.__plan_apps(plan=plan, destination=destination)
+        self.__plan_copyable(plan=plan, destination=destination)
+        return plan
+
+    def apply(self, *, destination: ProjectAdaptor,
+              plan: TemplatePlan) -> None:
+        """Makes the changes in the plan to the destination project.
+
+        For a dry run, logs the changes instead.
+
+        Args:
+          destination: the destination project
+          plan: the plan computed for the destination
+        """
+        changes = plan.report()
+        if not changes:
+            log.info('project %s/%s matches template %s', destination.group,
+                     destination.label, self.__source_project.label)
+            return
+
+        if self.__fw.dry_run:
+            for change in changes:
+                log.info('Dry run: would %s in %s/%s', change,
+                         destination.group, destination.label)
+            return
+
+        log.info('applying template %s to %s/%s: %s',
+                 self.__source_project.label, destination.group,
+                 destination.label, ', '.join(changes))
+
+        self.__apply_rules(destination=destination, plan=plan)
+        for view in plan.views_to_add:
+            destination.add_dataview(view)
+        for view, destination_view in plan.views_to_modify:
+            self.__fw.modify_dataview(source=view,
+                                      destination=destination_view)
+        self.__apply_settings(destination=destination, plan=plan)
 
     def copy_copyable_setting(self, destination: ProjectAdaptor) -> None:
         """Copies the value of template copyable to the destination.
@@ -86,10 +219,9 @@ class TemplateProject:
         Args:
           destination: the destination project
         """
-        log.info('copying copyable state from template %s to %s/%s',
-                 self.__source_project.label, destination.group,
-                 destination.label)
-        destination.set_copyable(self.__source_project.copyable)
+        plan = TemplatePlan()
+        self.__plan_copyable(plan=plan, destination=destination)
+        self.apply(destination=destination, plan=plan)
 
     def copy_apps(self, destination: ProjectAdaptor) -> None:
         """Performs copy of viewer apps to the destination.
@@ -99,51 +231,24 @@ class TemplateProject:
         Args:
           destination: the destination project
         """
-        if not self.__apps:
-            log.info('loading apps for template project %s',
-                     self.__source_project.label)
-            self.__apps = self.__fw.get_project_apps(self.__source_project)
-            if not self.__apps:
-                log.warning('template %s has no apps, skipping',
-                            self.__source_project.label)
-                return
-
-        assert self.__apps
-        log.info('copying apps from template %s to %s/%s',
-                 self.__source_project.label, destination.group,
-                 destination.label)
-        destination.set_apps(self.__apps)
+        plan = TemplatePlan()
+        self.__plan_apps(plan=plan, destination=destination)
+        self.apply(destination=destination, plan=plan)
 
     def copy_rules(self, destination: ProjectAdaptor) -> None:
         """Performs copy of gear rules to destination.
 
         Removes any conflicting rules from the destination.
+        Input files that differ from the template are uploaded before the
+        rules are added, and the destination is reloaded once after the
+        uploads.
 
         Args:
           destination: the destination project
         """
-        if not self.__rules:
-            log.info('loading rules for template project %s',
-                     self.__source_project.label)
-            self.__rules = self.__fw.get_project_gear_rules(
-                self.__source_project)
-            if not self.__rules:
-                log.warning('template %s has no rules, skipping',
-                            self.__source_project.label)
-                return
-
-        assert self.__rules
-
-        self.__clean_up_rules(destination)
-
-        for rule in self.__rules:
-            log.info('copying rule %s to project %s/%s', rule.name,
-                     destination.group, destination.label)
-            fixed_inputs = self.__map_fixed_inputs(inputs=rule.fixed_inputs,
-                                                   destination=destination)
-            gear_rule_input = self.__create_gear_rule_input(
-                rule=rule, fixed_inputs=fixed_inputs)
-            destination.add_gear_rule(rule_input=gear_rule_input)
+        plan = TemplatePlan()
+        self.__plan_rules(plan=plan, destination=destination)
+        self.apply(destination=destination, plan=plan)
 
     def copy_users(self, destination: ProjectAdaptor) -> None:
         """Copies users from this project to the destination.
@@ -151,9 +256,9 @@ class TemplateProject:
         Args:
           destination: the destination project
         """
-        role_assignments = self.__source_project.permissions
-        for role_assignment in role_assignments:
-            destination.add_user_role_assignments(role_assignment)
+        plan = TemplatePlan()
+        self.__plan_users(plan=plan, destination=destination)
+        self.apply(destination=destination, plan=plan)
 
     def copy_description(self, *, destination: ProjectAdaptor,
                          values: Dict[str, str]) -> None:
@@ -163,61 +268,272 @@ class TemplateProject:
           destination: the destination project
           values: value map for substitutions into description template
         """
+        plan = TemplatePlan()
+        self.__plan_description(plan=plan,
+                                destination=destination,
+                                values=values)
+        self.apply(destination=destination, plan=plan)
+
+    def copy_dataviews(self, *, destination: ProjectAdaptor) -> None:
+        """Copies the dataviews from this project to the destination.
+
+        Args:
+          destination: the destination project
+        """
+        plan = TemplatePlan()
+        self.__plan_dataviews(plan=plan, destination=destination)
+        self.apply(destination=destination, plan=plan)
+
+    def __apply_rules(self, *, destination: ProjectAdaptor,
+                      plan: TemplatePlan) -> None:
+        """Makes the changes to gear rules and input files in the plan.
+
+        The destination is reloaded once after the files are copied, so that
+        rules refer to the new file versions.
+
+        Args:
+          destination: the destination project
+          plan: the plan computed for the destination
+        """
+        for rule in plan.rules_to_remove:
+            destination.remove_gear_rule(rule=rule)
+        for file in plan.files:
+            self.__copy_file(file, destination)
+        if plan.files:
+            destination.reload()
+        for rule in plan.rules_to_add + plan.rules_to_update:
+            fixed_inputs = self.__map_fixed_inputs(inputs=rule.fixed_inputs
+                                                   or [],
+                                                   destination=destination)
+            destination.add_gear_rule(rule_input=self.__create_gear_rule_input(
+                rule=rule, fixed_inputs=fixed_inputs))
+
+    @staticmethod
+    def __apply_settings(*, destination: ProjectAdaptor,
+                         plan: TemplatePlan) -> None:
+        """Makes the changes to apps, users and project settings in the plan.
+
+        Args:
+          destination: the destination project
+          plan: the plan computed for the destination
+        """
+        if plan.apps is not None:
+            destination.set_apps(plan.apps)
+        for role_assignment in plan.role_assignments:
+            destination.add_user_role_assignments(role_assignment)
+        if plan.description is not None:
+            destination.set_description(plan.description)
+        if plan.copyable is not None:
+            destination.set_copyable(plan.copyable)
+
+    def __get_rules(self) -> List[GearRule]:
+        """Returns the gear rules of the template project.
+
+        Returns:
+          the gear rules
+        """
+        with self.__lock:
+            if not self.__rules:
+                log.info('loading rules for template project %s',
+                         self.__source_project.label)
+                self.__rules = self.__fw.get_project_gear_rules(
+                    self.__source_project)
+            return self.__rules
+
+    def __get_apps(self) -> List[AttrDict]:
+        """Returns the viewer apps of the template project.
+
+        Returns:
+          the viewer apps
+        """
+        with self.__lock:
+            if not self.__apps:
+                log.info('loading apps for template project %s',
+                         self.__source_project.label)
+                self.__apps = self.__fw.get_project_apps(self.__source_project)
+            return self.__apps
+
+    def __get_dataviews(self) -> List[DataView]:
+        """Returns the dataviews of the template project.
+
+        Returns:
+          the dataviews
+        """
+        with self.__lock:
+            if not self.__dataviews:
+                log.info('loading dataviews for the template %s',
+                         self.__source_project.label)
+                self.__dataviews = self.__fw.get_dataviews(
+                    self.__source_project)
+            return self.__dataviews
+
+    def __plan_rules(self, *, plan: TemplatePlan,
+                     destination: ProjectAdaptor) -> None:
+        """Adds the changes to gear rules and input files to the plan.
+
+        Rules in the destination that are not in the template are removed.
+        A rule is updated if it differs from the template rule, or uses an
+        input file that is copied.
+
+        Args:
+          plan: the plan
+          destination: the destination project
+        """
+        rules = self.__get_rules()
+        if not rules:
+            log.warning('template %s has no rules, skipping',
+                        self.__source_project.label)
+            return
+
+        template_rulenames = {rule.name for rule in rules}
+        destination_rules = {}
+        for rule in destination.get_gear_rules() or []:
+            if rule.name not in template_rulenames:
+                log.info('removing rule %s, not in template %s', rule.name,
+                         self.__source_project.label)
+                plan.rules_to_remove.append(rule)
+                continue
+            destination_rules[rule.name] = rule
+
+        copied = self.__plan_input_files(plan=plan,
+                                         rules=rules,
+                                         destination=destination)
+        for rule in rules:
+            destination_rule = destination_rules.get(rule.name)
+            if not destination_rule:
+                plan.rules_to_add.append(rule)
+                continue
+
+            if not self.__equal_rules(rule=rule,
+                                      destination_rule=destination_rule,
+                                      destination=destination,
+                                      copied=copied):
+                plan.rules_to_update.append(rule)
+
+    def __plan_input_files(self, *, plan: TemplatePlan, rules: List[GearRule],
+                           destination: ProjectAdaptor) -> Set[str]:
+        """Adds the fixed input files of the rules that differ from the file in
+        the destination to the plan.
+
+        Args:
+          plan: the plan
+          rules: the template gear rules
+          destination: the destination project
+        Returns:
+          the names of the files to be copied
+        """
+        file_names: Set[str] = set()
+        for rule in rules:
+            file_names.update(fixed_input.name
+                              for fixed_input in rule.fixed_inputs or [])
+
+        copied: Set[str] = set()
+        for file_name in sorted(file_names):
+            file_object = self.__get_source_file(file_name)
+            if not file_object:
+                log.warning('template %s has no file %s',
+                            self.__source_project.label, file_name)
+                continue
+
+            if not self.__same_file_exists(file_object, destination):
+                plan.files.append(file_object)
+                copied.add(file_name)
+
+        return copied
+
+    def __plan_users(self, *, plan: TemplatePlan,
+                     destination: ProjectAdaptor) -> None:
+        """Adds the role assignments missing from the destination to the plan.
+
+        Args:
+          plan: the plan
+          destination: the destination project
+        """
+        for role_assignment in self.__source_project.permissions or []:
+            user_roles = destination.get_user_roles(role_assignment.id)
+            if any(role_id not in user_roles
+                   for role_id in role_assignment.role_ids):
+                plan.role_assignments.append(role_assignment)
+
+    def __plan_description(self, *, plan: TemplatePlan,
+                           destination: ProjectAdaptor,
+                           values: Dict[str, str]) -> None:
+        """Adds the description to the plan if it differs from the
+        destination.
+
+        Args:
+          plan: the plan
+          destination: the destination project
+          values: value map for substitutions into description template
+        """
         template_text = self.__source_project.description
         if not template_text:
             log.info('no description found in %s project',
                      self.__source_project.label)
             return
 
-        template = Template(template_text)
-        description = template.substitute(values)
-        destination.set_description(description)
+        description = Template(template_text).substitute(values)
+        if description != destination.project.description:
+            plan.description = description
 
-    def copy_dataviews(self, *, destination: ProjectAdaptor) -> None:
-        """Copies the dataviews from this project to the destination.
+    def __plan_apps(self, *, plan: TemplatePlan,
+                    destination: ProjectAdaptor) -> None:
+        """Adds the viewer apps to the plan if they differ from the
+        destination.
 
         Args:
+          plan: the plan
           destination: the destination project
         """
-        if not self.__dataviews:
-            log.info('copying dataviews for the template %s',
-                     self.__source_project.label)
-            self.__dataviews = self.__fw.get_dataviews(self.__source_project)
-            if not self.__dataviews:
-                log.warning('template %s has no dataviews',
-                            self.__source_project.label)
-                return
+        apps = self.__get_apps()
+        if not apps:
+            log.warning('template %s has no apps, skipping',
+                        self.__source_project.label)
+            return
 
-        # TODO: cleanup dataviews?
+        if destination.get_apps() != apps:
+            plan.apps = apps
 
-        for dataview in self.__dataviews:
-            destination_dataview = destination.get_dataview(dataview.label)
-            if destination_dataview:
-                if self.__equal_views(destination_dataview, dataview):
-                    return
-                # TODO: decide whether to modify instead?
-                self.__fw.delete_dataview(destination_dataview)
+    def __plan_copyable(self, *, plan: TemplatePlan,
+                        destination: ProjectAdaptor) -> None:
+        """Adds the copyable setting to the plan if it differs from the
+        destination.
 
-            destination.add_dataview(dataview)
+        Args:
+          plan: the plan
+          destination: the destination project
+        """
+        copyable = self.__source_project.copyable
+        if destination.project.copyable != copyable:
+            plan.copyable = copyable
 
-    def __clean_up_rules(self, destination: ProjectAdaptor) -> None:
-        """Remove any gear rules from destination that are not in this
-        template.
+    def __plan_dataviews(self, *, plan: TemplatePlan,
+                         destination: ProjectAdaptor) -> None:
+        """Adds the dataviews that are missing or differ in the destination to
+        the plan.
 
         Args:
-          destination: the detination project
+          plan: the plan
+          destination: the destination project
         """
-        destination_rules = destination.get_gear_rules()
-        if not destination_rules:
+        dataviews = self.__get_dataviews()
+        if not dataviews:
+            log.warning('template %s has no dataviews',
+                        self.__source_project.label)
             return
 
-        assert self.__rules
-        template_rulenames = [rule.name for rule in self.__rules]
-        for rule in destination_rules:
-            if rule.name not in template_rulenames:
-                log.info('removing rule %s, not in template %s', rule.name,
-                         self.__source_project.label)
-                destination.remove_gear_rule(rule=rule)
+        # TODO: cleanup dataviews?
+
+        destination_views = {
+            view.label: view
+            for view in destination.get_dataviews()
+        }
+        for dataview in dataviews:
+            destination_view = destination_views.get(dataview.label)
+            if not destination_view:
+                plan.views_to_add.append(dataview)
+            elif not self.__equal_views(destination_view, dataview):
+                plan.views_to_modify.append((dataview, destination_view))
 
     def __map_fixed_inputs(self, *, inputs: List[FixedInput],
                            destination: ProjectAdaptor) -> List[FixedInput]:
@@ -231,11 +547,6 @@ class TemplateProject:
         """
         dest_inputs = []
         for fixed_input in inputs:
-            file_object = self.__source_project.get_file(fixed_input.name)
-
-            if not self.__same_file_exists(file_object, destination):
-                self.__copy_file(file_object, destination)
-
             destination_file = destination.get_file(fixed_input.name)
             if not destination_file:
                 log.warning('Could not find file for input %s',
@@ -251,8 +562,36 @@ class TemplateProject:
 
         return dest_inputs
 
-    @staticmethod
-    def __copy_file(file: FileEntry, destination: ProjectAdaptor) -> None:
+    def __get_source_file(self, name: str) -> Optional[FileEntry]:
+        """Returns the named file of the template project.
+
+        Args:
+          name: the file name
+        Returns:
+          the file entry if the template project has the file. None, otherwise
+        """
+        with self.__lock:
+            if name not in self.__files:
+                self.__files[name] = self.__source_project.get_file(name)
+            return self.__files[name]
+
+    def __read_file(self, file: FileEntry) -> bytes:
+        """Returns the contents of the template file.
+
+        The contents are read from the template project once.
+
+        Args:
+          file: the file entry for the file
+        Returns:
+          the file contents
+        """
+        with self.__lock:
+            if file.name not in self.__file_contents:
+                self.__file_contents[file.name] = file.read()  # type: ignore
+            return self.__file_contents[file.name]
+
+    def __copy_file(self, file: FileEntry,
+                    destination: ProjectAdaptor) -> None:
         """Copies the file to the destination project.
 
         Args:
@@ -261,9 +600,11 @@ class TemplateProject:
         """
         log.info("copying file %s to %s/%s", file.name, destination.group,
                  destination.label)
-        file_spec = flywheel.FileSpec(file.name, file.read(), file.mimetype)
+        file_spec = flywheel.FileSpec(
+            file.name,
+            self.__read_file(file),  # type: ignore
+            file.mimetype)
         destination.upload_file(file_spec)
-        destination.reload()
 
     @staticmethod
     def __same_file_exists(file: FileEntry, project: ProjectAdaptor) -> bool:
@@ -294,6 +635,50 @@ class TemplateProject:
             "original file, updating", file.name, project.label)
         return False
 
+    @staticmethod
+    def __equal_rules(*, rule: GearRule, destination_rule: GearRule,
+                      destination: ProjectAdaptor, copied: Set[str]) -> bool:
+        """Checks whether the destination rule is equivalent to the template
+        rule.
+
+        Checks the properties in RULE_PROPERTIES, and that the fixed inputs
+        refer to the current version of the same files in the destination.
+
+        Args:
+          rule: the template rule
+          destination_rule: the rule with the same name in the destination
+          destination: the destination project
+          copied: the names of input files that will be copied
+        Returns:
+          True if the rules are equivalent. False, otherwise
+        """
+        for rule_property in RULE_PROPERTIES:
+            if getattr(rule, rule_property) != getattr(destination_rule,
+                                                       rule_property):
+                return False
+
+        def input_key(fixed_input: FixedInput) -> Tuple[Any, ...]:
+            return fixed_input.input, fixed_input.name, fixed_input.type
+
+        template_inputs = sorted((input_key(fixed_input)
+                                  for fixed_input in rule.fixed_inputs or []),
+                                 key=str)
+        destination_inputs = destination_rule.fixed_inputs or []
+        if template_inputs != sorted(
+            (input_key(fixed_input) for fixed_input in destination_inputs),
+                key=str):
+            return False
+
+        for fixed_input in destination_inputs:
+            if fixed_input.name in copied or fixed_input.id != destination.id:
+                return False
+            destination_file = destination.get_file(fixed_input.name)
+            if (not destination_file
+                    or destination_file.version != fixed_input.version):
+                return False
+
+        return True
+
     @staticmethod
     def __create_gear_rule_input(
             *, rule: GearRule,
@@ -335,12 +720,7 @@ class TemplateProject:
         Returns:
           True if views are equivalent on listed properties, False otherwise
         """
-        properties = [
-            "columns", "label", "sort", "error_column", "file_spec", "filter",
-            "group_by", "include_ids", "include_labels",
-            "missing_data_strategy"
-        ]
-        for view_property in properties:
+        for view_property in VIEW_PROPERTIES:
             if first.get(view_property) != second.get(view_property):
                 return False
 
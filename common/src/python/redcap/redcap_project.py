@@ -3,7 +3,7 @@
 import json
 import logging
 from json import JSONDecodeError
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, TypeVar
 
 from keys.keys import DefaultValues
 
@@ -18,8 +18,29 @@ NACC_STAFF_ROLE = 'NACC_STAFF_ROLE'
 CENTER_USER_ROLE = 'CENTER_USER_ROLE'
 NACC_GEARBOT_ROLE = 'NACC_GEARBOT_ROLE'
 
+DEFAULT_CHUNK_SIZE = 100
+
 log = logging.getLogger()
 
+T = TypeVar('T')
+
+
+def chunks(items: Sequence[T], chunk_size: int) -> List[List[T]]:
+    """Splits the items into consecutive lists of at most chunk_size items.
+
+    Args:
+        items: the items to split
+        chunk_size: the maximum number of items in a chunk
+
+    Returns:
+        the list of chunks
+    """
+    assert chunk_size > 0, "chunk size must be positive"
+    return [
+        list(items[index:index + chunk_size])
+        for index in range(0, len(items), chunk_size)
+    ]
+
 
 def get_nacc_developer_permissions(
         *,
@@ -89,6 +110,8 @@ class REDCapProject:
         self.__pk_field = pk_field
         self.__longitudinal = longitudinal
         self.__repeating_ins = repeating_ins
+        self.__user_roles: Optional[List[Dict[str, Any]]] = None
+        self.__user_role_mappings: Optional[Dict[str, str]] = None
 
     @classmethod
     def create(cls, redcap_con: REDCapConnection) -> 'REDCapProject':
@@ -147,16 +170,73 @@ class REDCapProject:
     def export_user_roles(self) -> List[Dict[str, Any]]:
         """Export user roles defined in the project.
 
+        The roles are cached after the first export, use `clear_cache` to
+        force a new export.
+
         Returns:
             List of user role dicts specifying permissions for each role
 
         Raises:
           REDCapConnectionError if the response has an error
         """
+        if self.__user_roles is not None:
+            return self.__user_roles
+
         message = "exporting user roles"
         data = {'content': 'userRole'}
 
-        return self.__redcap_con.request_json_value(data=data, message=message)
+        self.__user_roles = self.__redcap_con.request_json_value(
+            data=data, message=message)
+        return self.__user_roles
+
+    def export_user_role_mappings(self) -> Dict[str, str]:
+        """Export the user-role assignments in the project.
+
+        The assignments are cached after the first export and kept up to date
+        on role assignment through this object.
+
+        Returns:
+            Dictionary mapping username to unique role name
+
+        Raises:
+          REDCapConnectionError if the response has an error
+        """
+        if self.__user_role_mappings is not None:
+            return self.__user_role_mappings
+
+        message = "exporting user-role assignments"
+        data = {'content': 'userRoleMapping'}
+
+        mappings = self.__redcap_con.request_json_value(data=data,
+                                                        message=message)
+        self.__user_role_mappings = {
+            mapping['username']: mapping['unique_role_name']
+            for mapping in mappings
+        }
+        return self.__user_role_mappings
+
+    def get_role_name(self, role_label: str) -> Optional[str]:
+        """Returns the unique role name for the role label.
+
+        Args:
+            role_label: the REDCap user role label
+
+        Returns:
+            the unique REDCap generated role name if found, else None
+
+        Raises:
+          REDCapConnectionError if the response has an error
+        """
+        for role in self.export_user_roles():
+            if role['role_label'] == role_label:
+                return role['unique_role_name']
+
+        return None
+
+    def clear_cache(self) -> None:
+        """Clears cached user roles and user-role assignments."""
+        self.__user_roles = None
+        self.__user_role_mappings = None
 
     def assign_user_role(self, username: str, role: str) -> int:
         """Assign given user to a user role in REDCap project.
@@ -179,8 +259,12 @@ class REDCapProject:
                 "unique_role_name": role
             }])
         }
-        return self.__redcap_con.request_json_value(
+        result = self.__redcap_con.request_json_value(
             data=data, message=f"assigning user {username} to role {role}")
+        if self.__user_role_mappings is not None:
+            self.__user_role_mappings[username] = role
+
+        return result
 
     def add_user(self, user_info: Dict[str, Any]) -> int:
         """Import a new user into a project and set user privileges, or update
@@ -203,6 +287,8 @@ class REDCapProject:
             'data': info,
         }
 
+        # importing a user may change the role assignment of the user
+        self.__user_role_mappings = None
         return self.__redcap_con.request_json_value(data=data, message=message)
 
     def assign_update_user_role_by_label(self, username: str,
@@ -215,18 +301,17 @@ class REDCapProject:
         """
 
         try:
-            roles = self.export_user_roles()
-            role_name = None
-            for role in roles:
-                if role['role_label'] == role_label:
-                    role_name = role['unique_role_name']
-                    break
-
+            role_name = self.get_role_name(role_label)
             if not role_name:
                 log.error('User role %s does not exist in REDCap project %s',
                           role_label, self.title)
                 return False
 
+            if self.export_user_role_mappings().get(username) == role_name:
+                log.info('User %s already assigned role %s in project %s',
+                         username, role_label, self.title)
+                return True
+
             self.assign_user_role(username, role_name)
         except REDCapConnectionError as error:
             log.error(
@@ -286,6 +371,58 @@ class REDCapProject:
 
         return num_records
 
+    def import_record_list(self,
+                           records: List[Dict[str, Any]],
+                           chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Import the records to the REDCap project in JSON format.
+
+        Records are imported in chunks of at most chunk_size records.
+
+        Args:
+            records: the list of records
+            chunk_size: maximum number of records per request
+
+        Returns:
+            int: Number of records imported
+
+        Raises:
+          REDCapConnectionError if a response has an error
+        """
+        count = 0
+        for chunk in chunks(records, chunk_size):
+            count += self.import_records(json.dumps(chunk), data_format='json')
+
+        return count
+
+    def delete_records(self,
+                       record_ids: List[str],
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Delete the records from the REDCap project.
+
+        Records are deleted in chunks of at most chunk_size records.
+
+        Args:
+            record_ids: the IDs of the records to delete
+            chunk_size: maximum number of records per request
+
+        Returns:
+            int: Number of records deleted
+
+        Raises:
+          REDCapConnectionError if a response has an error
+        """
+        count = 0
+        for chunk in chunks(record_ids, chunk_size):
+            data = {'content': 'record', 'action': 'delete'}
+            for index, record_id in enumerate(chunk):
+                data[f'records[{index}]'] = record_id
+
+            count += int(
+                self.__redcap_con.request_json_value(
+                    data=data, message=f"deleting {len(chunk)} records"))
+
+        return count
+
     def export_records(
             self,
             *,
@@ -14,11 +14,16 @@ log = logging.getLogger(__name__)
 
 
 class REDCapParametersRepository:
-    """Repository for REDCap connection credentials."""
+    """Repository for REDCap connection credentials.
+
+    REDCap project objects are cached by PID, so that project info, field
+    names and user roles are only exported once per project.
+    """
 
     def __init__(self,
                  redcap_params: Optional[Dict[str, REDCapParameters]] = None):
         self.__redcap_params = redcap_params if redcap_params else {}
+        self.__redcap_projects: Dict[int, REDCapProject] = {}
 
     @property
     def redcap_params(self) -> Dict[str, REDCapParameters]:
@@ -56,6 +61,7 @@ class REDCapParametersRepository:
             parameters: REDCap connection credentials
         """
         self.redcap_params[f'pid_{pid}'] = parameters
+        self.__redcap_projects.pop(pid, None)
 
     def get_project_parameters(self, pid: int) -> Optional[REDCapParameters]:
         """Retrieve REDCap parameters for the given project.
@@ -72,12 +78,17 @@ class REDCapParametersRepository:
         """Get an API connection to the REDCap project identified by the PID
         using parameters stored in the repo.
 
+        Returns the cached project if the project was previously loaded.
+
         Args:
             pid: REDCap PID
 
         Returns:
             REDCapProject(optional): REDCap project if connection is successful
         """
+        redcap_project = self.__redcap_projects.get(pid)
+        if redcap_project:
+            return redcap_project
 
         redcap_params = self.get_project_parameters(pid)
         if not redcap_params:
@@ -88,7 +99,22 @@ class REDCapParametersRepository:
 
         redcap_con = REDCapConnection.create_from(redcap_params)
         try:
-            return REDCapProject.create(redcap_con)
+            redcap_project = REDCapProject.create(redcap_con)
         except REDCapConnectionError as error:
             log.error(error)
             return None
+
+        self.__redcap_projects[pid] = redcap_project
+        return redcap_project
+
+    def clear_project_cache(self, pid: Optional[int] = None) -> None:
+        """Removes cached REDCap projects.
+
+        Args:
+            pid (optional): REDCap PID, clears all projects if not specified
+        """
+        if pid is None:
+            self.__redcap_projects.clear()
+            return
+
+        self.__redcap_projects.pop(pid, None)
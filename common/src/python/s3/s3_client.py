@@ -1,17 +1,26 @@
 """Utilities for using S3 client."""
 import logging
-from io import StringIO
-from typing import Optional
+from io import StringIO, TextIOWrapper
+from typing import Any, Dict, Iterator, Optional, TextIO
 
 import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
 from inputs.environment import get_environment_variable
 from inputs.parameter_store import S3Parameters
 from keys.keys import DefaultValues
+from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
 
 
+class S3ObjectInfo(BaseModel):
+    """The metadata of an object from a bucket listing."""
+    key: str
+    etag: Optional[str] = None
+    size: Optional[int] = None
+
+
 class S3BucketReader:
     """Reads files from an S3 bucket."""
 
@@ -49,17 +58,50 @@ class S3BucketReader:
 
         return StringIO(file_obj['Body'].read().decode('utf-8'))
 
-    def read_directory(self, prefix: str) -> dict[str, dict]:
-        """Retrieve all file objects from the directory specified by the prefix
-        within the S3 bucket.
+    def read_stream(self, filename: str) -> TextIO:
+        """Opens the file object from S3 as a text stream.
+
+        The object is read from S3 as the stream is read, so the object does
+        not have to fit in memory.
 
         Args:
-            prefix: directory prefix within the bucket
+          filename: name of file
         Returns:
-            Dict[str, Dict]: Set of file objects
+          the text stream for the object body
         """
+        file_obj = self.__client.get_object(Bucket=self.__bucket, Key=filename)
 
-        file_objects = {}
+        return TextIOWrapper(file_obj['Body'], encoding='utf-8')
+
+    def get_etag(self, filename: str) -> Optional[str]:
+        """Returns the ETag of the file object without reading the object.
+
+        Args:
+          filename: name of file
+        Returns:
+          the ETag of the object. None if the object metadata is not available
+        """
+        try:
+            response = self.__client.head_object(Bucket=self.__bucket,
+                                                 Key=filename)
+        except ClientError as error:
+            log.warning('Unable to get metadata for %s: %s', filename, error)
+            return None
+
+        return response.get('ETag')
+
+    def iter_objects(self, prefix: str) -> Iterator[S3ObjectInfo]:
+        """Lists the objects in the directory specified by the prefix within
+        the S3 bucket without reading the objects.
+
+        Pages of the listing are requested as the iterator is consumed.
+        Use get_object to read the objects that are needed.
+
+        Args:
+            prefix: directory prefix within the bucket
+        Returns:
+            iterator over the metadata of the objects
+        """
         paginator = self.__client.get_paginator('list_objects_v2')
         pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
         for page in pages:
@@ -68,11 +110,38 @@ class S3BucketReader:
 
             for s3_obj_info in page['Contents']:
                 # Skip paths ending in /
-                if not s3_obj_info['Key'].endswith('/'):
-                    s3_obj = self.__client.get_object(Bucket=self.bucket_name,
-                                                      Key=s3_obj_info['Key'])
-                    if s3_obj:
-                        file_objects[s3_obj_info['Key']] = s3_obj
+                if s3_obj_info['Key'].endswith('/'):
+                    continue
+
+                yield S3ObjectInfo(key=s3_obj_info['Key'],
+                                   etag=s3_obj_info.get('ETag'),
+                                   size=s3_obj_info.get('Size'))
+
+    def get_object(self, key: str) -> Dict[str, Any]:
+        """Gets the file object with the key from the S3 bucket.
+
+        Args:
+            key: the object key
+        Returns:
+            the file object, where the Body is read on demand
+        """
+        return self.__client.get_object(Bucket=self.bucket_name, Key=key)
+
+    def read_directory(self, prefix: str) -> dict[str, dict]:
+        """Retrieve all file objects from the directory specified by the prefix
+        within the S3 bucket.
+
+        Args:
+            prefix: directory prefix within the bucket
+        Returns:
+            Dict[str, Dict]: Set of file objects
+        """
+
+        file_objects = {}
+        for s3_obj_info in self.iter_objects(prefix):
+            s3_obj = self.get_object(s3_obj_info.key)
+            if s3_obj:
+                file_objects[s3_obj_info.key] = s3_obj
 
         return file_objects
 
@@ -1,15 +1,65 @@
 """Defines class for handling tabular data that needs to be split by site."""
+import hashlib
 import logging
 import re
-from io import StringIO
-from typing import Dict, Optional, Set
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
 
 import pandas as pd
 from flywheel import FileSpec
 from flywheel_adaptor.flywheel_proxy import ProjectAdaptor
+from keys.keys import MetadataKeys
 
 log = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def get_site_column(columns: Iterable[str]) -> Optional[str]:
+    """Returns the name of the column used for the site ID.
+
+    Args:
+      columns: the column names of the table
+    Returns:
+      ADCID or SITE if the column occurs in the table. None, otherwise
+    """
+    column_names = set(columns)
+    if 'ADCID' in column_names:
+        return 'ADCID'
+    if 'SITE' in column_names:
+        return 'SITE'
+
+    return None
+
+
+def get_adcid(site_id_name: str, site_key: Any) -> Optional[str]:
+    """Returns the ADCID for the value of the site column.
+
+    Args:
+      site_id_name: the name of the site column
+      site_key: the value in the site column
+    Returns:
+      the ADCID as a string. None, if a SITE value has no ADCID
+    """
+    if site_id_name == 'ADCID':
+        return str(site_key)
+
+    match = re.search(r"([^(]+)\(ADC\s?(\d+)\)", str(site_key))
+    if not match:
+        return None
+
+    return match.group(2).strip()
+
 
 class SiteTable:
     """Wrapper for data frame for table with Center ID column.
@@ -23,36 +73,33 @@ class SiteTable:
         self.__data_table = data
         self.__site_column = site_id_column
         self.__site_map = site_map
+        self.__groups: Optional[Dict[Any, Any]] = None
 
     @classmethod
-    def create_from(cls, object_data: StringIO) -> Optional['SiteTable']:
+    def create_from(cls, object_data: TextIO) -> Optional['SiteTable']:
         """Creates table object and recognizes which column is used for site
         ID.
 
+        Values are kept as the text in the input, so that the site tables are
+        the same as those from split_site_csv.
+
         Args:
           table_data: the data frame with data
         Returns:
           a wrapper object for the data frame or None if no center id column
         """
-        table_data = pd.read_csv(object_data)
+        table_data = pd.read_csv(object_data, dtype=str, keep_default_na=False)
 
-        if 'ADCID' in table_data.columns:
-            site_id_name = 'ADCID'
-        elif 'SITE' in table_data.columns:
-            site_id_name = 'SITE'
-        else:
+        site_id_name = get_site_column(table_data.columns)
+        if not site_id_name:
             return None
 
         site_ids = table_data[site_id_name].to_list()
         site_map = {}
         for site_key in site_ids:
-            if site_id_name == 'ADCID':
-                adcid = str(site_key)
-            else:
-                match = re.search(r"([^(]+)\(ADC\s?(\d+)\)", site_key)
-                if not match:
-                    continue
-                adcid = match.group(2).strip()
+            adcid = get_adcid(site_id_name, site_key)
+            if adcid is None:
+                continue
             site_map[adcid] = site_key
 
         return SiteTable(data=table_data,
@@ -67,6 +114,38 @@ class SiteTable:
         """
         return set(self.__site_map.keys())
 
+    def __get_partition(self, site_id: Any) -> Optional[pd.DataFrame]:
+        """Returns the rows of the table with the site ID.
+
+        The table is grouped by site in a single pass the first time a
+        partition is selected.
+
+        Args:
+          site_id: the value of the site column
+        Returns:
+          the data frame with rows for the site. None, if there are none
+        """
+        if self.__groups is None:
+            self.__groups = self.__data_table.groupby(self.__site_column,
+                                                      sort=False).indices
+
+        indices = self.__groups.get(site_id)
+        if indices is None:
+            return None
+
+        return self.__data_table.iloc[indices]
+
+    def partitions(self) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Returns an iterator over the partitions of the table by site.
+
+        Returns:
+          iterator of ADCID and data frame pairs
+        """
+        for adcid, site_id in self.__site_map.items():
+            site_table = self.__get_partition(site_id)
+            if site_table is not None:
+                yield adcid, site_table
+
     def select_site(self, adcid: str) -> Optional[str]:
         """Selects the rows of the table for the site.
 
@@ -79,20 +158,213 @@ class SiteTable:
         if not site_id:
             return None
 
-        site_table = self.__data_table.loc[self.__data_table[
-            self.__site_column] == site_id]
+        site_table = self.__get_partition(site_id)
+        if site_table is None:
+            return None
+
         return site_table.to_csv(index=False)
 
 
-def upload_split_table(*, table: SiteTable,
+def split_site_csv(
+        *,
+        object_data: TextIO,
+        output_dir: Path,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Optional[Dict[str, Path]]:
+    """Splits a CSV table by site into a file per ADCID, reading the table
+    in chunks.
+
+    Values are kept as the text in the input, and each chunk is grouped in a
+    single pass with the rows for each site appended to the site file.
+
+    Args:
+      object_data: the table data stream
+      output_dir: the directory for the site files
+      chunk_size: the number of rows read at a time
+    Returns:
+      the paths of the site files keyed by ADCID, or None if the table has no
+      center id column
+    """
+    site_files: Dict[str, Path] = {}
+    site_id_name: Optional[str] = None
+    chunks = pd.read_csv(object_data,
+                         dtype=str,
+                         keep_default_na=False,
+                         chunksize=chunk_size)
+    for chunk in chunks:
+        if site_id_name is None:
+            site_id_name = get_site_column(chunk.columns)
+            if not site_id_name:
+                return None
+
+        for site_key, site_table in chunk.groupby(site_id_name, sort=False):
+            adcid = get_adcid(site_id_name, site_key)
+            if adcid is None:
+                continue
+
+            site_file = site_files.get(adcid)
+            write_header = site_file is None
+            if site_file is None:
+                site_file = output_dir / f'{adcid}.csv'
+                site_files[adcid] = site_file
+            site_table.to_csv(site_file,
+                              mode='a',
+                              header=write_header,
+                              index=False)
+
+    return site_files
+
+
+def content_hash(contents: str) -> str:
+    """Returns the hash of the file contents.
+
+    Args:
+      contents: the file contents
+    Returns:
+      the hexadecimal SHA-256 digest of the contents
+    """
+    return hashlib.sha256(contents.encode('utf-8')).hexdigest()
+
+
+def get_file_info(project: ProjectAdaptor, file_name: str) -> Dict[str, Any]:
+    """Returns the info object of the named file in the project.
+
+    Args:
+      project: the project
+      file_name: the file name
+    Returns:
+      the file info, or an empty dictionary if there is no such file
+    """
+    file = project.get_file(file_name)
+    if not file or not file.info:
+        return {}
+
+    return file.info
+
+
+def is_table_unchanged(
+        *, file_name: str, source_etag: str,
+        project_map: Dict[str, Optional[ProjectAdaptor]]) -> bool:
+    """Checks whether the site files for the table were all split from the
+    source with the ETag.
+
+    The ADCIDs with rows in the source are recorded in the info of the site
+    files, so only the projects for those ADCIDs are expected to have the
+    file.
+    A project for one of the ADCIDs without the site file, such as a newly
+    added center, is treated as changed so that the table is split for the
+    project.
+
+    Args:
+      file_name: the name of the table
+      source_etag: the ETag of the source table
+      project_map: the projects for site files keyed by ADCID
+    Returns:
+      True if a site file was split from the source, and the project for
+      each ADCID in the source has a site file split from the source. False,
+      otherwise.
+    """
+    source_adcids: Optional[List[str]] = None
+    for project in project_map.values():
+        if not project:
+            continue
+
+        info = get_file_info(project, file_name)
+        if (info.get(MetadataKeys.SOURCE_ETAG) == source_etag
+                and MetadataKeys.SOURCE_ADCIDS in info):
+            source_adcids = info[MetadataKeys.SOURCE_ADCIDS]
+            break
+
+    if source_adcids is None:
+        return False
+
+    for adcid in source_adcids:
+        project = project_map.get(adcid)
+        if not project:
+            continue
+
+        info = get_file_info(project, file_name)
+        if info.get(MetadataKeys.SOURCE_ETAG) != source_etag:
+            return False
+
+    return True
+
+
+def upload_site_file(*,
+                     project: ProjectAdaptor,
+                     file_name: str,
+                     contents: str,
+                     dry_run: bool,
+                     source_etag: Optional[str] = None,
+                     source_adcids: Optional[List[str]] = None) -> bool:
+    """Uploads the site file to the project unless the contents are the same
+    as the existing file.
+
+    The content hash, source ETag and ADCIDs of the source are saved in the
+    file info.
+
+    Args:
+      project: the site project
+      file_name: the name of the file
+      contents: the file contents
+      dry_run: whether to skip the upload
+      source_etag: the ETag of the source table
+      source_adcids: the ADCIDs with rows in the source table
+    Returns:
+      True if the file was uploaded. False, otherwise
+    """
+    source_info: Dict[str, Any] = {}
+    if source_etag:
+        source_info[MetadataKeys.SOURCE_ETAG] = source_etag
+        if source_adcids is not None:
+            source_info[MetadataKeys.SOURCE_ADCIDS] = source_adcids
+
+    digest = content_hash(contents)
+    info = get_file_info(project, file_name)
+    if info.get(MetadataKeys.CONTENT_HASH) == digest:
+        log.info('File %s unchanged in %s/%s', file_name, project.group,
+                 project.label)
+        if not dry_run and any(
+                info.get(key) != value for key, value in source_info.items()):
+            project.get_file(file_name).update_info(source_info)
+        return False
+
+    if dry_run:
+        log.info('Dry run: would upload file %s to  %s/%s', file_name,
+                 project.group, project.label)
+        return False
+
+    file_spec = FileSpec(name=file_name,
+                         contents=contents,
+                         content_type='text/csv')
+    project.upload_file(file_spec)
+
+    project.reload()
+    file = project.get_file(file_name)
+    if file:
+        file.update_info({MetadataKeys.CONTENT_HASH: digest, **source_info})
+
+    return True
+
+
+def upload_split_table(*,
+                       table: SiteTable,
                        project_map: Dict[str, Optional[ProjectAdaptor]],
-                       file_name: str, dry_run: bool) -> None:
+                       file_name: str,
+                       dry_run: bool,
+                       source_etag: Optional[str] = None) -> None:
     """Splits the site table by ADCID and uploads partitions to a project.
 
+    Partitions that are the same as the file in the project are not
+    uploaded.
+
     Args:
       table: the table to be split
       project_map: ADCID to project mapping
+      file_name: the name for the uploaded files
+      dry_run: whether to skip the upload
+      source_etag: the ETag of the source table
     """
+    source_adcids = sorted(table.get_adcids())
     for adcid, project in project_map.items():
         if not project:
             log.warning('No project for ADCID %s', adcid)
@@ -103,12 +375,45 @@ def upload_split_table(*, table: SiteTable,
             log.error('Unable to select site data for ADCID %s', adcid)
             continue
 
-        if dry_run:
-            log.info('Dry run: would upload file %s to  %s/%s', file_name,
-                     project.group, project.label)
+        upload_site_file(project=project,
+                         file_name=file_name,
+                         contents=site_table,
+                         dry_run=dry_run,
+                         source_etag=source_etag,
+                         source_adcids=source_adcids)
+
+
+def upload_split_files(*,
+                       site_files: Dict[str, Path],
+                       project_map: Dict[str, Optional[ProjectAdaptor]],
+                       file_name: str,
+                       dry_run: bool,
+                       source_etag: Optional[str] = None) -> None:
+    """Uploads the site files from split_site_csv to the site projects.
+
+    Files that are the same as the file in the project are not uploaded.
+
+    Args:
+      site_files: ADCID to site file mapping
+      project_map: ADCID to project mapping
+      file_name: the name for the uploaded files
+      dry_run: whether to skip the upload
+      source_etag: the ETag of the source table
+    """
+    source_adcids = sorted(site_files)
+    for adcid, project in project_map.items():
+        if not project:
+            log.warning('No project for ADCID %s', adcid)
+            continue
+
+        site_file = site_files.get(adcid)
+        if not site_file:
+            log.error('Unable to select site data for ADCID %s', adcid)
             continue
 
-        file_spec = FileSpec(name=file_name,
-                             contents=site_table,
-                             content_type='text/csv')
-        project.upload_file(file_spec)
+        upload_site_file(project=project,
+                         file_name=file_name,
+                         contents=site_file.read_text(encoding='utf-8'),
+                         dry_run=dry_run,
+                         source_etag=source_etag,
+                         source_adcids=source_adcids)
@@ -1,12 +1,12 @@
 """Module for applying required transformations to an input visit record."""
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from dates.form_dates import DEFAULT_DATE_FORMAT, convert_date
+from dates.form_dates import DEFAULT_DATE_FORMAT, DateNormalizer
 from keys.keys import FieldNames
 from outputs.errors import ErrorWriter, unexpected_value_error
-from pydantic import BaseModel, RootModel
+from pydantic import BaseModel, PrivateAttr, RootModel
 
 log = logging.getLogger(__name__)
 
@@ -33,29 +33,34 @@ class FieldFilter(BaseModel):
     """Defines a map of form field names for different versions of the form."""
     version_map: VersionMap
     fields: Dict[str, List[str]] = {}
+    _unique_fields: Dict[str,
+                         FrozenSet[str]] = PrivateAttr(default_factory=dict)
 
-    def __unique_fields(self, version_name: str) -> Set[str]:
+    def unique_fields(self, version_name: str) -> FrozenSet[str]:
         """Finds the field names unique to the version.
 
+        The result is computed once per version name.
+
         Args:
           version_name: the name of the form version
         Returns:
           the set of field names unique to the version
         """
-        field_set = set(self.fields.get(version_name, set()))
-        if not field_set:
+        field_set = self._unique_fields.get(version_name)
+        if field_set is not None:
             return field_set
 
-        for key in self.fields:
-            if key == version_name:
-                continue
-
-            key_fields = self.fields.get(key)
-            if not key_fields:
+        unique_set = set(self.fields.get(version_name, set()))
+        for key, key_fields in self.fields.items():
+            if not unique_set:
+                break
+            if key == version_name or not key_fields:
                 continue
 
-            field_set = field_set.difference(set(key_fields))
+            unique_set = unique_set.difference(key_fields)
 
+        field_set = frozenset(unique_set)
+        self._unique_fields[version_name] = field_set
         return field_set
 
     def apply(self, input_record: Dict[str, Any]) -> Dict[str, Any]:
@@ -69,7 +74,99 @@ class FieldFilter(BaseModel):
           the input_record without the keys for the excluded fields
         """
         version_name = self.version_map.apply(input_record)
-        drop_fields = self.__unique_fields(version_name)
+        drop_fields = self.unique_fields(version_name)
+        if not drop_fields:
+            return input_record
+
+        return {
+            field: value
+            for field, value in input_record.items()
+            if field not in drop_fields
+        }
+
+
+class VersionFilterPlan:
+    """Defines a field filter compiled to the fields dropped for each value of
+    the version field."""
+
+    def __init__(self, field_filter: FieldFilter) -> None:
+        version_map = field_filter.version_map
+        self.__fieldname = version_map.fieldname
+        self.__default = field_filter.unique_fields(version_map.default)
+        self.__drop_sets = {
+            value: field_filter.unique_fields(version_name)
+            for value, version_name in version_map.value_map.items()
+        }
+
+    def drop_fields(self, record: Dict[str, Any],
+                    dropped: FrozenSet[str]) -> FrozenSet[str]:
+        """Returns the fields dropped by the filter for the record.
+
+        Args:
+          record: the input record
+          dropped: fields dropped by filters applied before this one
+        Returns:
+          the set of fields to drop
+        """
+        if self.__fieldname in dropped:
+            return self.__default
+
+        field_value = record.get(self.__fieldname)
+        if field_value and field_value in self.__drop_sets:
+            return self.__drop_sets[field_value]
+
+        return self.__default
+
+
+class FilterPlan:
+    """Defines the field filters of a module compiled into a single projection
+    of the record.
+
+    Equivalent to applying the filters in sequence.
+    """
+
+    def __init__(self, filters: List[FieldFilter]) -> None:
+        self.__plans = [
+            VersionFilterPlan(field_filter) for field_filter in filters
+        ]
+        self.__unions: Dict[Tuple[FrozenSet[str], FrozenSet[str]],
+                            FrozenSet[str]] = {}
+
+    def drop_fields(self, record: Dict[str, Any]) -> FrozenSet[str]:
+        """Returns the fields dropped by the filters for the record.
+
+        Args:
+          record: the input record
+        Returns:
+          the set of fields to drop
+        """
+        dropped: FrozenSet[str] = frozenset()
+        for plan in self.__plans:
+            drop_set = plan.drop_fields(record, dropped)
+            if not drop_set:
+                continue
+            if not dropped:
+                dropped = drop_set
+                continue
+
+            key = (dropped, drop_set)
+            union = self.__unions.get(key)
+            if union is None:
+                union = dropped.union(drop_set)
+                self.__unions[key] = union
+            dropped = union
+
+        return dropped
+
+    def apply(self, input_record: Dict[str, Any]) -> Dict[str, Any]:
+        """Drops the fields removed by the filters from the record.
+
+        Args:
+          input_record: the record to filter
+        Returns:
+          the input record without the keys for the dropped fields
+        """
+        drop_fields = self.drop_fields(input_record)
         if not drop_fields:
             return input_record
 
@@ -122,6 +219,16 @@ class FieldTransformations(RootModel):
 
         self.root[key].append(value)
 
+    def compile(self, key: ModuleName) -> FilterPlan:
+        """Compiles the filters for the module name into a single plan.
+
+        Args:
+          key: the module name
+        Returns:
+          the filter plan for the module
+        """
+        return FilterPlan(self.get(key))
+
 
 class BaseRecordTransformer(ABC):
 
@@ -178,6 +285,7 @@ class DateTransformer(BaseRecordTransformer):
             schema_file(optional): name of the transformation schema file
         """
         self._error_writer = error_writer
+        self._normalizer = DateNormalizer(date_format=DEFAULT_DATE_FORMAT)
 
     def transform(self, input_record: Dict[str, Any],
                   line_num: int) -> Optional[Dict[str, Any]]:
@@ -193,9 +301,8 @@ class DateTransformer(BaseRecordTransformer):
         if FieldNames.DATE_COLUMN not in input_record:
             return input_record
 
-        normalized_date = convert_date(
-            date_string=input_record[FieldNames.DATE_COLUMN],
-            date_format=DEFAULT_DATE_FORMAT)  # type: ignore
+        normalized_date = self._normalizer.normalize(
+            input_record[FieldNames.DATE_COLUMN])
         if not normalized_date:
             self._error_writer.write(
                 unexpected_value_error(
@@ -229,10 +336,48 @@ class FilterTransformer(BaseRecordTransformer):
         return self._transform.apply(input_record)
 
 
+class FilterPlanTransformer(BaseRecordTransformer):
+    """Defines a transform that applies the compiled field filters of a module
+    to a record."""
+
+    def __init__(self, plan: FilterPlan) -> None:
+        self._plan = plan
+
+    def transform(self, input_record: Dict[str, Any],
+                  line_num: int) -> Optional[Dict[str, Any]]:
+        """Applies the FilterPlan to the input record.
+
+        Args:
+          input_record: the input record
+          line_num: the line number of the record in the input
+        Returns:
+          the record with fields filtered
+        """
+        return self._plan.apply(input_record)
+
+
 class TransformerFactory:
 
     def __init__(self, transformations: FieldTransformations) -> None:
         self.__transformations = transformations
+        self.__plans: Dict[ModuleName, FilterPlan] = {}
+
+    def get_plan(self, module: ModuleName) -> FilterPlan:
+        """Returns the compiled filter plan for the module.
+
+        Plans are compiled once per module.
+
+        Args:
+          module: the module name
+        Returns:
+          the filter plan for the module
+        """
+        plan = self.__plans.get(module)
+        if plan is None:
+            plan = self.__transformations.compile(module)
+            self.__plans[module] = plan
+
+        return plan
 
     def create(self, module: Optional[str],
                error_writer: ErrorWriter) -> RecordTransformer:
@@ -249,9 +394,8 @@ class TransformerFactory:
         """
         transformer_list: List[BaseRecordTransformer] = []
         transformer_list.append(DateTransformer(error_writer))
-        if module:
-            filter_list = self.__transformations.get(module)
-            for field_filter in filter_list:
-                transformer_list.append(FilterTransformer(field_filter))
+        if module and self.__transformations.get(module):
+            transformer_list.append(
+                FilterPlanTransformer(self.get_plan(module)))
 
         return RecordTransformer(transformer_list)
@@ -4,7 +4,6 @@ from datetime import datetime
 from string import Template
 from typing import Any, Dict, List, Literal, Optional, TypedDict
 
-import yaml
 from flywheel.file_spec import FileSpec
 from flywheel.rest import ApiException
 from flywheel_adaptor.flywheel_proxy import ProjectAdaptor
@@ -13,6 +12,7 @@ from flywheel_adaptor.subject_adaptor import (
     SubjectAdaptor,
     SubjectError,
 )
+from inputs.yaml import dump_to_text
 from keys.keys import DefaultValues, FieldNames
 from outputs.errors import (
     FileError,
@@ -183,10 +183,8 @@ class FormJSONUploader:
         for participant, visits_mapping in self.__pending_visits.items():
             subject = visits_mapping['subject']
             visits = visits_mapping['visits']
-            yaml_content = yaml.safe_dump(
-                data=visits.model_dump(serialize_as_any=True),
-                allow_unicode=True,
-                default_flow_style=False)
+            yaml_content = dump_to_text(
+                visits.model_dump(serialize_as_any=True))
             filename = f'{participant}-{self.__module}-visits-pending-qc-{timestamp}.yaml'  # NOQA E501
             file_spec = FileSpec(name=filename,
                                  contents=yaml_content,
@@ -0,0 +1,213 @@
+"""Classes for changes to the NACC directory between pulls.
+
+A snapshot of the directory is a compact JSON object with the serialized
+directory entries keyed by email address.
+Comparing the entries from a pull against the snapshot of the entries applied
+by user management gives the change set of entries that were added, modified
+or archived.
+
+The snapshot is only advanced once user management records that it applied
+the change set, by setting APPLIED_VERSION in the file info of the change set
+to the file version.
+Until then, each pull computes the changes against the same snapshot, so
+change sets build up rather than being lost if user management fails.
+User management also records in PENDING_EMAILS the active entries whose users
+are not yet fully set up (e.g., unclaimed), and these are left out of the
+snapshot so that they are sent again with the next change set.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List
+
+from pydantic import BaseModel, Field
+
+from users.nacc_directory import PersonName, UserEntry
+
+log = logging.getLogger(__name__)
+
+DirectorySnapshot = Dict[str, Dict[str, Any]]
+
+APPLIED_VERSION = 'applied_version'
+PENDING_EMAILS = 'pending_emails'
+FULL_PASS_DATE = 'full_pass_date'
+
+
+def create_snapshot(entries: Iterable[UserEntry]) -> DirectorySnapshot:
+    """Creates the directory snapshot for the entries.
+
+    If an email occurs in more than one entry, the last entry is kept.
+
+    Args:
+      entries: the directory entries
+    Returns:
+      the serialized entries keyed by email
+    """
+    return {
+        entry.email: entry.model_dump(mode='json', serialize_as_any=True)
+        for entry in entries
+    }
+
+
+def dump_snapshot(snapshot: DirectorySnapshot) -> str:
+    """Serializes the snapshot as compact JSON.
+
+    Args:
+      snapshot: the directory snapshot
+    Returns:
+      the JSON text for the snapshot
+    """
+    return json.dumps(snapshot, separators=(',', ':'), sort_keys=True)
+
+
+def load_snapshot(text: str | bytes) -> DirectorySnapshot:
+    """Loads the snapshot from the JSON text.
+
+    Args:
+      text: the JSON text for the snapshot
+    Returns:
+      the directory snapshot
+    Raises:
+      ValueError if the text is not a JSON object
+    """
+    snapshot = json.loads(text)
+    if not isinstance(snapshot, dict):
+        raise ValueError('Expected directory snapshot to be a JSON object')
+
+    return snapshot
+
+
+class DirectoryChangeSet(BaseModel):
+    """The directory entries that changed since the previous snapshot.
+
+    Use model_dump(serialize_as_any=True)
+    """
+    added: List[UserEntry] = Field(default_factory=list)
+    modified: List[UserEntry] = Field(default_factory=list)
+    archived: List[UserEntry] = Field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.modified) + len(self.archived)
+
+    def entries(self) -> List[UserEntry]:
+        """Returns all of the entries in the change set.
+
+        Returns:
+          the added, modified and archived entries
+        """
+        return self.added + self.modified + self.archived
+
+    @classmethod
+    def create(cls, change_object: Dict[str, Any]) -> 'DirectoryChangeSet':
+        """Creates a change set from a dictionary matching the output of
+        model_dump.
+
+        Args:
+          change_object: the dictionary for the change set
+        Returns:
+          the change set
+        Raises:
+          UserFormatError if an entry is not a valid user entry
+        """
+        return DirectoryChangeSet(
+            added=[
+                UserEntry.create(entry)
+                for entry in change_object.get('added') or []
+            ],
+            modified=[
+                UserEntry.create(entry)
+                for entry in change_object.get('modified') or []
+            ],
+            archived=[
+                UserEntry.create(entry)
+                for entry in change_object.get('archived') or []
+            ])
+
+    @classmethod
+    def is_change_set(cls, user_object: Any) -> bool:
+        """Indicates whether an object loaded from a user file is a change
+        set rather than a list of entries.
+
+        Args:
+          user_object: the object loaded from the file
+        Returns:
+          True if the object is a change set. False, otherwise
+        """
+        return isinstance(user_object,
+                          dict) and bool({'added', 'modified', 'archived'}
+                                         & set(user_object.keys()))
+
+
+def apply_changes(
+    snapshot: DirectorySnapshot,
+    changes: DirectoryChangeSet,
+    pending: Iterable[str] = ()) -> DirectorySnapshot:
+    """Applies the change set to the snapshot.
+
+    Archived entries are kept as inactive entries.
+    Pending entries keep their value in the snapshot, so that they are
+    included in the next change set.
+
+    Args:
+      snapshot: the snapshot the change set was computed against
+      changes: the change set
+      pending: the emails of entries that were not fully applied
+    Returns:
+      the snapshot with the applied entries of the change set
+    """
+    pending_emails = set(pending)
+    result = dict(snapshot)
+    result.update({
+        email: entry_object
+        for email, entry_object in create_snapshot(changes.entries()).items()
+        if email not in pending_emails
+    })
+    return result
+
+
+def compute_changes(*, previous: DirectorySnapshot,
+                    current: DirectorySnapshot) -> DirectoryChangeSet:
+    """Computes the change set between two snapshots of the directory.
+
+    Entries that are inactive in the current snapshot, or that are missing
+    from the current snapshot but were active in the previous snapshot, are
+    archived.
+    Inactive entries that were already inactive are not included.
+
+    Args:
+      previous: the snapshot of the applied entries
+      current: the snapshot from this pull
+    Returns:
+      the change set
+    """
+    changes = DirectoryChangeSet()
+    for email, entry_object in current.items():
+        previous_object = previous.get(email)
+        if previous_object == entry_object:
+            continue
+
+        entry = UserEntry.create(entry_object)
+        if not entry.active:
+            if previous_object is None or previous_object.get('active'):
+                changes.archived.append(entry)
+            continue
+
+        if previous_object is None:
+            changes.added.append(entry)
+        else:
+            changes.modified.append(entry)
+
+    for email, previous_object in previous.items():
+        if email in current or not previous_object.get('active'):
+            continue
+
+        log.info('Archiving user %s missing from directory', email)
+        changes.archived.append(
+            UserEntry(name=PersonName.model_validate(previous_object['name']),
+                      email=email,
+                      auth_email=previous_object.get('auth_email'),
+                      active=False))
+
+    log.info('Directory changes: %s added, %s modified, %s archived',
+             len(changes.added), len(changes.modified), len(changes.archived))
+    return changes
@@ -2,13 +2,19 @@ import logging
 from abc import ABC, abstractmethod
 from collections import defaultdict, deque
 from datetime import datetime
-from typing import Dict, Generic, List, Literal, Optional, TypeVar
+from typing import Dict, Generic, List, Literal, Optional, Set, TypeVar
 
 from centers.nacc_group import NACCGroup
 from coreapi_client.models.identifier import Identifier
 from flywheel.models.user import User
 from flywheel_adaptor.flywheel_proxy import FlywheelError, FlywheelProxy
-from notifications.email import DestinationModel, EmailClient, TemplateDataModel
+from notifications.email import (
+    BulkEmailStatus,
+    DestinationModel,
+    EmailClient,
+    EmailMessage,
+    TemplateDataModel,
+)
 
 from users.authorizations import AuthMap, Authorizations
 from users.nacc_directory import ActiveUserEntry, RegisteredUserEntry, UserEntry
@@ -21,14 +27,64 @@ NotificationModeType = Literal['date', 'force', 'none']
 
 class NotificationClient:
     """Wrapper for the email client to send email notifications for the user
-    enrollment flow."""
+    enrollment flow.
 
-    def __init__(self, email_client: EmailClient, configuration_set_name: str,
-                 portal_url: str, mode: NotificationModeType) -> None:
+    If batch is set, messages are queued and sent in bulk by flush.
+    """
+
+    def __init__(self,
+                 email_client: EmailClient,
+                 configuration_set_name: str,
+                 portal_url: str,
+                 mode: NotificationModeType,
+                 batch: bool = False) -> None:
         self.__client = email_client
         self.__configuration_set_name = configuration_set_name
         self.__portal_url = portal_url
         self.__mode: NotificationModeType = mode
+        self.__batch = batch
+        self.__pending: Dict[str, List[EmailMessage]] = defaultdict(list)
+
+    def __send(self, *, destination: DestinationModel, template: str,
+               template_data: TemplateDataModel) -> None:
+        """Sends the message, or queues the message if batching.
+
+        Args:
+          destination: the destination of the message
+          template: the name of the SES template
+          template_data: the data for the template
+        """
+        if self.__batch:
+            self.__pending[template].append((destination, template_data))
+            return
+
+        self.__client.send(
+            configuration_set_name=self.__configuration_set_name,
+            destination=destination,
+            template=template,
+            template_data=template_data)
+
+    def flush(self) -> List[BulkEmailStatus]:
+        """Sends the queued messages in bulk, grouped by template.
+
+        Returns:
+          the send status for each queued message
+        """
+        statuses: List[BulkEmailStatus] = []
+        for template, messages in self.__pending.items():
+            statuses.extend(
+                self.__client.send_bulk(
+                    configuration_set_name=self.__configuration_set_name,
+                    template=template,
+                    messages=messages))
+        self.__pending.clear()
+
+        for status in statuses:
+            if not status.success:
+                log.error("Failed to send email to %s: %s",
+                          ', '.join(status.to_addresses), status.error)
+
+        return statuses
 
     def __claim_template(self,
                          user_entry: ActiveUserEntry) -> TemplateDataModel:
@@ -69,11 +125,9 @@ class NotificationClient:
         Args:
           user_entry: the user entry for the user
         """
-        self.__client.send(
-            configuration_set_name=self.__configuration_set_name,
-            destination=self.__claim_destination(user_entry),
-            template="claim",
-            template_data=self.__claim_template(user_entry))
+        self.__send(destination=self.__claim_destination(user_entry),
+                    template="claim",
+                    template_data=self.__claim_template(user_entry))
 
     def send_followup_claim_email(self, user_entry: ActiveUserEntry) -> None:
         """Sends the followup claim email to the auth email of the user.
@@ -84,11 +138,9 @@ class NotificationClient:
           user_entry: the user entry for the user
         """
         if self.__should_send(user_entry):
-            self.__client.send(
-                configuration_set_name=self.__configuration_set_name,
-                destination=self.__claim_destination(user_entry),
-                template="followup-claim",
-                template_data=self.__claim_template(user_entry))
+            self.__send(destination=self.__claim_destination(user_entry),
+                        template="followup-claim",
+                        template_data=self.__claim_template(user_entry))
 
     def send_creation_email(self, user_entry: ActiveUserEntry) -> None:
         """Sends the user creation email to the email of the user.
@@ -97,8 +149,7 @@ class NotificationClient:
           user_entry: the user entry for the user
         """
         assert user_entry.auth_email, "user entry must have auth email"
-        self.__client.send(
-            configuration_set_name=self.__configuration_set_name,
+        self.__send(
             destination=DestinationModel(to_addresses=[user_entry.email],
                                          cc_addresses=[user_entry.auth_email]),
             template="user-creation",
@@ -142,6 +193,7 @@ class UserProcessEnvironment:
         self.__proxy = proxy
         self.__registry = registry
         self.__notification_client = notification_client
+        self.__completed_emails: Set[str] = set()
 
     @property
     def admin_group(self) -> NACCGroup:
@@ -163,6 +215,20 @@ class UserProcessEnvironment:
     def notification_client(self) -> NotificationClient:
         return self.__notification_client
 
+    @property
+    def completed_emails(self) -> Set[str]:
+        """Returns the emails of the active entries whose users are claimed,
+        have a Flywheel user, and were authorized in this run."""
+        return self.__completed_emails
+
+    def complete(self, email: str) -> None:
+        """Records that the user for the active entry is fully set up.
+
+        Args:
+          email: the email of the entry
+        """
+        self.__completed_emails.add(email)
+
 
 T = TypeVar('T')
 
@@ -299,6 +365,7 @@ class UpdateUserProcess(BaseUserProcess[RegisteredUserEntry]):
                               auth_email=entry.auth_email,
                               center_id=entry.adcid,
                               authorizations=entry.authorizations)
+        self.__env.complete(entry.email)
 
     def __update_email(self, *, user: User, email: str) -> None:
         """Updates user email on FW instance if email is different.
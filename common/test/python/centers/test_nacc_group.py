@@ -0,0 +1,65 @@
+"""Tests for the center map of centers.nacc_group."""
+from unittest.mock import MagicMock
+
+import pytest
+from centers.nacc_group import NACCGroup
+
+
+# pylint: disable=(redefined-outer-name)
+@pytest.fixture(scope='function')
+def metadata():
+    """Creates a mock metadata project with one center."""
+    project = MagicMock()
+    project.get_info.return_value = {
+        'centers': {
+            '1': {
+                'adcid': 1,
+                'name': 'Alpha Center',
+                'group': 'alpha',
+                'active': True
+            }
+        }
+    }
+    return project
+
+
+@pytest.fixture(scope='function')
+def admin_group(metadata):
+    """Creates a NACC group with the mock metadata project."""
+    group = NACCGroup(group=MagicMock(), proxy=MagicMock())
+    group.get_metadata = lambda: metadata  # type: ignore
+    return group
+
+
+class TestCenterMap:
+    """Tests for the NACCGroup center map."""
+
+    def test_cached(self, admin_group, metadata):
+        """Test that the center map is read once."""
+        assert admin_group.get_adcid('alpha') == 1
+        assert admin_group.get_center_map(['1']).get(1)
+        assert not admin_group.get_center_map(['2']).centers
+        metadata.get_info.assert_called_once()
+
+    def test_add_writes_map(self, admin_group, metadata):
+        """Test that adding a center writes the map."""
+        admin_group.add_adcid(2, 'Beta Center', 'beta', True)
+        metadata.update_info.assert_called_once()
+        assert admin_group.get_adcid('beta') == 2
+
+    def test_add_unchanged(self, admin_group, metadata):
+        """Test that adding an unchanged center does not write the map."""
+        admin_group.add_adcid(1, 'Alpha Center', 'alpha', True)
+        metadata.update_info.assert_not_called()
+
+    def test_batch(self, admin_group, metadata):
+        """Test that centers added in a batch are written once."""
+        with admin_group.center_map_batch():
+            admin_group.add_adcid(2, 'Beta Center', 'beta', True)
+            admin_group.add_adcid(3, 'Gamma Center', 'gamma', True)
+            metadata.update_info.assert_not_called()
+
+        metadata.update_info.assert_called_once()
+        centers = metadata.update_info.call_args.args[0]['centers']
+        assert set(centers.keys()) == {1, 2, 3}
+        assert 'tags' not in centers[2]
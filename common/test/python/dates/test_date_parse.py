@@ -1,4 +1,12 @@
-from dates.form_dates import DATE_FORMATS, DateFormatException, parse_date
+from dates.form_dates import (
+    DATE_FORMATS,
+    DEFAULT_DATE_FORMAT,
+    DateFormatException,
+    DateNormalizer,
+    convert_date,
+    parse_convert_date,
+    parse_date,
+)
 
 
 class TestDateParsing:
@@ -23,3 +31,34 @@ class TestDateParsing:
             assert False, 'format should not match'  # noqa: B011
         except DateFormatException as error:
             assert True, f'should be error, got {error}'
+
+
+class TestDateNormalizer:
+
+    def test_matches_parser(self):
+        normalizer = DateNormalizer()
+        for date_string in [
+                '10/06/2024', '10-06-2024', '2024/10/06', '2024-10-06',
+                '2024/1/1', '13/06/2024', '2024-02-30', '1/2/24', '20240101',
+                '01012024', 'not a date', ''
+        ]:
+            assert normalizer.normalize(date_string) == parse_convert_date(
+                date_string=date_string, date_format=DEFAULT_DATE_FORMAT)
+
+    def test_dominant_format(self):
+        normalizer = DateNormalizer()
+        assert normalizer.dominant_format is None
+
+        dates = ['2024/10/06', '2024/10/07', '10/06/2024', '2024/10/08']
+        assert normalizer.normalize_column(dates) == [
+            '2024-10-06', '2024-10-07', '2024-10-06', '2024-10-08'
+        ]
+        assert normalizer.dominant_format == '%Y/%m/%d'
+
+    def test_convert_date(self):
+        assert convert_date(date_string='10/06/2024',
+                            date_format='%m/%d/%Y') == '10/06/2024'
+        assert convert_date(date_string='2024-10-06',
+                            date_format=DEFAULT_DATE_FORMAT) == '2024-10-06'
+        assert convert_date(date_string='01012024',
+                            date_format=DEFAULT_DATE_FORMAT) is None
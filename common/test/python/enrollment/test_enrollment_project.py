@@ -0,0 +1,57 @@
+"""Tests for bulk enrollment in EnrollmentProject."""
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from enrollment.enrollment_project import EnrollmentProject
+from enrollment.enrollment_subject import EnrollmentSubject
+from enrollment.enrollment_transfer import EnrollmentRecord
+from flywheel.rest import ApiException
+from identifiers.model import CenterIdentifiers
+
+
+def create_record(naccid: str) -> EnrollmentRecord:
+    """Creates an enrollment record for the NACCID."""
+    return EnrollmentRecord(center_identifier=CenterIdentifiers(
+        adcid=1, ptid=naccid[-3:]),
+                            naccid=naccid,
+                            guid=None,
+                            start_date=datetime(2024, 1, 1))
+
+
+def add_subject(label: str):
+    """Mock for project add_subject that fails for one label."""
+    if label == 'NACC000003':
+        raise ApiException(status=500, reason='error')
+    return SimpleNamespace(label=label)
+
+
+# pylint: disable=(too-few-public-methods)
+class TestEnrollmentProject:
+    """Tests for EnrollmentProject.add_enrollments."""
+
+    # pylint: disable=(no-self-use)
+    def test_add_enrollments(self, monkeypatch):
+        """Test that subjects are listed once and missing subjects added."""
+        project = MagicMock()
+        project.subjects.iter.return_value = [
+            SimpleNamespace(label='NACC000001')
+        ]
+        project.add_subject.side_effect = add_subject
+        enrolled = []
+        monkeypatch.setattr(
+            EnrollmentSubject, 'add_enrollment',
+            lambda subject, record: enrolled.append(record.naccid))
+
+        enrollment_project = EnrollmentProject(project=project,
+                                               proxy=MagicMock())
+        errors = enrollment_project.add_enrollments([
+            create_record(naccid)
+            for naccid in ['NACC000001', 'NACC000002', 'NACC000003']
+        ])
+
+        project.subjects.iter.assert_called_once()
+        assert project.add_subject.call_count == 2
+        assert enrolled == ['NACC000002']
+        assert set(errors.keys()) == {'NACC000001', 'NACC000003'}
+        assert errors['NACC000001'] == 'Subject with NACCID NACC000001 exists'
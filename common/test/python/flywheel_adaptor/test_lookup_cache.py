@@ -0,0 +1,86 @@
+"""Tests for the lookup cache and cached lookups of FlywheelProxy."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from flywheel_adaptor.flywheel_proxy import FlywheelProxy, ProjectAdaptor
+from flywheel_adaptor.lookup_cache import LookupCache
+
+
+class TestLookupCache:
+    """Tests for LookupCache."""
+
+    def test_hits_and_misses(self):
+        """Test that a repeated lookup is loaded once."""
+        cache = LookupCache()
+        load = MagicMock(return_value='value')
+        assert cache.get(('group', 'alpha'), load) == 'value'
+        assert cache.get(('group', 'alpha'), load) == 'value'
+        load.assert_called_once()
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = LookupCache(max_size=2)
+        cache.put(('a', ), 1)
+        cache.put(('b', ), 2)
+        cache.get(('a', ), lambda: 0)
+        cache.put(('c', ), 3)
+        assert len(cache) == 2
+        assert cache.get(('a', ), lambda: 0) == 1
+        assert cache.get(('b', ), lambda: 0) == 0
+
+    def test_invalidate_prefix(self):
+        """Test that invalidation removes entries matching the prefix."""
+        cache = LookupCache()
+        cache.put(('project', 'alpha', 'ingest'), 1)
+        cache.put(('project', 'alpha', 'accepted'), 2)
+        cache.put(('project', 'beta', 'ingest'), 3)
+        cache.invalidate('project', 'alpha')
+        assert len(cache) == 1
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_exception_not_cached(self):
+        """Test that a failed load is not cached."""
+        cache = LookupCache()
+        load = MagicMock(side_effect=[ValueError('failed'), 'value'])
+        with pytest.raises(ValueError):
+            cache.get(('gear', 'qc'), load)
+        assert cache.get(('gear', 'qc'), load) == 'value'
+        assert len(cache) == 1
+
+
+class TestProxyLookups:
+    """Tests for cached lookups of FlywheelProxy."""
+
+    def test_find_group(self):
+        """Test that groups are looked up once."""
+        client = MagicMock()
+        client.groups.find.return_value = [SimpleNamespace(id='alpha')]
+        proxy = FlywheelProxy(client=client)
+        proxy.find_group('alpha')
+        proxy.find_group('alpha')
+        client.groups.find.assert_called_once_with('_id=alpha')
+
+        proxy.invalidate_group('alpha')
+        proxy.find_group('alpha')
+        assert client.groups.find.call_count == 2
+
+    def test_project_upload_invalidates(self):
+        """Test that uploading to a project invalidates the lookup."""
+        client = MagicMock()
+        project = MagicMock()
+        project.group = 'alpha'
+        project.label = 'ingest'
+        client.projects.find.return_value = [project]
+        proxy = FlywheelProxy(client=client)
+        proxy.find_projects(group_id='alpha', project_label='ingest')
+        proxy.find_projects(group_id='alpha', project_label='ingest')
+        client.projects.find.assert_called_once()
+
+        adaptor = ProjectAdaptor(project=project, proxy=proxy)
+        adaptor.upload_file(MagicMock())
+        proxy.find_projects(group_id='alpha', project_label='ingest')
+        assert client.projects.find.call_count == 2
@@ -0,0 +1,67 @@
+"""Tests for the subject index of ProjectAdaptor."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from flywheel.rest import ApiException
+from flywheel_adaptor.flywheel_proxy import ProjectAdaptor
+
+
+# pylint: disable=(redefined-outer-name)
+@pytest.fixture(scope='function')
+def project():
+    """Creates a mock project with two subjects."""
+    mock_project = MagicMock()
+    mock_project.subjects.iter.return_value = [
+        SimpleNamespace(label='NACC000001', id='1'),
+        SimpleNamespace(label='NACC000002', id='2')
+    ]
+    mock_project.add_subject.side_effect = (
+        lambda label: SimpleNamespace(label=label, id=label))
+    yield mock_project
+
+
+class TestSubjectIndex:
+    """Tests for the ProjectAdaptor subject index."""
+
+    def test_find_without_index(self, project):
+        """Test that find_subject searches when the index is not enabled."""
+        adaptor = ProjectAdaptor(project=project, proxy=MagicMock())
+        adaptor.find_subject('NACC000001')
+        project.subjects.find_first.assert_called_once_with('label=NACC000001')
+        project.subjects.iter.assert_not_called()
+
+    def test_find_with_index(self, project):
+        """Test that lookups use a single listing."""
+        adaptor = ProjectAdaptor(project=project,
+                                 proxy=MagicMock(),
+                                 subject_index=True)
+        subject = adaptor.find_subject('NACC000002')
+        assert subject and subject.id == '2'
+        assert adaptor.find_subject('NACC000003') is None
+
+        adaptor.add_subject('NACC000003')
+        subject = adaptor.find_subject('NACC000003')
+        assert subject and subject.id == 'NACC000003'
+        assert adaptor.get_subject_labels() == {
+            'NACC000001', 'NACC000002', 'NACC000003'
+        }
+        project.subjects.iter.assert_called_once()
+        project.subjects.find_first.assert_not_called()
+
+        adaptor.clear_subject_index()
+        adaptor.find_subject('NACC000001')
+        assert project.subjects.iter.call_count == 2
+
+    def test_add_existing_with_index(self, project):
+        """Test that adding a subject created after indexing returns it."""
+        adaptor = ProjectAdaptor(project=project, proxy=MagicMock())
+        adaptor.enable_subject_index()
+        assert adaptor.find_subject('NACC000004') is None
+
+        project.add_subject.side_effect = ApiException(status=409)
+        project.subjects.find_first.return_value = SimpleNamespace(
+            label='NACC000004', id='4')
+        subject = adaptor.add_subject('NACC000004')
+        assert subject.id == '4'
+        assert adaptor.find_subject('NACC000004')
@@ -0,0 +1,91 @@
+"""Tests for the container cache of SubjectAdaptor."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from flywheel_adaptor.subject_adaptor import SubjectAdaptor
+
+
+def create_acquisition(label: str):
+    """Creates a mock acquisition with a single file."""
+    acquisition = MagicMock()
+    acquisition.label = label
+    acquisition.get_file.side_effect = (
+        lambda name: SimpleNamespace(name=name, acquisition=label))
+    acquisition.reload.return_value = acquisition
+    return acquisition
+
+
+def create_session(label: str, acquisitions):
+    """Creates a mock session with the acquisitions."""
+    session = MagicMock()
+    session.label = label
+    session.acquisitions.iter.return_value = acquisitions
+    session.add_acquisition.side_effect = (
+        lambda label: create_acquisition(label))
+    return session
+
+
+# pylint: disable=(redefined-outer-name)
+@pytest.fixture(scope='function')
+def subject():
+    """Creates a mock subject with two sessions."""
+    mock_subject = MagicMock()
+    mock_subject.label = 'NACC000001'
+    mock_subject.sessions.iter.return_value = [
+        create_session('FORMS-VISIT-1', [create_acquisition('UDS')]),
+        create_session('FORMS-VISIT-2', [])
+    ]
+    mock_subject.add_session.side_effect = (
+        lambda label: create_session(label, []))
+    yield mock_subject
+
+
+class TestSubjectAdaptorCache:
+    """Tests for session and acquisition caching."""
+
+    def test_find_acquisition_file(self, subject):
+        """Test that sessions and acquisitions are listed once."""
+        adaptor = SubjectAdaptor(subject)
+        for _ in range(3):
+            file = adaptor.find_acquisition_file(session_label='FORMS-VISIT-1',
+                                                 acquisition_label='UDS',
+                                                 filename='visit1.json')
+            assert file and file.name == 'visit1.json'
+            assert adaptor.find_acquisition_file(
+                session_label='FORMS-VISIT-3',
+                acquisition_label='UDS',
+                filename='visit3.json') is None
+
+        subject.sessions.iter.assert_called_once()
+        subject.sessions.find_first.assert_not_called()
+        mock_session = subject.sessions.iter.return_value[0]
+        assert adaptor.find_session('FORMS-VISIT-1') == mock_session
+        mock_session.acquisitions.iter.assert_called_once()
+
+        adaptor.clear_cache()
+        adaptor.find_session('FORMS-VISIT-1')
+        assert subject.sessions.iter.call_count == 2
+
+    def test_upload_updates_cache(self, subject):
+        """Test that created containers are cached."""
+        mock_session = create_session('FORMS-VISIT-3', [])
+        subject.add_session.side_effect = None
+        subject.add_session.return_value = mock_session
+        adaptor = SubjectAdaptor(subject)
+        file = adaptor.upload_acquisition_file(session_label='FORMS-VISIT-3',
+                                               acquisition_label='UDS',
+                                               filename='visit3.json',
+                                               contents='{}',
+                                               content_type='application/json',
+                                               skip_duplicates=False)
+        assert file and file.name == 'visit3.json'
+        subject.add_session.assert_called_once_with(label='FORMS-VISIT-3')
+
+        file = adaptor.find_acquisition_file(session_label='FORMS-VISIT-3',
+                                             acquisition_label='UDS',
+                                             filename='visit3.json')
+        assert file and file.name == 'visit3.json'
+        subject.add_session.assert_called_once()
+        assert adaptor.find_session('FORMS-VISIT-3') == mock_session
+        mock_session.acquisitions.iter.assert_not_called()
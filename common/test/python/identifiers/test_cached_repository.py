@@ -0,0 +1,144 @@
+"""Tests for the cached identifier repository."""
+from typing import Dict, List, Optional
+
+import pytest
+from identifiers.cached_repository import CachedIdentifierRepository
+from identifiers.identifiers_lambda_repository import NACCIDRequest
+from identifiers.identifiers_repository import (
+    IdentifierQueryObject,
+    IdentifierRepository,
+)
+from identifiers.model import IdentifierList, IdentifierObject
+from pydantic import ValidationError
+
+
+class DummyRepository(IdentifierRepository):
+    """Repository that keeps identifiers in a list and counts lookups."""
+
+    def __init__(self, identifiers: List[IdentifierObject]) -> None:
+        self.identifiers = identifiers
+        self.calls: Dict[str, int] = {'get': 0, 'list': 0}
+
+    def create(self, adcid: int, ptid: str,
+               guid: Optional[str]) -> IdentifierObject:
+        identifier = IdentifierObject(
+            adcid=adcid,
+            naccadc=len(self.identifiers),
+            ptid=ptid,
+            naccid=f'NACC{len(self.identifiers):06d}',
+            guid=guid)
+        self.identifiers.append(identifier)
+        return identifier
+
+    def create_list(
+            self, identifiers: List[IdentifierQueryObject]) -> IdentifierList:
+        return IdentifierList([
+            self.create(adcid=query.adcid, ptid=query.ptid, guid=query.guid)
+            for query in identifiers
+        ])
+
+    # pylint: disable=(arguments-differ)
+    def get(self,
+            *,
+            naccid: Optional[str] = None,
+            adcid: Optional[int] = None,
+            ptid: Optional[str] = None,
+            guid: Optional[str] = None) -> Optional[IdentifierObject]:
+        self.calls['get'] += 1
+        if naccid is not None:
+            NACCIDRequest(naccid=naccid)
+        for identifier in self.identifiers:
+            if naccid is not None and identifier.naccid == naccid:
+                return identifier
+            if (adcid is not None and identifier.adcid == int(adcid)
+                    and identifier.ptid == ptid):
+                return identifier
+            if guid and identifier.guid == guid:
+                return identifier
+        return None
+
+    def list(self, adcid: Optional[int] = None) -> List[IdentifierObject]:
+        self.calls['list'] += 1
+        return [
+            identifier for identifier in self.identifiers
+            if adcid is None or identifier.adcid == adcid
+        ]
+
+
+# pylint: disable=(redefined-outer-name)
+@pytest.fixture(scope='function')
+def repo():
+    """Creates a repository with identifiers at two centers."""
+    yield DummyRepository([
+        IdentifierObject(adcid=1,
+                         naccadc=1,
+                         ptid='p1',
+                         naccid='NACC000001',
+                         guid='GUID1'),
+        IdentifierObject(adcid=1,
+                         naccadc=2,
+                         ptid='p2',
+                         naccid='NACC000002',
+                         guid=None),
+        IdentifierObject(adcid=2,
+                         naccadc=3,
+                         ptid='p3',
+                         naccid='NACC000003',
+                         guid='GUID3'),
+    ])
+
+
+class TestCachedIdentifierRepository:
+    """Tests for CachedIdentifierRepository."""
+
+    def test_prefetch_center(self, repo):
+        """Test that lookups for a listed center use the index."""
+        cached = CachedIdentifierRepository(repo)
+        cached.prefetch(adcids=[1])
+        assert repo.calls == {'get': 0, 'list': 1}
+
+        identifier = cached.get(adcid=1, ptid='p1')
+        assert identifier and identifier.naccid == 'NACC000001'
+        assert cached.get(adcid='1', ptid='p2')  # type: ignore
+        assert cached.get(adcid=1, ptid='new') is None
+        assert cached.get(naccid='NACC000002')
+        assert cached.get(guid='GUID1')
+        assert repo.calls == {'get': 0, 'list': 1}
+
+    def test_prefetch_references(self, repo):
+        """Test that referenced identifiers are looked up once."""
+        cached = CachedIdentifierRepository(repo, max_workers=2)
+        cached.prefetch(adcids=[1],
+                        naccids=['NACC000003', 'NACC999999'],
+                        guids=['GUID3', 'GUID9'],
+                        ptids=[(2, 'p3'), (1, 'p1')])
+        assert repo.calls['get'] == 3
+
+        identifier = cached.get(guid='GUID3')
+        assert identifier and identifier.naccid == 'NACC000003'
+        assert cached.get(adcid=2, ptid='p3')
+        assert cached.get(naccid='NACC999999') is None
+        assert cached.get(guid='GUID9') is None
+        assert repo.calls['get'] == 3
+
+    def test_prefetch_malformed(self, repo):
+        """Test that a malformed key is left out of the index."""
+        cached = CachedIdentifierRepository(repo)
+        cached.prefetch(naccids=['NACC000001', 'bad'])
+        assert repo.calls['get'] == 2
+
+        assert cached.get(naccid='NACC000001')
+        assert repo.calls['get'] == 2
+        with pytest.raises(ValidationError):
+            cached.get(naccid='bad')
+
+    def test_create_updates_index(self, repo):
+        """Test that created identifiers are added to the index."""
+        cached = CachedIdentifierRepository(repo)
+        cached.prefetch(adcids=[1])
+        created = cached.create_list(
+            [IdentifierQueryObject(adcid=1, ptid='p4', guid=None)])
+        assert len(created) == 1
+        assert cached.get(adcid=1, ptid='p4') == created[0]
+        assert cached.get(naccid=created[0].naccid) == created[0]
+        assert repo.calls['get'] == 0
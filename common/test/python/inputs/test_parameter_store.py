@@ -90,3 +90,76 @@ class TestParameterStore:
         with pytest.raises(ParameterError):
             store.get_parameters(param_type=TestParameters,
                                  parameter_path='/test/invalid')
+
+    def test_prefetch(self, ssm):
+        """Test that prefetched parameters are read from the cache."""
+        from inputs.parameter_store import ParameterStore
+
+        ssm.put_parameter(Name='/redcap/pid_12/url',
+                          Type='String',
+                          Value='url12')
+        ssm.put_parameter(Name='/redcap/pid_12/token',
+                          Type='SecureString',
+                          Value='token12')
+        ssm.put_parameter(Name='/redcap/pid_123/url',
+                          Type='String',
+                          Value='url123')
+        ssm.put_parameter(Name='/redcap/pid_123/token',
+                          Type='SecureString',
+                          Value='token123')
+
+        store = ParameterStore.create_from_environment()
+        assert store.prefetch('/redcap/') == 4
+
+        # changes are not seen until the cache is cleared
+        ssm.put_parameter(Name='/redcap/pid_12/url',
+                          Type='String',
+                          Value='changed',
+                          Overwrite=True)
+
+        parameters = store.get_redcap_parameters(base_path='/redcap', pid=12)
+        assert parameters == {'url': 'url12', 'token': 'token12'}
+        all_parameters = store.get_all_redcap_parameters_at_path(
+            base_path='/redcap', prefix='pid_')
+        assert all_parameters['pid_123'] == {
+            'url': 'url123',
+            'token': 'token123'
+        }
+
+        store.clear_cache()
+        parameters = store.get_redcap_parameters(base_path='/redcap', pid=12)
+        assert parameters['url'] == 'changed'
+
+    def test_cache_file(self, ssm, tmp_path):
+        """Test loading parameters from the encrypted cache file."""
+        from inputs.parameter_store import ParameterError, ParameterStore
+        from ssm_parameter_store import EC2ParameterStore
+
+        ssm.put_parameter(Name='/test/valid/param1', Type='String', Value='1')
+        ssm.put_parameter(Name='/test/valid/param2', Type='String', Value='2')
+
+        cache_file = str(tmp_path / 'parameters.cache')
+
+        def create_store(cache_key: str) -> ParameterStore:
+            ec2_store = EC2ParameterStore(aws_access_key_id='testing',
+                                          aws_secret_access_key='testing',
+                                          region_name='us-east-1')
+            return ParameterStore(ec2_store,
+                                  cache_file=cache_file,
+                                  cache_key=cache_key)
+
+        store = create_store('secret')
+        store.prefetch('/test')
+        with open(cache_file, 'rb') as file:
+            assert b'param1' not in file.read()
+
+        ssm.delete_parameter(Name='/test/valid/param1')
+        store = create_store('secret')
+        parameters = store.get_parameters(param_type=TestParameters,
+                                          parameter_path='/test/valid')
+        assert parameters == {'param1': '1', 'param2': '2'}
+
+        store = create_store('wrong')
+        with pytest.raises(ParameterError):
+            store.get_parameters(param_type=TestParameters,
+                                 parameter_path='/test/valid')
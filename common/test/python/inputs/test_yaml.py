@@ -4,7 +4,13 @@ from typing import Any, List
 
 import pytest
 import yaml
-from inputs.yaml import load_all_from_stream, load_from_stream
+from inputs.yaml import (
+    YAMLReadError,
+    dump_to_text,
+    load_all_from_stream,
+    load_from_file,
+    load_from_stream,
+)
 
 
 @pytest.fixture
@@ -68,3 +74,28 @@ class TestYAML:
             'k1': 'v1',
             'k2': 'v2'
         }]
+
+    def test_dump_and_load_file(self, tmp_path):
+        """Test that dumped YAML and JSON load to the same object."""
+        data = [{'name': 'Ünïcode', 'active': True, 'adcid': 0}]
+        for filename, json_format in [('users.yaml', False),
+                                      ('users.json', True)]:
+            filepath = tmp_path / filename
+            filepath.write_text(dump_to_text(data, json_format=json_format),
+                                encoding='utf-8')
+            assert load_from_file(str(filepath)) == data
+
+    def test_load_errors(self, tmp_path):
+        """Test that YAML and JSON errors are reported as read errors."""
+        yaml_path = tmp_path / 'bad.yaml'
+        yaml_path.write_text('k1: [v1\n', encoding='utf-8')
+        with pytest.raises(YAMLReadError, match='Error in YAML'):
+            load_from_file(str(yaml_path))
+
+        json_path = tmp_path / 'bad.json'
+        json_path.write_text('{"k1": \n', encoding='utf-8')
+        with pytest.raises(YAMLReadError, match='line 2'):
+            load_from_file(str(json_path))
+
+        with pytest.raises(YAMLReadError):
+            load_from_file(str(tmp_path / 'missing.yaml'))
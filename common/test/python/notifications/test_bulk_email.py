@@ -0,0 +1,80 @@
+"""Tests for bulk sending by the email client."""
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+from notifications.email import DestinationModel, EmailClient, TemplateDataModel
+
+
+def create_messages(count: int):
+    """Creates messages to the numbered addresses."""
+    return [(DestinationModel(to_addresses=[f'user{index}@dummy.org']),
+             TemplateDataModel(firstname=f'user{index}'))
+            for index in range(count)]
+
+
+def bulk_response(**kwargs):
+    """Returns a successful response for each destination."""
+    return {
+        'Status': [{
+            'Status': 'Success',
+            'MessageId': str(index)
+        } for index in range(len(kwargs['Destinations']))]
+    }
+
+
+class TestBulkEmail:
+    """Tests for EmailClient.send_bulk."""
+
+    def test_chunks(self):
+        """Test that messages are sent in chunks with a status for each."""
+        ses = MagicMock()
+        ses.send_bulk_templated_email.side_effect = bulk_response
+        client = EmailClient(client=ses,
+                             source='dummy@dummy.org',
+                             max_send_rate=1000)
+        statuses = client.send_bulk(configuration_set_name='dummy',
+                                    template='claim',
+                                    messages=create_messages(5),
+                                    chunk_size=2)
+        assert ses.send_bulk_templated_email.call_count == 3
+        assert len(statuses) == 5
+        assert all(status.success for status in statuses)
+        assert statuses[4].to_addresses == ['user4@dummy.org']
+
+    def test_failed_chunk(self):
+        """Test that a failed request is reported for each destination."""
+        ses = MagicMock()
+        ses.send_bulk_templated_email.side_effect = [
+            ClientError(
+                {'Error': {
+                    'Code': 'Throttling',
+                    'Message': 'slow down'
+                }}, 'SendBulkTemplatedEmail'), {
+                    'Status': [{
+                        'Status': 'MessageRejected',
+                        'Error': 'rejected'
+                    }]
+                }
+        ]
+        client = EmailClient(client=ses,
+                             source='dummy@dummy.org',
+                             max_send_rate=1000)
+        statuses = client.send_bulk(configuration_set_name='dummy',
+                                    template='claim',
+                                    messages=create_messages(3),
+                                    chunk_size=2)
+        assert [status.status for status in statuses
+                ] == ['Failed', 'Failed', 'MessageRejected']
+        assert statuses[2].error == 'rejected'
+
+    def test_send_quota(self):
+        """Test that the send rate is read from the account quota."""
+        ses = MagicMock()
+        ses.get_send_quota.return_value = {'MaxSendRate': 1000.0}
+        ses.send_bulk_templated_email.side_effect = bulk_response
+        client = EmailClient(client=ses, source='dummy@dummy.org')
+        client.send_bulk(configuration_set_name='dummy',
+                         template='claim',
+                         messages=create_messages(4),
+                         chunk_size=2)
+        ses.get_send_quota.assert_called_once()
@@ -0,0 +1,60 @@
+"""Tests for mapping studies to center projects."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from centers.center_group import CenterError, CenterGroup
+from projects.study import Study
+from projects.study_mapping import StudyMappingVisitor
+
+
+def create_center(center_id):
+    """Creates a mock center group."""
+    center = MagicMock()
+    center.id = center_id
+    center.is_active.return_value = True
+    center.add_project.side_effect = lambda label: SimpleNamespace(
+        id=f'{center_id}-{label}', label=label)
+    if center_id == 'broken':
+        center.get_project_info.side_effect = CenterError('no metadata')
+    return center
+
+
+class TestStudyMappingVisitor:
+    """Tests for the study mapping visitor."""
+
+    def test_visit_studies(self, monkeypatch):
+        """Test that centers are looked up once and failures are isolated."""
+        centers = {}
+
+        def create_from_group_adaptor(*, adaptor):
+            centers[adaptor] = create_center(adaptor)
+            return centers[adaptor]
+
+        monkeypatch.setattr(CenterGroup, 'create_from_group_adaptor',
+                            create_from_group_adaptor)
+        proxy = MagicMock()
+        proxy.find_group.side_effect = (
+            lambda center_id: None if center_id == 'missing' else center_id)
+
+        visitor = StudyMappingVisitor(flywheel_proxy=proxy,
+                                      admin_group=MagicMock(),
+                                      max_workers=2)
+        for study_id, datatypes in [('alpha', ['form']), ('beta', ['dicom'])]:
+            visitor.visit_study(
+                Study(name=study_id,
+                      study_id=study_id,
+                      centers=['ac', 'bc', 'broken', 'missing'],
+                      datatypes=datatypes,
+                      mode='aggregation'))
+
+        assert proxy.find_group.call_count == 4
+        assert list(visitor.errors.keys()) == ['broken']
+        for center_id in ['ac', 'bc']:
+            assert centers[center_id].update_project_info.call_count == 2
+            labels = {
+                call.args[0]
+                for call in centers[center_id].add_project.call_args_list
+            }
+            assert {
+                'ingest-form-alpha', 'sandbox-dicom-beta', 'accepted-alpha'
+            } <= labels
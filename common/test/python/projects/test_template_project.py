@@ -0,0 +1,204 @@
+"""Tests for copying template projects."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from flywheel import DataView, FixedInput, GearRule
+from projects.template_project import VIEW_PROPERTIES, TemplateProject
+
+
+def create_destination(files, rules=None):
+    """Creates a mock destination project with the named file hashes."""
+    destination = MagicMock()
+    destination.id = 'destination'
+    destination.label = 'ingest-form'
+    destination.group = 'center'
+    destination.project.copyable = True
+    destination.project.description = 'center alpha'
+    destination.get_gear_rules.return_value = rules or []
+    destination.get_apps.return_value = [{'name': 'viewer'}]
+    destination.get_user_roles.return_value = ['read-only']
+    destination.get_file.side_effect = lambda name: SimpleNamespace(
+        name=name, hash=files[name], version=1) if name in files else None
+    return destination
+
+
+def create_fixed_input(*, project_id, version):
+    """Creates a mock fixed input for the config file."""
+    fixed_input = MagicMock(spec=FixedInput)
+    fixed_input.id = project_id
+    fixed_input.input = 'config'
+    fixed_input.name = 'config.json'
+    fixed_input.type = 'project'
+    fixed_input.version = version
+    return fixed_input
+
+
+def create_rule(name, project_id='template', version=None):
+    """Creates a mock gear rule with the config file as fixed input."""
+    rule = MagicMock(spec=GearRule)
+    rule.name = name
+    rule.project_id = project_id
+    rule.gear_id = 'gear'
+    rule.role_id = None
+    rule.config = {'mode': 'check'}
+    rule.fixed_inputs = [
+        create_fixed_input(project_id=project_id, version=version)
+    ]
+    rule.auto_update = False
+    rule.any = []
+    rule.all = []
+    rule._not = []  # noqa: SLF001
+    rule.disabled = False
+    rule.compute_provider_id = None
+    rule.triggering_input = None
+    return rule
+
+
+def create_dataview(label, columns):
+    """Creates a mock dataview with the label and columns."""
+    values = {view_property: None for view_property in VIEW_PROPERTIES}
+    values.update(label=label, columns=columns)
+    view = MagicMock(spec=DataView)
+    view.label = label
+    view.columns = columns
+    view.get.side_effect = values.get
+    return view
+
+
+def create_template(dry_run=False):
+    """Creates a template with two rules sharing a fixed input file."""
+    source_file = MagicMock()
+    source_file.name = 'config.json'
+    source_file.hash = 'abc'
+    source_file.mimetype = 'application/json'
+    source_file.read.return_value = b'{}'
+
+    source_project = MagicMock()
+    source_project.label = 'ingest-template'
+    source_project.copyable = True
+    source_project.description = 'center $adrc'
+    source_project.permissions = [
+        SimpleNamespace(id='user@uw.edu', role_ids=['read-only'])
+    ]
+    source_project.get_file.return_value = source_file
+
+    proxy = MagicMock()
+    proxy.dry_run = dry_run
+    proxy.get_project_gear_rules.return_value = [
+        create_rule(name) for name in ['first', 'second']
+    ]
+    proxy.get_project_apps.return_value = [{'name': 'viewer'}]
+
+    return TemplateProject(proxy=proxy,
+                           project=source_project), source_file, proxy
+
+
+class TestTemplateProject:
+    """Tests for copying gear rules from a template."""
+
+    def test_copy_rules(self):
+        """Test that input files are read once and only copied if
+        different."""
+        template, source_file, _ = create_template()
+        destinations = [
+            create_destination({}),
+            create_destination({'config.json': 'old'}),
+            create_destination({'config.json': 'abc'})
+        ]
+        for destination in destinations:
+            template.copy_rules(destination)
+
+        source_file.read.assert_called_once()
+        for destination in destinations[:2]:
+            destination.upload_file.assert_called_once()
+            destination.reload.assert_called_once()
+            assert destination.add_gear_rule.call_count == 2
+
+        destinations[2].upload_file.assert_not_called()
+        destinations[2].reload.assert_not_called()
+
+    def test_plan_up_to_date(self):
+        """Test that a destination matching the template has no changes."""
+        template, _, _ = create_template()
+        destination = create_destination({'config.json': 'abc'},
+                                         rules=[
+                                             create_rule(
+                                                 name,
+                                                 project_id='destination',
+                                                 version=1)
+                                             for name in ['first', 'second']
+                                         ])
+        plan = template.plan(destination, value_map={'adrc': 'alpha'})
+        assert plan.is_empty()
+
+        template.copy_to(destination, value_map={'adrc': 'alpha'})
+        destination.add_gear_rule.assert_not_called()
+        destination.set_apps.assert_not_called()
+        destination.set_description.assert_not_called()
+        destination.set_copyable.assert_not_called()
+
+    def test_plan_changes(self):
+        """Test that only rules and settings that differ are changed."""
+        template, _, _ = create_template()
+        changed_rule = create_rule('second',
+                                   project_id='destination',
+                                   version=1)
+        changed_rule.config = {'mode': 'fix'}
+        destination = create_destination({'config.json': 'abc'},
+                                         rules=[
+                                             create_rule(
+                                                 'first',
+                                                 project_id='destination',
+                                                 version=1), changed_rule,
+                                             create_rule('extra')
+                                         ])
+        destination.get_user_roles.return_value = []
+
+        plan = template.plan(destination, value_map={'adrc': 'beta'})
+        assert [rule.name for rule in plan.rules_to_update] == ['second']
+        assert [rule.name for rule in plan.rules_to_remove] == ['extra']
+        assert not plan.rules_to_add
+        assert not plan.files
+        assert plan.description == 'center beta'
+        assert plan.apps is None
+        assert plan.copyable is None
+        assert [user.id for user in plan.role_assignments] == ['user@uw.edu']
+
+        template.apply(destination=destination, plan=plan)
+        destination.remove_gear_rule.assert_called_once()
+        destination.add_gear_rule.assert_called_once()
+        destination.set_description.assert_called_once_with('center beta')
+        destination.add_user_role_assignments.assert_called_once()
+
+    def test_dry_run(self):
+        """Test that a dry run makes no changes."""
+        template, source_file, _ = create_template(dry_run=True)
+        destination = create_destination({})
+        template.copy_to(destination, value_map={'adrc': 'beta'})
+
+        source_file.read.assert_not_called()
+        destination.upload_file.assert_not_called()
+        destination.add_gear_rule.assert_not_called()
+        destination.set_description.assert_not_called()
+
+    def test_copy_dataviews(self):
+        """Test that only missing or different dataviews are changed."""
+        template, _, template_proxy = create_template()
+        views = [
+            create_dataview(label, [{
+                'src': 'file.name'
+            }]) for label in ['same', 'changed', 'new']
+        ]
+        template_proxy.get_dataviews.return_value = views
+
+        destination = create_destination({})
+        destination.get_dataviews.return_value = [
+            create_dataview('same', [{
+                'src': 'file.name'
+            }]),
+            create_dataview('changed', [])
+        ]
+        template.copy_dataviews(destination=destination)
+
+        destination.add_dataview.assert_called_once_with(views[2])
+        template_proxy.modify_dataview.assert_called_once()
@@ -0,0 +1,72 @@
+"""Tests for caching of REDCap projects in REDCapParametersRepository."""
+from typing import Any, Dict, List
+
+from redcap.redcap_connection import REDCapConnection
+from redcap.redcap_project import REDCapProject
+from redcap.redcap_repository import REDCapParametersRepository
+
+
+class DummyConnection(REDCapConnection):
+    """Connection that counts requests instead of posting them."""
+
+    def __init__(self) -> None:
+        super().__init__(token='dummy', url='dummy')
+        self.requests: List[str] = []
+
+    def request_json_value(self, *, data: Dict[str, str], message: str) -> Any:
+        content = data['content']
+        self.requests.append(content)
+        if content == 'project':
+            return {
+                'project_id': 1,
+                'project_title': 'dummy',
+                'is_longitudinal': 0,
+                'has_repeating_instruments_or_events': 0
+            }
+        if content == 'exportFieldNames':
+            return [{'export_field_name': 'record_id'}]
+        if content == 'userRole':
+            return [{'role_label': 'alpha', 'unique_role_name': 'U-1'}]
+        if content == 'userRoleMapping' and 'action' not in data:
+            return [{'username': 'old@dummy.org', 'unique_role_name': 'U-1'}]
+
+        return 1
+
+
+# pylint: disable=(no-self-use)
+class TestREDCapProjectCache:
+    """Tests for REDCap project caching."""
+
+    def test_project_cache(self, monkeypatch):
+        """Test that the project is only created once per PID."""
+        connection = DummyConnection()
+        monkeypatch.setattr(REDCapConnection, 'create_from',
+                            lambda parameters: connection)
+        repo = REDCapParametersRepository()
+        repo.add_project_parameter(1, {'url': 'dummy', 'token': 'dummy'})
+
+        project = repo.get_redcap_project(1)
+        assert project
+        assert repo.get_redcap_project(1) is project
+        assert connection.requests == ['project', 'exportFieldNames']
+
+        repo.clear_project_cache(1)
+        assert repo.get_redcap_project(1) is not project
+
+    def test_role_cache(self):
+        """Test that roles are exported once and assignments are tracked."""
+        connection = DummyConnection()
+        project = REDCapProject.create(connection)
+        connection.requests.clear()
+
+        assert project.assign_update_user_role_by_label(
+            'new@dummy.org', 'alpha')
+        assert project.assign_update_user_role_by_label(
+            'new@dummy.org', 'alpha')
+        assert project.assign_update_user_role_by_label(
+            'old@dummy.org', 'alpha')
+        assert not project.assign_update_user_role_by_label(
+            'new@dummy.org', 'beta')
+        assert connection.requests == [
+            'userRole', 'userRoleMapping', 'userRoleMapping'
+        ]
@@ -1,9 +1,17 @@
 """Tests for tabular_data.site_table.SiteTable."""
 import csv
 from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
-from tabular_data.site_table import SiteTable
+from tabular_data.site_table import (
+    SiteTable,
+    content_hash,
+    is_table_unchanged,
+    split_site_csv,
+    upload_site_file,
+)
 
 
 @pytest.fixture(scope="function")
@@ -56,3 +64,147 @@ class TestSiteTable:
         assert table.get_adcids() == {'1', '2'}
         assert table.select_site('1') == 'ADCID,BLAH\n1,blah1\n'
         assert table.select_site('2') == 'ADCID,BLAH\n2,blah2\n'
+
+    def test_partitions(self, site_data_stream):
+        """Test that partitions has a data frame for each site."""
+        table = SiteTable.create_from(site_data_stream)
+        assert table
+        partitions = dict(table.partitions())
+        assert set(partitions.keys()) == {'1', '2'}
+        assert partitions['1']['BLAH'].to_list() == ['blah1']
+        assert partitions['2']['BLAH'].to_list() == ['blah2']
+
+
+class TestSplitSiteCSV:
+    """Tests for split_site_csv."""
+
+    def test_split_in_chunks(self, tmp_path):
+        """Test splitting a table read in chunks."""
+        rows = ['SITE,BLAH'] + [
+            f'site{index % 3}(ADC{index % 3}),blah{index}'
+            for index in range(10)
+        ] + ['unknown,blah10']
+        site_files = split_site_csv(object_data=StringIO('\n'.join(rows)),
+                                    output_dir=tmp_path,
+                                    chunk_size=4)
+        assert site_files
+        assert set(site_files.keys()) == {'0', '1', '2'}
+        assert site_files['1'].read_text() == ('SITE,BLAH\n'
+                                               'site1(ADC1),blah1\n'
+                                               'site1(ADC1),blah4\n'
+                                               'site1(ADC1),blah7\n')
+
+    def test_same_as_in_memory(self, tmp_path):
+        """Test that reading in chunks gives the same text as the table
+        read in memory."""
+        data = 'ADCID,SCORE,NOTE\n1,1.50,\n1,2,NA\n2,007,x\n'
+        table = SiteTable.create_from(StringIO(data))
+        assert table
+        site_files = split_site_csv(object_data=StringIO(data),
+                                    output_dir=tmp_path,
+                                    chunk_size=1)
+        assert site_files
+        for adcid, site_file in site_files.items():
+            assert site_file.read_text() == table.select_site(adcid)
+
+    def test_split_no_site(self, tmp_path):
+        """Test splitting a table without a site column."""
+        assert split_site_csv(object_data=StringIO('A,B\n1,2\n'),
+                              output_dir=tmp_path) is None
+
+
+def create_project(info):
+    """Creates a mock project with a file with the info."""
+    project = MagicMock()
+    project.get_file.return_value = (SimpleNamespace(
+        info=info, update_info=MagicMock()) if info is not None else None)
+    return project
+
+
+class TestUploadSiteFile:
+    """Tests for change detection of site file uploads."""
+
+    def test_unchanged_contents(self):
+        """Test that unchanged contents are not uploaded."""
+        project = create_project({
+            'content_hash': content_hash('A\n1\n'),
+            'source_etag': 'old'
+        })
+        assert not upload_site_file(project=project,
+                                    file_name='table.csv',
+                                    contents='A\n1\n',
+                                    dry_run=False,
+                                    source_etag='new')
+        project.upload_file.assert_not_called()
+        project.get_file.return_value.update_info.assert_called_once_with(
+            {'source_etag': 'new'})
+
+    def test_unchanged_source(self):
+        """Test that the info is not updated if the source is the same."""
+        project = create_project({
+            'content_hash': content_hash('A\n1\n'),
+            'source_etag': 'tag',
+            'source_adcids': ['1']
+        })
+        assert not upload_site_file(project=project,
+                                    file_name='table.csv',
+                                    contents='A\n1\n',
+                                    dry_run=False,
+                                    source_etag='tag',
+                                    source_adcids=['1'])
+        project.get_file.return_value.update_info.assert_not_called()
+
+    def test_changed_contents(self):
+        """Test that changed contents are uploaded with hash in info."""
+        project = create_project({'content_hash': content_hash('A\n1\n')})
+        assert upload_site_file(project=project,
+                                file_name='table.csv',
+                                contents='A\n2\n',
+                                dry_run=False,
+                                source_etag='new',
+                                source_adcids=['1', '2'])
+        project.upload_file.assert_called_once()
+        project.get_file.return_value.update_info.assert_called_once_with({
+            'content_hash':
+            content_hash('A\n2\n'),
+            'source_etag':
+            'new',
+            'source_adcids': ['1', '2']
+        })
+
+    def test_table_unchanged(self):
+        """Test the check of source ETags on site files."""
+        source_info = {'source_etag': 'tag', 'source_adcids': ['1', '2']}
+        assert is_table_unchanged(file_name='table.csv',
+                                  source_etag='tag',
+                                  project_map={
+                                      '1': create_project(source_info),
+                                      '2': create_project(source_info),
+                                      '3': create_project(None),
+                                      '4': None
+                                  })
+        assert not is_table_unchanged(file_name='table.csv',
+                                      source_etag='tag',
+                                      project_map={
+                                          '1': create_project(source_info),
+                                          '2': create_project(None)
+                                      })
+        assert not is_table_unchanged(file_name='table.csv',
+                                      source_etag='tag',
+                                      project_map={
+                                          '1':
+                                          create_project(source_info),
+                                          '2':
+                                          create_project({
+                                              'source_etag':
+                                              'old',
+                                              'source_adcids': ['1', '2']
+                                          })
+                                      })
+        assert not is_table_unchanged(
+            file_name='table.csv',
+            source_etag='tag',
+            project_map={'1': create_project({'source_etag': 'tag'})})
+        assert not is_table_unchanged(file_name='table.csv',
+                                      source_etag='tag',
+                                      project_map={'1': create_project(None)})
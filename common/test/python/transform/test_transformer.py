@@ -1,6 +1,13 @@
 from keys.keys import FieldNames
 from outputs.errors import ListErrorWriter
-from transform.transformer import DateTransformer, FieldFilter, VersionMap
+from transform.transformer import (
+    DateTransformer,
+    FieldFilter,
+    FieldTransformations,
+    FilterPlan,
+    TransformerFactory,
+    VersionMap,
+)
 
 
 class TestVersionMap:
@@ -69,6 +76,85 @@ class TestFieldFilter:
         assert [k for k in record if k in input_record and k != 'b1']
 
 
+class TestFilterPlan:
+
+    def test_equivalent_to_filters(self):
+        first_filter = FieldFilter(version_map=VersionMap(
+            fieldname='ver', value_map={'2': 'beta'}, default='alpha'),
+                                   fields={
+                                       'alpha': ['a1', 'c1', 'other'],
+                                       'beta': ['b1', 'c1']
+                                   })
+        second_filter = FieldFilter(version_map=VersionMap(
+            fieldname='other', value_map={'x': 'gamma'}, default='delta'),
+                                    fields={
+                                        'gamma': ['g1'],
+                                        'delta': ['d1']
+                                    })
+        plan = FilterPlan([first_filter, second_filter])
+        records = [{
+            'ver': '1',
+            'other': 'x',
+            'a1': 1,
+            'b1': 2,
+            'c1': 3,
+            'g1': 4,
+            'd1': 5
+        }, {
+            'ver': '2',
+            'other': 'x',
+            'a1': 1,
+            'b1': 2,
+            'c1': 3,
+            'g1': 4,
+            'd1': 5
+        }, {
+            'ver': '2',
+            'other': 'y',
+            'd1': 5
+        }]
+        for record in records:
+            expected = second_filter.apply(first_filter.apply(dict(record)))
+            assert plan.apply(dict(record)) == expected
+
+        assert plan.apply(records[0]) == {
+            'ver': '1',
+            'b1': 2,
+            'c1': 3,
+            'g1': 4
+        }
+
+    def test_factory(self):
+        transformations = FieldTransformations()
+        transformations.add(
+            'UDS',
+            FieldFilter(version_map=VersionMap(fieldname='ver',
+                                               value_map={'2': 'beta'},
+                                               default='alpha'),
+                        fields={
+                            'alpha': ['a1'],
+                            'beta': ['b1']
+                        }))
+        factory = TransformerFactory(transformations)
+        assert factory.get_plan('UDS') is factory.get_plan('UDS')
+
+        transformer = factory.create(
+            'UDS', ListErrorWriter(container_id='dummy',
+                                   fw_path='dummy/dummy'))
+        record = transformer.transform(
+            {
+                'ver': '2',
+                'a1': 1,
+                'b1': 2,
+                FieldNames.DATE_COLUMN: '2024/1/1'
+            }, 0)
+        assert record == {
+            'ver': '2',
+            'a1': 1,
+            FieldNames.DATE_COLUMN: '2024-01-01'
+        }
+
+
 class TestDateTransformer:
 
     def test_nodate(self):
@@ -0,0 +1,132 @@
+"""Tests for directory change sets."""
+
+import yaml
+from users.authorizations import Authorizations
+from users.directory_changes import (
+    DirectoryChangeSet,
+    apply_changes,
+    compute_changes,
+    create_snapshot,
+    dump_snapshot,
+    load_snapshot,
+)
+from users.nacc_directory import ActiveUserEntry, PersonName, UserEntry
+
+
+def active_entry(name: str, adcid: int = 0) -> ActiveUserEntry:
+    """Creates an active entry for the name."""
+    return ActiveUserEntry(org_name='the center',
+                           adcid=adcid,
+                           name=PersonName(first_name=name, last_name='puppy'),
+                           email=f'{name}@theorg.org',
+                           auth_email=f'{name}@theorg.org',
+                           authorizations=Authorizations(study_id='adrc',
+                                                         submit=['form'],
+                                                         audit_data=False,
+                                                         approve_data=False,
+                                                         view_reports=True),
+                           active=True)
+
+
+def inactive_entry(name: str) -> UserEntry:
+    """Creates an inactive entry for the name."""
+    return UserEntry(name=PersonName(first_name=name, last_name='puppy'),
+                     email=f'{name}@theorg.org',
+                     auth_email=f'{name}@theorg.org',
+                     active=False)
+
+
+# pylint: disable=(no-self-use)
+class TestDirectoryChanges:
+    """Tests for computing directory change sets."""
+
+    def test_snapshot_round_trip(self):
+        """Test that a snapshot is unchanged by serialization."""
+        snapshot = create_snapshot(
+            [active_entry('chip'),
+             inactive_entry('ooly')])
+        assert load_snapshot(dump_snapshot(snapshot)) == snapshot
+        assert not compute_changes(
+            previous=load_snapshot(dump_snapshot(snapshot)), current=snapshot)
+
+    def test_changes(self):
+        """Test added, modified and archived entries."""
+        previous = create_snapshot([
+            active_entry('chip'),
+            active_entry('ooly'),
+            active_entry('gone'),
+            inactive_entry('old'),
+            active_entry('same')
+        ])
+        current = create_snapshot([
+            active_entry('chip', adcid=1),
+            inactive_entry('ooly'),
+            inactive_entry('old'),
+            active_entry('same'),
+            active_entry('new')
+        ])
+        changes = compute_changes(previous=previous, current=current)
+        assert [entry.email for entry in changes.added] == ['new@theorg.org']
+        assert changes.modified == [active_entry('chip', adcid=1)]
+        assert [entry.email for entry in changes.archived
+                ] == ['ooly@theorg.org', 'gone@theorg.org']
+        assert not any(entry.active for entry in changes.archived)
+
+    def test_apply_changes(self):
+        """Test that a snapshot with the changes applied has no changes."""
+        previous = create_snapshot([
+            active_entry('chip'),
+            active_entry('ooly'),
+            active_entry('gone'),
+            inactive_entry('old')
+        ])
+        current = create_snapshot([
+            active_entry('chip', adcid=1),
+            inactive_entry('ooly'),
+            inactive_entry('old'),
+            active_entry('new')
+        ])
+        changes = compute_changes(previous=previous, current=current)
+        assert not compute_changes(previous=apply_changes(previous, changes),
+                                   current=current)
+
+    def test_apply_pending(self):
+        """Test that pending entries are in the next change set."""
+        previous = create_snapshot([active_entry('chip')])
+        current = create_snapshot(
+            [active_entry('chip', adcid=1),
+             active_entry('new')])
+        changes = compute_changes(previous=previous, current=current)
+        snapshot = apply_changes(previous,
+                                 changes,
+                                 pending=['new@theorg.org', 'chip@theorg.org'])
+        assert snapshot == previous
+
+        next_changes = compute_changes(previous=snapshot, current=current)
+        assert next_changes.added == [active_entry('new')]
+        assert next_changes.modified == [active_entry('chip', adcid=1)]
+
+        snapshot = apply_changes(previous, changes, pending=['new@theorg.org'])
+        next_changes = compute_changes(previous=snapshot, current=current)
+        assert next_changes.added == [active_entry('new')]
+        assert not next_changes.modified
+
+    def test_no_previous(self):
+        """Test that all active entries are added without a snapshot."""
+        current = create_snapshot(
+            [active_entry('chip'), inactive_entry('old')])
+        changes = compute_changes(previous={}, current=current)
+        assert changes.added == [active_entry('chip')]
+        assert [entry.email
+                for entry in changes.archived] == ['old@theorg.org']
+
+    def test_change_set_yaml(self):
+        """Test reading a change set from YAML."""
+        changes = DirectoryChangeSet(added=[active_entry('chip')],
+                                     archived=[inactive_entry('ooly')])
+        change_object = yaml.safe_load(
+            yaml.safe_dump(
+                changes.model_dump(mode='json', serialize_as_any=True)))
+        assert DirectoryChangeSet.is_change_set(change_object)
+        assert not DirectoryChangeSet.is_change_set([{'added': []}])
+        assert DirectoryChangeSet.create(change_object) == changes
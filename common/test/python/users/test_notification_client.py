@@ -0,0 +1,66 @@
+"""Tests for batched notifications of the user processes."""
+from unittest.mock import MagicMock
+
+from notifications.email import BulkEmailStatus
+from users.authorizations import Authorizations
+from users.nacc_directory import ActiveUserEntry, PersonName
+from users.user_processes import NotificationClient
+
+
+def create_entry(name: str) -> ActiveUserEntry:
+    """Creates an active user entry with the name."""
+    return ActiveUserEntry(name=PersonName(first_name=name, last_name='puppy'),
+                           email=f'{name}@that.org',
+                           auth_email=f'{name}@auth.org',
+                           active=True,
+                           org_name='the center',
+                           adcid=1,
+                           authorizations=Authorizations(study_id='adrc',
+                                                         submit=[],
+                                                         audit_data=False,
+                                                         approve_data=False,
+                                                         view_reports=False))
+
+
+class TestNotificationClient:
+    """Tests for NotificationClient."""
+
+    def test_unbatched(self):
+        """Test that messages are sent immediately without batching."""
+        email_client = MagicMock()
+        client = NotificationClient(email_client=email_client,
+                                    configuration_set_name='dummy',
+                                    portal_url='https://dummy.org',
+                                    mode='force')
+        client.send_claim_email(create_entry('ooly'))
+        email_client.send.assert_called_once()
+        assert not client.flush()
+
+    def test_batched(self):
+        """Test that batched messages are sent in bulk by template."""
+        email_client = MagicMock()
+        email_client.send_bulk.side_effect = (
+            lambda configuration_set_name, template, messages: [
+                BulkEmailStatus(to_addresses=destination.to_addresses,
+                                status='Success')
+                for destination, _ in messages
+            ])
+        client = NotificationClient(email_client=email_client,
+                                    configuration_set_name='dummy',
+                                    portal_url='https://dummy.org',
+                                    mode='force',
+                                    batch=True)
+        client.send_claim_email(create_entry('ooly'))
+        client.send_claim_email(create_entry('aggie'))
+        client.send_creation_email(create_entry('lily'))
+        email_client.send.assert_not_called()
+
+        statuses = client.flush()
+        assert len(statuses) == 3
+        assert email_client.send_bulk.call_count == 2
+        templates = [
+            call.kwargs['template']
+            for call in email_client.send_bulk.call_args_list
+        ]
+        assert templates == ['claim', 'user-creation']
+        assert not client.flush()
@@ -1,10 +1,14 @@
 """Defines the APOE Transformer."""
 import logging
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from typing import Any, Dict, List, TextIO, Tuple
 
+import pandas as pd
 from flywheel import FileSpec
 from flywheel_adaptor.flywheel_proxy import FlywheelProxy, ProjectAdaptor
 from gear_execution.gear_execution import GearExecutionError
+from inputs.columnar_reader import ColumnarVisitor, transform_csv
 from inputs.csv_reader import CSVVisitor, read_csv
 from outputs.errors import (
     LogErrorWriter,
@@ -27,6 +31,12 @@ APOE_ENCODINGS: Dict[Tuple[str, str], int] = {
     ("E2", "E2"): 6
 }
 
+# lookup of joined allele pair for mapping allele columns in bulk
+APOE_PAIR_ENCODINGS: Dict[str, int] = {
+    f'{a1},{a2}': value
+    for (a1, a2), value in APOE_ENCODINGS.items()
+}
+
 
 class APOETransformerCSVVisitor(CSVVisitor):
     """Class for visiting each row in the APOE genotype CSV."""
@@ -92,12 +102,51 @@ class APOETransformerCSVVisitor(CSVVisitor):
         return True
 
 
+class APOETransformerColumnarVisitor(ColumnarVisitor):
+    """Class for transforming chunks of the APOE genotype CSV."""
+
+    EXPECTED_INPUT_HEADERS: Tuple[str, ...] = ('a1', 'a2')
+
+    def __init__(self, error_writer: LogErrorWriter):
+        """Initializer."""
+        self.__error_writer: LogErrorWriter = error_writer
+
+    def visit_header(self, header: List[str]) -> bool:
+        """Verifies that the normalized header is valid.
+
+        Args:
+            header: The list of normalized headers from the input CSV
+        Returns:
+            True if the header is valid, else False
+        """
+        missing = set(self.EXPECTED_INPUT_HEADERS) - set(header)
+        for field in missing:
+            error = missing_field_error(field)
+            self.__error_writer.write(error)
+
+        return not missing
+
+    def visit_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Replaces the allele columns of the chunk with the APOE encoding.
+
+        Args:
+            chunk: the data frame for rows of the input CSV
+        Returns:
+            the data frame with the apoe column in place of a1 and a2
+        """
+        pairs = (chunk['a1'].str.strip().str.upper() + ',' +
+                 chunk['a2'].str.strip().str.upper())
+        apoe = pairs.map(APOE_PAIR_ENCODINGS).fillna(9).astype(int)
+        return chunk.drop(columns=['a1', 'a2']).assign(apoe=apoe)
+
+
 def run(*,
         proxy: FlywheelProxy,
         input_file: TextIO,
         filename: str,
         project: ProjectAdaptor,
-        delimiter: str = ','):
+        delimiter: str = ',',
+        columnar: bool = False):
     """Runs the APOE transformation process.
 
     Args:
@@ -106,7 +155,16 @@ def run(*,
         filename: The output filename to write to
         project: The target project to upload results to
         delimiter: The input CSV delimiter
+        columnar: Whether to transform the file in chunks of columns
     """
+    if columnar:
+        run_columnar(proxy=proxy,
+                     input_file=input_file,
+                     filename=filename,
+                     project=project,
+                     delimiter=delimiter)
+        return
+
     # read the CSV
     error_writer = LogErrorWriter(log)
     visitor = APOETransformerCSVVisitor(error_writer)
@@ -133,3 +191,52 @@ def run(*,
     else:
         project.upload_file(file_spec)  # type: ignore
         log.info(f"Successfully uploaded {filename}")
+
+
+def run_columnar(*,
+                 proxy: FlywheelProxy,
+                 input_file: TextIO,
+                 filename: str,
+                 project: ProjectAdaptor,
+                 delimiter: str = ','):
+    """Runs the APOE transformation process on chunks of the input file.
+
+    Transformed chunks are written to a temporary file that is uploaded, so
+    memory use does not grow with the size of the input.
+
+    Args:
+        proxy: the proxy for the Flywheel instance
+        input_file: The input CSV TextIO stream to transform on
+        filename: The output filename to write to
+        project: The target project to upload results to
+        delimiter: The input CSV delimiter
+    """
+    error_writer = LogErrorWriter(log)
+    visitor = APOETransformerColumnarVisitor(error_writer)
+    with TemporaryDirectory() as output_dir:
+        output_path = Path(output_dir, filename)
+        with open(output_path, mode='w', encoding='utf8',
+                  newline='') as output_file:
+            success = transform_csv(input_file=input_file,
+                                    output_file=output_file,
+                                    error_writer=error_writer,
+                                    visitor=visitor,
+                                    delimiter=delimiter)
+
+        if not success:
+            raise GearExecutionError(
+                'Errors found while reading the input CSV file')
+
+        if proxy.dry_run:
+            log.info(f"DRY RUN: Would have uploaded {filename}")
+            return
+
+        log.info(f"Writing transformed APOE data to {project.id}")
+        with open(output_path, mode='rb') as contents:
+            file_spec = FileSpec(
+                name=filename,
+                contents=contents,  # type: ignore
+                content_type='text/csv',
+                size=output_path.stat().st_size)
+            project.upload_file(file_spec)  # type: ignore
+        log.info(f"Successfully uploaded {filename}")
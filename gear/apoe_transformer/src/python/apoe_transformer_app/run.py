@@ -26,7 +26,7 @@ class APOETransformerVisitor(GearExecutionEnvironment):
 
     def __init__(self, client: ClientWrapper, file_input: InputFileWrapper,
                  filename: str, target_project_id: str, local_run: bool,
-                 delimiter: str):
+                 delimiter: str, columnar: bool):
         super().__init__(client=client)
 
         self.__file_input = file_input
@@ -34,6 +34,7 @@ class APOETransformerVisitor(GearExecutionEnvironment):
         self.__target_project_id = target_project_id
         self.__local_run = local_run
         self.__delimiter = delimiter
+        self.__columnar = columnar
 
     @classmethod
     def create(
@@ -75,7 +76,8 @@ class APOETransformerVisitor(GearExecutionEnvironment):
             filename=filename,
             target_project_id=target_project_id,
             local_run=local_run,
-            delimiter=context.config.get('delimiter', ','))
+            delimiter=context.config.get('delimiter', ','),
+            columnar=context.config.get('columnar', False))
 
     def run(self, context: GearToolkitContext) -> None:
         """Runs the APOE Transformer app."""
@@ -106,7 +108,8 @@ class APOETransformerVisitor(GearExecutionEnvironment):
                 input_file=fh,
                 filename=self.__filename,
                 project=project,
-                delimiter=self.__delimiter)
+                delimiter=self.__delimiter,
+                columnar=self.__columnar)
 
 
 def main():
@@ -1,11 +1,14 @@
 """Tests for the APOE transformer, namely APOETransformerCSVVisitor."""
 import logging
+from io import StringIO
 
 import pytest
 from apoe_transformer_app.main import (
     APOE_ENCODINGS,
+    APOETransformerColumnarVisitor,
     APOETransformerCSVVisitor,
 )
+from inputs.columnar_reader import transform_csv
 from outputs.errors import ListHandler, LogErrorWriter
 
 
@@ -107,3 +110,63 @@ class TestAPOETransformerCSVVisitor:
             'extra2': 'world',
             'apoe': 9
         }
+
+
+@pytest.fixture(scope='function')
+def columnar_visitor(list_handler):
+    """Creates a APOETransformerColumnarVisitor for testing."""
+    log = logging.getLogger(__name__)
+    log.addHandler(list_handler)
+
+    error_writer = LogErrorWriter(log)
+    return APOETransformerColumnarVisitor(error_writer)
+
+
+class TestAPOETransformerColumnarVisitor:
+    """Tests the APOETransformerColumnarVisitor class."""
+
+    def test_visit_header(self, columnar_visitor, list_handler):
+        """Test the visit_header method."""
+        assert columnar_visitor.visit_header(['adcid', 'a1', 'a2'])
+        assert not columnar_visitor.visit_header(['adcid', 'a2'])
+        assert len(list_handler.get_logs()) == 1
+
+    def test_transform(self, columnar_visitor):
+        """Test that transforming in chunks matches the row transformation."""
+        lines = ['ADCID, PTID ,A1,A2,Extra']
+        expected = ['adcid,ptid,extra,apoe']
+        for i, (pair, value) in enumerate(APOE_ENCODINGS.items()):
+            lines.append(f'{i},p{i},{pair[0].lower()}, {pair[1]},')
+            expected.append(f'{i},p{i},,{value}')
+        lines.append('9,p9,EE,FF,"hello, world"')
+        expected.append('9,p9,"hello, world",9')
+
+        input_file = StringIO('\n'.join(lines) + '\n')
+        output_file = StringIO()
+        error_writer = LogErrorWriter(logging.getLogger(__name__))
+        assert transform_csv(input_file=input_file,
+                             output_file=output_file,
+                             error_writer=error_writer,
+                             visitor=columnar_visitor,
+                             chunk_size=4)
+        assert output_file.getvalue() == '\n'.join(expected) + '\n'
+
+    def test_transform_header_only(self, columnar_visitor):
+        """Test that a file without rows produces only the header."""
+        output_file = StringIO()
+        error_writer = LogErrorWriter(logging.getLogger(__name__))
+        assert transform_csv(input_file=StringIO('a1,a2,naccid\n'),
+                             output_file=output_file,
+                             error_writer=error_writer,
+                             visitor=columnar_visitor)
+        assert output_file.getvalue() == 'naccid,apoe\n'
+
+    def test_transform_empty(self, columnar_visitor, list_handler):
+        """Test that an empty file is an error."""
+        log = logging.getLogger(__name__)
+        log.addHandler(list_handler)
+        assert not transform_csv(input_file=StringIO(),
+                                 output_file=StringIO(),
+                                 error_writer=LogErrorWriter(log),
+                                 visitor=columnar_visitor)
+        assert list_handler.get_logs()
@@ -1,16 +1,22 @@
 """Defines center management computation."""
 
 import logging
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 
-from centers.center_group import CenterGroup
+from centers.center_group import CenterError, CenterGroup
 from centers.center_info import CenterInfo
 from centers.nacc_group import NACCGroup
+from flywheel.models.access_permission import AccessPermission
 from flywheel.models.group_role import GroupRole
+from flywheel.rest import ApiException
 from flywheel_adaptor.flywheel_proxy import FlywheelError, FlywheelProxy
 
 log = logging.getLogger(__name__)
 
+DEFAULT_MAX_WORKERS = 4
+
 
 def get_project_roles(flywheel_proxy,
                       role_names: List[str]) -> List[GroupRole]:
@@ -34,40 +40,100 @@ def get_project_roles(flywheel_proxy,
     return role_list
 
 
+def provision_center(*, proxy: FlywheelProxy, admin_group: NACCGroup,
+                     center: CenterInfo, center_roles: List[GroupRole],
+                     admin_access: List[AccessPermission]) -> Optional[str]:
+    """Creates or updates the group for the center, and adds the center to
+    the center map of the admin group.
+
+    Steps where the group already has the expected tags, roles, permissions
+    or projects make no changes.
+
+    Args:
+      proxy: the proxy for the Flywheel instance
+      admin_group: the administrative group
+      center: the center
+      center_roles: the roles for the center group
+      admin_access: the access permissions of the administrative group
+    Returns:
+      the error message if the center could not be provisioned. None,
+      otherwise
+    """
+    start = time.time()
+    try:
+        center_group = CenterGroup.create_from_center(center=center,
+                                                      proxy=proxy)
+        center_group.add_roles(center_roles)
+        admin_group.add_center(center_group)
+
+        if admin_access:
+            center_group.add_permissions(admin_access)
+            center_group.add_center_portal()
+    except (ApiException, CenterError, FlywheelError) as error:
+        return str(error)
+
+    log.info("Provisioned center %s in %.1f seconds", center.group,
+             time.time() - start)
+    return None
+
+
 def run(*,
         proxy: FlywheelProxy,
         admin_group: NACCGroup,
         center_list: List[CenterInfo],
         role_names: List[str],
-        new_only: bool = False):
+        new_only: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, str]:
     """Runs center creation/management.
 
+    Centers are provisioned concurrently, with the roles and admin access
+    read once, and the center map written once after all centers are added.
+
     Args:
       proxy: the proxy for the Flywheel instance
       admin_group: the administrative group
       center_list: the list of center objects
       role_names: list of project role names
       new_only: whether to only create centers with new tag
+      max_workers: the maximum number of centers provisioned concurrently
+    Returns:
+      error messages keyed by center ID for centers that failed
     """
     center_roles = get_project_roles(proxy, role_names)
+    admin_access = admin_group.get_user_access()
 
+    centers = []
     for center in center_list:
         if new_only and 'new-center' not in center.tags:  # type: ignore
             log.info(f"new_only set to True and {center.name} does not " +
                      "have `new-center` tag, skipping")
             continue
+        centers.append(center)
 
-        try:
-            center_group = CenterGroup.create_from_center(center=center,
-                                                          proxy=proxy)
-        except FlywheelError as error:
-            log.warning("Unable to create center: %s", str(error))
-            continue
+    start = time.time()
+    errors: Dict[str, str] = {}
+    # write the center map once after all centers are added
+    with admin_group.center_map_batch(), ThreadPoolExecutor(
+            max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(provision_center,
+                            proxy=proxy,
+                            admin_group=admin_group,
+                            center=center,
+                            center_roles=center_roles,
+                            admin_access=admin_access):
+            center
+            for center in centers
+        }
+        for future in as_completed(futures):
+            center = futures[future]
+            message = future.result()
+            if message:
+                log.error("Unable to provision center %s: %s", center.group,
+                          message)
+                errors[center.group] = message
 
-        center_group.add_roles(center_roles)
-        admin_group.add_center(center_group)
-
-        admin_access = admin_group.get_user_access()
-        if admin_access:
-            center_group.add_permissions(admin_access)
-            center_group.add_center_portal()
+    log.info("Provisioned %s of %s centers in %.1f seconds",
+             len(centers) - len(errors), len(centers),
+             time.time() - start)
+    return errors
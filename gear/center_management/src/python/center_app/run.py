@@ -21,7 +21,7 @@ from gear_execution.gear_execution import (
 from inputs.parameter_store import ParameterStore
 from inputs.yaml import YAMLReadError, load_from_stream
 
-from center_app.main import run
+from center_app.main import DEFAULT_MAX_WORKERS, run
 
 log = logging.getLogger(__name__)
 
@@ -33,11 +33,13 @@ class CenterCreationVisitor(GearExecutionEnvironment):
                  admin_id: str,
                  client: ClientWrapper,
                  center_filepath: str,
-                 new_only: bool = False):
+                 new_only: bool = False,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
         super().__init__(client=client)
         self.__admin_id = admin_id
         self.__new_only = new_only
         self.__center_filepath = center_filepath
+        self.__max_workers = max_workers
 
     @classmethod
     def create(
@@ -62,11 +64,12 @@ class CenterCreationVisitor(GearExecutionEnvironment):
             raise GearExecutionError('No center file provided')
         admin_id = context.config.get("admin_group", "nacc")
 
-        return CenterCreationVisitor(admin_id=admin_id,
-                                     client=client,
-                                     center_filepath=center_filepath,
-                                     new_only=context.config.get(
-                                         "new_only", False))
+        return CenterCreationVisitor(
+            admin_id=admin_id,
+            client=client,
+            center_filepath=center_filepath,
+            new_only=context.config.get("new_only", False),
+            max_workers=context.config.get("max_workers", DEFAULT_MAX_WORKERS))
 
     def __get_center_list(self, center_file_path: str) -> List[CenterInfo]:
         """Get the centers from the file.
@@ -96,12 +99,18 @@ class CenterCreationVisitor(GearExecutionEnvironment):
 
         Raises:
             AssertionError: If admin group ID or center list is not provided.
+            GearExecutionError: If any center could not be provisioned.
         """
-        run(proxy=self.proxy,
-            admin_group=self.admin_group(admin_id=self.__admin_id),
-            center_list=self.__get_center_list(self.__center_filepath),
-            role_names=['curate', 'upload', 'gear-bot'],
-            new_only=self.__new_only)
+        errors = run(proxy=self.proxy,
+                     admin_group=self.admin_group(admin_id=self.__admin_id),
+                     center_list=self.__get_center_list(
+                         self.__center_filepath),
+                     role_names=['curate', 'upload', 'gear-bot'],
+                     new_only=self.__new_only,
+                     max_workers=self.__max_workers)
+        if errors:
+            raise GearExecutionError("Failed to provision centers: "
+                                     f"{', '.join(sorted(errors))}")
 
 
 def main():
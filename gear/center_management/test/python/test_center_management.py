@@ -0,0 +1,91 @@
+"""Tests for center management."""
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+from center_app.main import run
+from centers.center_group import CenterError
+from centers.center_info import CenterInfo
+
+
+# pylint: disable=(redefined-outer-name)
+@pytest.fixture(scope='function')
+def admin_group():
+    """Creates a mock admin group with admin access."""
+    group = MagicMock()
+    group.get_user_access.return_value = [MagicMock(access='admin')]
+    return group
+
+
+class TestCenterManagement:
+    """Tests for the center management run."""
+
+    @patch('center_app.main.CenterGroup')
+    def test_provision(self, center_group_class, admin_group):
+        """Test that all centers are provisioned with shared lookups, and
+        added to the center map within a single batch."""
+        proxy = MagicMock()
+        centers = [
+            CenterInfo(adcid=1, name='Alpha', group='alpha'),
+            CenterInfo(adcid=2,
+                       name='Beta',
+                       group='beta',
+                       tags=('new-center', ))
+        ]
+        errors = run(proxy=proxy,
+                     admin_group=admin_group,
+                     center_list=centers,
+                     role_names=['curate', 'upload'],
+                     max_workers=2)
+        assert not errors
+        assert center_group_class.create_from_center.call_count == 2
+        assert admin_group.add_center.call_count == 2
+        admin_group.get_user_access.assert_called_once()
+        admin_group.center_map_batch.assert_called_once()
+        assert proxy.get_role.call_count == 2
+
+        calls = admin_group.mock_calls
+        enter = calls.index(call.center_map_batch().__enter__())
+        exit_index = next(index for index, map_call in enumerate(calls)
+                          if map_call[0] == 'center_map_batch().__exit__')
+        add_indexes = [
+            index for index, map_call in enumerate(calls)
+            if map_call[0] == 'add_center'
+        ]
+        assert all(enter < index < exit_index for index in add_indexes)
+
+    @patch('center_app.main.CenterGroup')
+    def test_new_only(self, center_group_class, admin_group):
+        """Test that only new centers are provisioned if requested."""
+        centers = [
+            CenterInfo(adcid=1, name='Alpha', group='alpha'),
+            CenterInfo(adcid=2,
+                       name='Beta',
+                       group='beta',
+                       tags=('new-center', ))
+        ]
+        run(proxy=MagicMock(),
+            admin_group=admin_group,
+            center_list=centers,
+            role_names=[],
+            new_only=True)
+        center_group_class.create_from_center.assert_called_once()
+
+    @patch('center_app.main.CenterGroup')
+    def test_center_error(self, center_group_class, admin_group):
+        """Test that a failed center is reported and others continue."""
+
+        def create_from_center(*, center, proxy):
+            if center.group == 'alpha':
+                raise CenterError('no metadata')
+            return MagicMock()
+
+        center_group_class.create_from_center.side_effect = create_from_center
+        errors = run(proxy=MagicMock(),
+                     admin_group=admin_group,
+                     center_list=[
+                         CenterInfo(adcid=1, name='Alpha', group='alpha'),
+                         CenterInfo(adcid=2, name='Beta', group='beta')
+                     ],
+                     role_names=[])
+        assert errors == {'alpha': 'no metadata'}
+        admin_group.add_center.assert_called_once()
@@ -6,7 +6,7 @@ from io import StringIO
 from json.decoder import JSONDecodeError
 from typing import Any, Dict, List, Mapping, Optional
 
-import yaml
+from inputs.yaml import YAMLReadError, load_from_stream
 from keys.keys import DefaultValues, FieldNames
 from outputs.errors import ListErrorWriter, empty_field_error, system_error
 from s3.s3_client import S3BucketReader
@@ -160,7 +160,7 @@ class DefinitionsLoader:
                 if 'json' in rules_type:
                     form_def = json.load(file_data)
                 elif 'yaml' in rules_type:
-                    form_def = yaml.safe_load(file_data)
+                    form_def = load_from_stream(file_data)
                 else:
                     log.error('Unhandled definition file type: %s - %s', key,
                               rules_type)
@@ -176,7 +176,7 @@ class DefinitionsLoader:
                 else:
                     log.error('Empty definition file: %s', key)
                     parser_error = True
-            except (JSONDecodeError, yaml.YAMLError, TypeError) as error:
+            except (JSONDecodeError, YAMLReadError, TypeError) as error:
                 log.error('Failed to parse the definition file: %s - %s', key,
                           error)
                 parser_error = True
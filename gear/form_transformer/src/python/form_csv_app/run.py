@@ -97,7 +97,8 @@ class FormCSVtoJSONTransformer(GearExecutionEnvironment):
                                            fw_path=proxy.get_lookup_path(file))
             success = run(input_file=csv_file,
                           destination=ProjectAdaptor(project=project,
-                                                     proxy=proxy),
+                                                     proxy=proxy,
+                                                     subject_index=True),
                           transformer_factory=self.__build_transformer(
                               self.__transform_input),
                           error_writer=error_writer,
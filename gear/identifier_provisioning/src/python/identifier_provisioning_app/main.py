@@ -1,7 +1,10 @@
 """Defines Identifier Provisioning."""
 
 import logging
-from typing import Any, Dict, Iterator, List, Optional, TextIO
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from csv import DictReader, Error
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple
 
 from dates.form_dates import DATE_FORMATS, DateFormatException, parse_date
 from enrollment.enrollment_project import EnrollmentProject, TransferInfo
@@ -18,6 +21,7 @@ from enrollment.enrollment_transfer import (
 )
 from flywheel_adaptor.flywheel_proxy import ProjectAdaptor
 from gear_execution.gear_execution import GearExecutionError
+from identifiers.cached_repository import CachedIdentifierRepository
 from identifiers.identifiers_repository import (
     IdentifierRepository,
     IdentifierRepositoryError,
@@ -81,11 +85,35 @@ def update_record_level_error_log(*,
                                  f'{input_record[FieldNames.ENRLFRM_DATE]}')
 
 
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_DELAY = 2.0
+
+
 class EnrollmentBatch:
     """Collects new Identifier objects for committing to repository."""
 
-    def __init__(self) -> None:
+    def __init__(self,
+                 *,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 retries: int = DEFAULT_RETRIES,
+                 retry_delay: float = DEFAULT_RETRY_DELAY) -> None:
+        """Initializes an empty batch.
+
+        Args:
+          chunk_size: the number of identifiers created per repository request
+          max_workers: the maximum number of concurrent requests
+          retries: the number of times a failed request is retried
+          retry_delay: the seconds to wait before the first retry, doubled
+            for each further retry
+        """
         self.__records: Dict[str, EnrollmentRecord] = {}
+        self.__chunk_size = max(chunk_size, 1)
+        self.__max_workers = max(max_workers, 1)
+        self.__retries = retries
+        self.__retry_delay = retry_delay
 
     def __iter__(self) -> Iterator[EnrollmentRecord]:
         """Returns an iterator to the the enrollment records in this batch."""
@@ -107,7 +135,11 @@ class EnrollmentBatch:
     def commit(self, repo: IdentifierRepository) -> None:
         """Adds participants to the repository.
 
+        Records are sent to the repository in chunks, with several chunks in
+        flight at once.
         NACCIDs are added to records after identifiers are created.
+        Records in chunks that fail after all retries are left without a
+        NACCID.
 
         Args:
           repo: the repository for identifiers
@@ -116,17 +148,108 @@ class EnrollmentBatch:
             log.warning('No enrollment records found to create')
             return
 
-        query = [record.query_object() for record in self.__records.values()]
-        identifiers = repo.create_list(query)
-        log.info("created %s new NACCIDs", len(identifiers))
-        if len(query) != len(identifiers):
-            log.warning("expected %s new IDs, got %s", len(query),
-                        len(identifiers))
+        records = [
+            record for record in self.__records.values() if not record.naccid
+        ]
+        chunks = [
+            records[index:index + self.__chunk_size]
+            for index in range(0, len(records), self.__chunk_size)
+        ]
+        start_time = time.time()
+        created_count = 0
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = [
+                executor.submit(self.__create_chunk, repo, chunk)
+                for chunk in chunks
+            ]
+            for count, future in enumerate(as_completed(futures), start=1):
+                identifiers = future.result()
+                for identifier in identifiers:
+                    record = self.__records.get(identifier.ptid)
+                    if record:
+                        record.naccid = identifier.naccid
+                created_count += len(identifiers)
+                log.info("created %s of %s NACCIDs (%s of %s chunks) in %.1fs",
+                         created_count, len(records), count, len(chunks),
+                         time.time() - start_time)
+
+        if len(records) != created_count:
+            log.warning("expected %s new IDs, got %s", len(records),
+                        created_count)
+
+    def __create_chunk(
+            self, repo: IdentifierRepository,
+            records: List[EnrollmentRecord]) -> List[IdentifierObject]:
+        """Creates identifiers for a chunk of records with retries.
+
+        Before a retry, identifiers that were created by the failed request
+        are found by ADCID and PTID, so that only the remaining records are
+        sent again.
+
+        Args:
+          repo: the repository for identifiers
+          records: the enrollment records in the chunk
+        Returns:
+          the identifiers created for the records
+        """
+        created: List[IdentifierObject] = []
+        pending = records
+        attempt = 0
+        while pending:
+            try:
+                created.extend(
+                    repo.create_list(
+                        [record.query_object() for record in pending]))
+                return created
+            except IdentifierRepositoryError as error:
+                log.warning('Failed to create NACCIDs for %s records: %s',
+                            len(pending), error)
+
+            pending = self.__find_missing(repo=repo,
+                                          records=pending,
+                                          found=created)
+            if not pending:
+                break
+            if attempt >= self.__retries:
+                log.error('Giving up creating NACCIDs for %s records',
+                          len(pending))
+                break
+
+            time.sleep(self.__retry_delay * 2**attempt)
+            attempt += 1
+            log.info('Retrying NACCID creation for %s records (attempt %s)',
+                     len(pending), attempt)
+
+        return created
+
+    def __find_missing(
+            self, *, repo: IdentifierRepository,
+            records: List[EnrollmentRecord],
+            found: List[IdentifierObject]) -> List[EnrollmentRecord]:
+        """Finds the records without identifiers in the repository.
+
+        Identifiers that exist are added to the found list.
+
+        Args:
+          repo: the repository for identifiers
+          records: the enrollment records
+          found: the list of found identifiers
+        Returns:
+          the records for which no identifier was found
+        """
+        missing: List[EnrollmentRecord] = []
+        for record in records:
+            try:
+                identifier = repo.get(adcid=record.center_identifier.adcid,
+                                      ptid=record.center_identifier.ptid)
+            except IdentifierRepositoryError:
+                identifier = None
+            if identifier:
+                found.append(identifier)
+            else:
+                missing.append(record)
 
-        for identifier in identifiers:
-            record = self.__records.get(identifier.ptid)
-            if record:
-                record.naccid = identifier.naccid
+        return missing
 
 
 class TransferVisitor(CSVVisitor):
@@ -549,9 +672,55 @@ class ProvisioningVisitor(CSVVisitor):
         return success
 
 
-def run(*, input_file: TextIO, center_id: int, repo: IdentifierRepository,
-        enrollment_project: EnrollmentProject, error_writer: ListErrorWriter,
-        gear_name: str):
+def prefetch_identifiers(*, input_file: TextIO, center_id: int,
+                         repo: CachedIdentifierRepository) -> None:
+    """Loads the identifiers referenced by the input file into the index of
+    the repository.
+
+    Lists the identifiers for the center, and looks up the NACCIDs, GUIDs and
+    previous ADCID, PTID pairs given in the file.
+    Rows that cannot be interpreted are skipped, and are reported when the
+    file is processed.
+    Resets the input stream to the beginning.
+
+    Args:
+      input_file: the data input stream
+      center_id: the ADCID for the center
+      repo: the identifier repository
+    """
+    naccids: Set[str] = set()
+    guids: Set[str] = set()
+    ptids: Set[Tuple[int, str]] = set()
+    try:
+        for row in DictReader(input_file):
+            try:
+                if has_known_naccid(row) and row.get(FieldNames.NACCID):
+                    naccids.add(row[FieldNames.NACCID])
+                if guid_available(row) and row.get(FieldNames.GUID):
+                    guids.add(row[FieldNames.GUID])
+                if previously_enrolled(row) and row.get(FieldNames.OLDPTID):
+                    ptids.add((int(row[FieldNames.OLDADCID]),
+                               row[FieldNames.OLDPTID]))
+            except (KeyError, TypeError, ValueError):
+                continue
+    except Error as error:
+        log.warning('Unable to prefetch identifiers: %s', error)
+
+    input_file.seek(0)
+    repo.prefetch(adcids=[center_id],
+                  naccids=naccids,
+                  guids=guids,
+                  ptids=ptids)
+
+
+def run(*,
+        input_file: TextIO,
+        center_id: int,
+        repo: IdentifierRepository,
+        enrollment_project: EnrollmentProject,
+        error_writer: ListErrorWriter,
+        gear_name: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE):
     """Runs identifier provisioning process.
 
     Args:
@@ -561,9 +730,13 @@ def run(*, input_file: TextIO, center_id: int, repo: IdentifierRepository,
       enrollment_project: the project tracking enrollment
       error_writer: the error output writer
       gear_name: gear name
+      chunk_size: the number of NACCIDs to create per repository request
     """
+    repo = CachedIdentifierRepository(repo)
+    prefetch_identifiers(input_file=input_file, center_id=center_id, repo=repo)
+
     transfer_info = TransferInfo(transfers=[])
-    enrollment_batch = EnrollmentBatch()
+    enrollment_batch = EnrollmentBatch(chunk_size=chunk_size)
     try:
         success = read_csv(input_file=input_file,
                            error_writer=error_writer,
@@ -587,6 +760,9 @@ def run(*, input_file: TextIO, center_id: int, repo: IdentifierRepository,
     except IdentifierRepositoryError as error:
         raise GearExecutionError(error) from error
 
+    enrollment_errors = enrollment_project.add_enrollments(
+        [record for record in enrollment_batch if record.naccid])
+
     for record in enrollment_batch:
         error_writer.clear()
         record_info = {
@@ -597,35 +773,16 @@ def run(*, input_file: TextIO, center_id: int, repo: IdentifierRepository,
             message = ('Failed to generate NACCID for enrollment record '
                        f'{record.center_identifier.adcid},'
                        f'{record.center_identifier.ptid}')
-            log.error(message)
-            error_writer.write(system_error(message=message))
-            update_record_level_error_log(input_record=record_info,
-                                          qc_passed=False,
-                                          project=enrollment_project,
-                                          gear_name=gear_name,
-                                          errors=error_writer.errors())
+        else:
+            message = enrollment_errors.get(record.naccid, '')
 
-            success = False
-            continue
-
-        if enrollment_project.find_subject(label=record.naccid):
-            message = f'Subject with NACCID {record.naccid} exists'
+        if message:
             log.error(message)
             error_writer.write(system_error(message=message))
-            update_record_level_error_log(input_record=record_info,
-                                          qc_passed=False,
-                                          project=enrollment_project,
-                                          gear_name=gear_name,
-                                          errors=error_writer.errors())
             success = False
-            continue
-
-        subject = enrollment_project.add_subject(record.naccid)
-        subject.add_enrollment(record)
-        # subject.update_demographics_info(demographics)
 
         update_record_level_error_log(input_record=record_info,
-                                      qc_passed=True,
+                                      qc_passed=not message,
                                       project=enrollment_project,
                                       gear_name=gear_name,
                                       errors=error_writer.errors())
@@ -23,7 +23,7 @@ from keys.keys import DefaultValues
 from lambdas.lambda_function import LambdaClient, create_lambda_client
 from outputs.errors import ListErrorWriter
 
-from identifier_provisioning_app.main import run
+from identifier_provisioning_app.main import DEFAULT_CHUNK_SIZE, run
 
 log = logging.getLogger(__name__)
 
@@ -32,13 +32,17 @@ class IdentifierProvisioningVisitor(GearExecutionEnvironment):
     """Execution visitor for NACCID provisioning gear."""
 
     # pylint: disable=(too-many-arguments)
-    def __init__(self, client: ClientWrapper, admin_id: str,
+    def __init__(self,
+                 client: ClientWrapper,
+                 admin_id: str,
                  file_input: InputFileWrapper,
-                 identifiers_mode: IdentifiersMode) -> None:
+                 identifiers_mode: IdentifiersMode,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
         super().__init__(client=client)
         self.__admin_id = admin_id
         self.__file_input = file_input
         self.__identifiers_mode: IdentifiersMode = identifiers_mode
+        self.__chunk_size = chunk_size
 
     @classmethod
     def create(
@@ -55,11 +59,13 @@ class IdentifierProvisioningVisitor(GearExecutionEnvironment):
 
         admin_id = context.config.get("admin_group", "nacc")
         mode = context.config.get("database_mode", "prod")
+        chunk_size = context.config.get("chunk_size", DEFAULT_CHUNK_SIZE)
 
         return IdentifierProvisioningVisitor(client=client,
                                              admin_id=admin_id,
                                              file_input=file_input,
-                                             identifiers_mode=mode)
+                                             identifiers_mode=mode,
+                                             chunk_size=chunk_size)
 
     def run(self, context: GearToolkitContext) -> None:
         """Runs the identifier provisioning app.
@@ -122,7 +128,8 @@ class IdentifierProvisioningVisitor(GearExecutionEnvironment):
                 gear_name=gear_name,
                 repo=IdentifiersLambdaRepository(
                     client=LambdaClient(client=create_lambda_client()),
-                    mode=self.__identifiers_mode))
+                    mode=self.__identifiers_mode),
+                chunk_size=self.__chunk_size)
 
             context.metadata.add_qc_result(self.__file_input.file_input,
                                            name="validation",
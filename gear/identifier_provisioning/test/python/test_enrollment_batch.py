@@ -0,0 +1,110 @@
+"""Tests for EnrollmentBatch."""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from enrollment.enrollment_transfer import EnrollmentRecord
+from identifier_provisioning_app.main import EnrollmentBatch
+from identifiers.cached_repository import CachedIdentifierRepository
+from identifiers.identifiers_repository import (
+    IdentifierQueryObject,
+    IdentifierRepository,
+    IdentifierRepositoryError,
+)
+from identifiers.model import (
+    CenterIdentifiers,
+    IdentifierList,
+    IdentifierObject,
+)
+
+
+class FlakyRepository(IdentifierRepository):
+    """Repository where a request fails after creating part of the list."""
+
+    def __init__(self, failures: int) -> None:
+        self.identifiers: Dict[str, IdentifierObject] = {}
+        self.requests: List[int] = []
+        self.__failures = failures
+
+    def create(self, adcid: int, ptid: str,
+               guid: Optional[str]) -> IdentifierObject:
+        identifier = self.identifiers.get(ptid)
+        if not identifier:
+            identifier = IdentifierObject(
+                adcid=adcid,
+                naccadc=len(self.identifiers),
+                ptid=ptid,
+                naccid=f'NACC{len(self.identifiers):06d}',
+                guid=guid)
+            self.identifiers[ptid] = identifier
+        return identifier
+
+    def create_list(
+            self, identifiers: List[IdentifierQueryObject]) -> IdentifierList:
+        self.requests.append(len(identifiers))
+        if self.__failures > 0:
+            self.__failures -= 1
+            self.create(adcid=identifiers[0].adcid,
+                        ptid=identifiers[0].ptid,
+                        guid=None)
+            raise IdentifierRepositoryError('timeout')
+
+        return IdentifierList([
+            self.create(adcid=query.adcid, ptid=query.ptid, guid=query.guid)
+            for query in identifiers
+        ])
+
+    # pylint: disable=(arguments-differ)
+    def get(self,
+            *,
+            naccid: Optional[str] = None,
+            adcid: Optional[int] = None,
+            ptid: Optional[str] = None,
+            guid: Optional[str] = None) -> Optional[IdentifierObject]:
+        return self.identifiers.get(str(ptid))
+
+    def list(self, adcid: Optional[int] = None) -> List[IdentifierObject]:
+        return list(self.identifiers.values())
+
+
+def create_batch(count: int, **kwargs) -> EnrollmentBatch:
+    """Creates a batch with records for the number of participants."""
+    batch = EnrollmentBatch(**kwargs)
+    for index in range(count):
+        batch.add(
+            EnrollmentRecord(center_identifier=CenterIdentifiers(
+                adcid=1, ptid=f'P{index}'),
+                             naccid=None,
+                             guid=None,
+                             start_date=datetime(2024, 1, 1)))
+    return batch
+
+
+class TestEnrollmentBatch:
+    """Tests for EnrollmentBatch.commit."""
+
+    def test_chunked_commit(self):
+        """Test that records are created in chunks."""
+        repo = FlakyRepository(failures=0)
+        batch = create_batch(25, chunk_size=10, max_workers=2)
+        batch.commit(repo)
+        assert sorted(repo.requests) == [5, 10, 10]
+        assert all(record.naccid for record in batch)
+        assert len({record.naccid for record in batch}) == 25
+
+    def test_retry_failed_chunk(self):
+        """Test that a retry only sends records that were not created."""
+        repo = FlakyRepository(failures=1)
+        batch = create_batch(5, chunk_size=10, retry_delay=0)
+        batch.commit(CachedIdentifierRepository(repo))
+        assert repo.requests == [5, 4]
+        assert all(record.naccid for record in batch)
+        assert len(repo.identifiers) == 5
+
+    def test_retries_exhausted(self):
+        """Test that records are left without NACCIDs after retries."""
+        repo = FlakyRepository(failures=3)
+        batch = create_batch(5, chunk_size=10, retries=2, retry_delay=0)
+        batch.commit(repo)
+        assert repo.requests == [5, 4, 3]
+        assert len([record for record in batch if record.naccid]) == 3
+        assert len(repo.identifiers) == 3
@@ -1,13 +1,13 @@
 """Defines project management computation."""
 
 import logging
-from typing import List
+from typing import Dict, List
 
 from centers.nacc_group import NACCGroup
 from flywheel.models.group_role import GroupRole
 from flywheel_adaptor.flywheel_proxy import FlywheelProxy
 from projects.study import Study
-from projects.study_mapping import StudyMappingVisitor
+from projects.study_mapping import DEFAULT_MAX_WORKERS, StudyMappingVisitor
 
 log = logging.getLogger(__name__)
 
@@ -34,16 +34,25 @@ def get_project_roles(flywheel_proxy,
     return role_list
 
 
-def run(*, proxy: FlywheelProxy, admin_group: NACCGroup,
-        study_list: List[Study]):
+def run(*,
+        proxy: FlywheelProxy,
+        admin_group: NACCGroup,
+        study_list: List[Study],
+        max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, str]:
     """Runs project pipeline creation/management.
 
     Args:
       proxy: the proxy for the Flywheel instance
       admin_group: the administrative group
       study_list: the list of input study objects
+      max_workers: the maximum number of centers mapped concurrently
+    Returns:
+      error messages keyed by center ID for centers that failed
     """
     visitor = StudyMappingVisitor(flywheel_proxy=proxy,
-                                  admin_group=admin_group)
+                                  admin_group=admin_group,
+                                  max_workers=max_workers)
     for study in study_list:
         visitor.visit_study(study)
+
+    return visitor.errors
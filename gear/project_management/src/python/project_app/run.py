@@ -24,6 +24,7 @@ from gear_execution.gear_execution import (
 from inputs.parameter_store import ParameterStore
 from inputs.yaml import YAMLReadError, load_all_from_stream
 from projects.study import Study
+from projects.study_mapping import DEFAULT_MAX_WORKERS
 
 from project_app.main import run
 
@@ -33,11 +34,15 @@ log = logging.getLogger(__name__)
 class ProjectCreationVisitor(GearExecutionEnvironment):
     """Defines the project management gear."""
 
-    def __init__(self, admin_id: str, client: ClientWrapper,
-                 project_filepath: str):
+    def __init__(self,
+                 admin_id: str,
+                 client: ClientWrapper,
+                 project_filepath: str,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
         super().__init__(client=client)
         self.__admin_id = admin_id
         self.__project_filepath = project_filepath
+        self.__max_workers = max_workers
 
     @classmethod
     def create(
@@ -64,7 +69,9 @@ class ProjectCreationVisitor(GearExecutionEnvironment):
 
         return ProjectCreationVisitor(admin_id=admin_id,
                                       client=client,
-                                      project_filepath=project_filepath)
+                                      project_filepath=project_filepath,
+                                      max_workers=context.config.get(
+                                          "max_workers", DEFAULT_MAX_WORKERS))
 
     def __get_study_list(self, project_filepath: str) -> List[Study]:
         try:
@@ -87,10 +94,15 @@ class ProjectCreationVisitor(GearExecutionEnvironment):
 
         Raises:
             AssertionError: If admin group ID or project list is not provided.
+            GearExecutionError: If any center could not be mapped.
         """
-        run(proxy=self.proxy,
-            admin_group=self.admin_group(admin_id=self.__admin_id),
-            study_list=self.__get_study_list(self.__project_filepath))
+        errors = run(proxy=self.proxy,
+                     admin_group=self.admin_group(admin_id=self.__admin_id),
+                     study_list=self.__get_study_list(self.__project_filepath),
+                     max_workers=self.__max_workers)
+        if errors:
+            raise GearExecutionError("Failed to map studies to centers: "
+                                     f"{', '.join(sorted(errors.keys()))}")
 
 
 def main():
@@ -1,21 +1,26 @@
 """Module for handling user data from directory."""
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-import yaml
+from inputs.yaml import dump_to_text
+from users.directory_changes import (
+    DirectorySnapshot,
+    compute_changes,
+    create_snapshot,
+)
 from users.nacc_directory import UserEntry, UserEntryList
 
 log = logging.getLogger(__name__)
 
 
-def run(*, user_report: List[Dict[str, Any]]) -> str:
-    """Converts user report records to UserDirectoryEntry and saves as list of
-    dictionary objects to the project.
+def create_entries(user_report: List[Dict[str, Any]]) -> UserEntryList:
+    """Converts user report records to directory entries.
 
     Args:
       user_report: user report records
+    Returns:
+      the list of directory entries
     """
-
     user_list = UserEntryList([])
     user_emails = set()
     for user_record in user_report:
@@ -30,7 +35,50 @@ def run(*, user_report: List[Dict[str, Any]]) -> str:
         user_list.append(entry)
         user_emails.add(entry.email)
 
+    return user_list
+
+
+def run(*,
+        user_report: List[Dict[str, Any]],
+        json_format: bool = False) -> str:
+    """Converts user report records to UserDirectoryEntry and saves as list of
+    dictionary objects to the project.
+
+    Args:
+      user_report: user report records
+      json_format: whether to write the list as JSON instead of YAML
+    Returns:
+      the text for the directory file
+    """
+    user_list = create_entries(user_report)
+
     log.info('Creating directory file with %s entries', len(user_list))
-    return yaml.safe_dump(data=user_list.model_dump(serialize_as_any=True),
-                          allow_unicode=True,
-                          default_flow_style=False)
+    return dump_to_text(user_list.model_dump(mode='json',
+                                             serialize_as_any=True),
+                        json_format=json_format)
+
+
+def run_changes(*,
+                user_report: List[Dict[str, Any]],
+                applied_snapshot: Optional[DirectorySnapshot],
+                json_format: bool = False) -> str:
+    """Converts user report records to directory entries, and computes the
+    change set relative to the snapshot of the entries applied by user
+    management.
+
+    If there is no applied snapshot, all entries are added.
+
+    Args:
+      user_report: user report records
+      applied_snapshot: the snapshot of the entries applied by user management
+      json_format: whether to write the change set as JSON instead of YAML
+    Returns:
+      the text for the change set
+    """
+    snapshot = create_snapshot(create_entries(user_report))
+    changes = compute_changes(previous=applied_snapshot or {},
+                              current=snapshot)
+
+    log.info('Creating change set file with %s entries', len(changes))
+    return dump_to_text(changes.model_dump(mode='json', serialize_as_any=True),
+                        json_format=json_format)
@@ -1,8 +1,11 @@
 """Script to pull directory information and convert to file expected by the
 user management gear."""
 import logging
-from typing import Dict, List, Optional
+from datetime import date, timedelta
+from io import StringIO
+from typing import Any, Dict, List, Optional
 
+from flywheel import FileEntry, Project
 from flywheel_gear_toolkit import GearToolkitContext
 from gear_execution.gear_execution import (
     ClientWrapper,
@@ -12,10 +15,27 @@ from gear_execution.gear_execution import (
     GearExecutionError,
 )
 from inputs.parameter_store import ParameterError, ParameterStore
+from inputs.yaml import (
+    YAMLReadError,
+    is_json_file,
+    load_from_json_stream,
+    load_from_stream,
+)
 from redcap.redcap_connection import REDCapConnectionError, REDCapReportConnection
+from users.directory_changes import (
+    APPLIED_VERSION,
+    FULL_PASS_DATE,
+    PENDING_EMAILS,
+    DirectoryChangeSet,
+    DirectorySnapshot,
+    apply_changes,
+    dump_snapshot,
+    load_snapshot,
+)
+from users.nacc_directory import UserFormatError
 from yaml.representer import RepresenterError
 
-from directory_app.main import run
+from directory_app.main import run, run_changes
 
 log = logging.getLogger(__name__)
 
@@ -23,11 +43,20 @@ log = logging.getLogger(__name__)
 class DirectoryPullVisitor(GearExecutionEnvironment):
     """Defines the directory pull gear."""
 
-    def __init__(self, client: ClientWrapper, user_filename: str,
-                 user_report: List[Dict[str, str]]):
+    # pylint: disable=(too-many-arguments)
+    def __init__(self,
+                 client: ClientWrapper,
+                 user_filename: str,
+                 user_report: List[Dict[str, str]],
+                 changes_filename: Optional[str] = None,
+                 snapshot_filename: Optional[str] = None,
+                 full_pass_days: int = 7):
         super().__init__(client=client)
         self.__user_filename = user_filename
         self.__user_report = user_report
+        self.__changes_filename = changes_filename
+        self.__snapshot_filename = snapshot_filename
+        self.__full_pass_days = full_pass_days
 
     @classmethod
     def create(
@@ -70,9 +99,22 @@ class DirectoryPullVisitor(GearExecutionEnvironment):
         if not user_filename:
             raise GearExecutionError("No user file name provided")
 
-        return DirectoryPullVisitor(client=client,
-                                    user_filename=user_filename,
-                                    user_report=user_report)
+        changes_filename = None
+        snapshot_filename = None
+        if context.config.get('change_set', False):
+            changes_filename = context.config.get('changes_file')
+            snapshot_filename = context.config.get('snapshot_file')
+            if not changes_filename or not snapshot_filename:
+                raise GearExecutionError(
+                    "Change set requires changes and snapshot file names")
+
+        return DirectoryPullVisitor(
+            client=client,
+            user_filename=user_filename,
+            user_report=user_report,
+            changes_filename=changes_filename,
+            snapshot_filename=snapshot_filename,
+            full_pass_days=int(context.config.get('full_pass_days', 7)))
 
     def run(self, context: GearToolkitContext) -> None:
         """Runs the directory pull gear.
@@ -90,7 +132,8 @@ class DirectoryPullVisitor(GearExecutionEnvironment):
             return
 
         try:
-            yaml_text = run(user_report=self.__user_report)
+            yaml_text = run(user_report=self.__user_report,
+                            json_format=is_json_file(self.__user_filename))
         except RepresenterError as error:
             raise GearExecutionError(
                 "Error: can't create YAML for file"
@@ -101,6 +144,204 @@ class DirectoryPullVisitor(GearExecutionEnvironment):
                                  encoding='utf-8') as out_file:
             out_file.write(yaml_text)
 
+        if self.__changes_filename and self.__snapshot_filename:
+            self.__write_changes(context=context,
+                                 changes_filename=self.__changes_filename,
+                                 snapshot_filename=self.__snapshot_filename)
+
+    def __write_changes(self, *, context: GearToolkitContext,
+                        changes_filename: str, snapshot_filename: str) -> None:
+        """Writes the change set relative to the snapshot of the entries
+        applied by user management.
+
+        The snapshot is only advanced with the previous change set once user
+        management has recorded that it applied that change set. Otherwise,
+        the snapshot is kept, and the new change set also includes the
+        entries of the change sets that were not applied.
+
+        User management records the change set as applied when the run
+        completes, along with the active entries whose users are not yet
+        fully set up. Those pending entries are not added to the snapshot, so
+        they are included in the new change set.
+
+        Every full_pass_days days the change set includes all entries, which
+        picks up entries lost if the snapshot is edited. The date of the last
+        full pass is kept in the file info of the change set.
+
+        Args:
+          context: the gear context
+          changes_filename: the name of the change set file
+          snapshot_filename: the name of the snapshot file
+        Raises:
+          GearExecutionError if the change set YAML cannot be created, or the
+          applied change set cannot be read
+        """
+        project = self.__get_destination_project(context)
+        applied_snapshot = self.__get_snapshot(
+            project=project, snapshot_filename=snapshot_filename)
+        changes_file = self.__get_changes_file(
+            project=project, changes_filename=changes_filename)
+        changes_info: Dict[str, Any] = {}
+        if changes_file:
+            changes_info = changes_file.info or {}
+
+        applied_changes = self.__get_applied_changes(project=project,
+                                                     changes_file=changes_file)
+        if applied_changes is not None:
+            pending = changes_info.get(PENDING_EMAILS) or []
+            log.info('Adding %s applied changes to snapshot %s, %s pending',
+                     len(applied_changes), snapshot_filename, len(pending))
+            applied_snapshot = apply_changes(applied_snapshot or {},
+                                             applied_changes,
+                                             pending=pending)
+            with context.open_output(snapshot_filename,
+                                     mode='w',
+                                     encoding='utf-8') as out_file:
+                out_file.write(dump_snapshot(applied_snapshot))
+
+        full_pass_date = changes_info.get(FULL_PASS_DATE)
+        if self.__is_full_pass_due(full_pass_date):
+            log.info('Last full pass %s, change set includes all entries',
+                     full_pass_date)
+            full_pass_date = date.today().isoformat()
+            applied_snapshot = None
+
+        try:
+            changes_text = run_changes(
+                user_report=self.__user_report,
+                applied_snapshot=applied_snapshot,
+                json_format=is_json_file(changes_filename))
+        except RepresenterError as error:
+            raise GearExecutionError("Error: can't create YAML for file"
+                                     f"{changes_filename}: {error}") from error
+
+        with context.open_output(changes_filename, mode='w',
+                                 encoding='utf-8') as out_file:
+            out_file.write(changes_text)
+
+        context.metadata.update_file_metadata(
+            changes_filename, info={FULL_PASS_DATE: full_pass_date})
+
+    def __is_full_pass_due(self, full_pass_date: Optional[str]) -> bool:
+        """Indicates whether the change set should include all entries.
+
+        Args:
+          full_pass_date: the ISO date of the last full pass
+        Returns:
+          True if there is no valid date for the last full pass, or it was at
+          least full_pass_days ago. False, otherwise
+        """
+        if not full_pass_date:
+            return True
+
+        try:
+            last_date = date.fromisoformat(full_pass_date)
+        except (TypeError, ValueError):
+            log.warning('Ignoring invalid full pass date %s', full_pass_date)
+            return True
+
+        return date.today() - last_date >= timedelta(
+            days=self.__full_pass_days)
+
+    def __get_destination_project(
+            self, context: GearToolkitContext) -> Optional[Project]:
+        """Returns the destination project, which holds the snapshot and
+        change set files.
+
+        Args:
+          context: the gear context
+        Returns:
+          the destination project. None, if the destination is not a project
+        """
+        if context.destination['type'] != 'project':
+            log.warning('Destination is not a project, no previous snapshot')
+            return None
+
+        return self.proxy.get_project_by_id(context.destination['id'])
+
+    @staticmethod
+    def __get_snapshot(*, project: Optional[Project],
+                       snapshot_filename: str) -> Optional[DirectorySnapshot]:
+        """Reads the snapshot of the entries applied by user management from
+        the project.
+
+        Args:
+          project: the destination project
+          snapshot_filename: the name of the snapshot file
+        Returns:
+          the snapshot. None, if there is no snapshot file
+        """
+        if not project or not project.get_file(snapshot_filename):
+            log.info('No previous snapshot %s, all entries are added',
+                     snapshot_filename)
+            return None
+
+        try:
+            return load_snapshot(project.read_file(snapshot_filename))
+        except ValueError as error:
+            log.warning('Ignoring previous snapshot %s: %s', snapshot_filename,
+                        error)
+            return None
+
+    @staticmethod
+    def __get_changes_file(*, project: Optional[Project],
+                           changes_filename: str) -> Optional[FileEntry]:
+        """Returns the previous change set file in the project.
+
+        Args:
+          project: the destination project
+          changes_filename: the name of the change set file
+        Returns:
+          the change set file with its info. None, if there is no file
+        """
+        if not project:
+            return None
+
+        changes_file = project.get_file(changes_filename)
+        if not changes_file:
+            return None
+
+        # file info may not be included in the project file listing
+        return changes_file.reload()
+
+    @staticmethod
+    def __get_applied_changes(
+            *, project: Optional[Project],
+            changes_file: Optional[FileEntry]) -> Optional[DirectoryChangeSet]:
+        """Reads the previous change set from the project if user management
+        has recorded that it applied the current version of the file.
+
+        Args:
+          project: the destination project
+          changes_file: the change set file
+        Returns:
+          the applied change set. None, if there is no change set file or it
+          has not been applied
+        Raises:
+          GearExecutionError if the applied change set cannot be read
+        """
+        if not project or not changes_file:
+            return None
+
+        changes_filename = changes_file.name
+        file_info = changes_file.info or {}
+        if file_info.get(APPLIED_VERSION) != changes_file.version:
+            log.info('Change set %s has not been applied', changes_filename)
+            return None
+
+        try:
+            file_data = project.read_file(changes_filename)
+            if is_json_file(changes_filename):
+                change_object = load_from_json_stream(
+                    StringIO(file_data.decode('utf-8')))
+            else:
+                change_object = load_from_stream(file_data)
+            return DirectoryChangeSet.create(change_object)
+        except (YAMLReadError, UserFormatError) as error:
+            raise GearExecutionError(
+                f'Error reading applied change set {changes_filename}: {error}'
+            ) from error
+
 
 def main() -> None:
     """Main method for directory pull.
@@ -0,0 +1,119 @@
+"""Tests for the directory pull change set."""
+from contextlib import contextmanager
+from datetime import date
+from io import StringIO
+from typing import Dict
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+from directory_app.run import DirectoryPullVisitor
+from users.authorizations import Authorizations
+from users.directory_changes import (
+    APPLIED_VERSION,
+    FULL_PASS_DATE,
+    PENDING_EMAILS,
+    DirectoryChangeSet,
+    load_snapshot,
+)
+from users.nacc_directory import ActiveUserEntry, PersonName
+
+CHANGES_FILE = 'changes.yaml'
+SNAPSHOT_FILE = 'snapshot.json'
+
+
+def active_entry(name: str) -> ActiveUserEntry:
+    """Creates an active entry for the name."""
+    return ActiveUserEntry(org_name='the center',
+                           adcid=0,
+                           name=PersonName(first_name=name, last_name='puppy'),
+                           email=f'{name}@theorg.org',
+                           auth_email=f'{name}@theorg.org',
+                           authorizations=Authorizations(study_id='adrc',
+                                                         submit=['form'],
+                                                         audit_data=False,
+                                                         approve_data=False,
+                                                         view_reports=True),
+                           active=True)
+
+
+def create_context(outputs: Dict[str, StringIO]) -> MagicMock:
+    """Creates a mock gear context that keeps the output file contents."""
+
+    @contextmanager
+    def open_output(name, **_kwargs):
+        outputs[name] = StringIO()
+        yield outputs[name]
+
+    context = MagicMock()
+    context.destination = {'type': 'project', 'id': 'project-id'}
+    context.open_output.side_effect = open_output
+    return context
+
+
+def create_project(info: Dict) -> MagicMock:
+    """Creates a mock project with an applied change set, where the file
+    info is only included in the reloaded file."""
+    changes = DirectoryChangeSet(
+        added=[active_entry('chip'), active_entry('new')])
+    listed_file = MagicMock(info={}, version=3)
+    listed_file.reload.return_value = MagicMock(info=info, version=3)
+    listed_file.reload.return_value.name = CHANGES_FILE
+
+    project = MagicMock()
+    project.get_file.side_effect = lambda name: (listed_file if name ==
+                                                 CHANGES_FILE else None)
+    project.read_file.return_value = yaml.safe_dump(
+        changes.model_dump(mode='json', serialize_as_any=True)).encode()
+    return project
+
+
+def create_visitor(project: MagicMock) -> DirectoryPullVisitor:
+    """Creates the directory pull visitor for the project."""
+    client = MagicMock()
+    client.dry_run = False
+    client.get_proxy.return_value.get_project_by_id.return_value = project
+    return DirectoryPullVisitor(client=client,
+                                user_filename='users.yaml',
+                                user_report=[],
+                                changes_filename=CHANGES_FILE,
+                                snapshot_filename=SNAPSHOT_FILE)
+
+
+# pylint: disable=(no-self-use)
+class TestDirectoryPull:
+    """Tests for writing the directory change set."""
+
+    def test_applied_changes(self):
+        """Test that the snapshot is advanced using the reloaded file info,
+        without the pending entries."""
+        today = date.today().isoformat()
+        project = create_project({
+            APPLIED_VERSION: 3,
+            PENDING_EMAILS: ['new@theorg.org'],
+            FULL_PASS_DATE: today
+        })
+        outputs: Dict[str, StringIO] = {}
+        context = create_context(outputs)
+        create_visitor(project).run(context)
+
+        snapshot = load_snapshot(outputs[SNAPSHOT_FILE].getvalue())
+        assert list(snapshot.keys()) == ['chip@theorg.org']
+        context.metadata.update_file_metadata.assert_called_once_with(
+            CHANGES_FILE, info={FULL_PASS_DATE: today})
+
+    @pytest.mark.parametrize('info', [{}, {
+        APPLIED_VERSION: 2,
+        FULL_PASS_DATE: '2020-01-01'
+    }])
+    def test_not_applied(self, info):
+        """Test that the snapshot is kept if the change set is not applied,
+        and that a full pass is recorded when due."""
+        outputs: Dict[str, StringIO] = {}
+        context = create_context(outputs)
+        create_visitor(create_project(info)).run(context)
+
+        assert SNAPSHOT_FILE not in outputs
+        assert CHANGES_FILE in outputs
+        context.metadata.update_file_metadata.assert_called_once_with(
+            CHANGES_FILE, info={FULL_PASS_DATE: date.today().isoformat()})
@@ -1,11 +1,19 @@
 """Pulls metadata from LONI."""
 
 import logging
-from typing import Dict, List
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, TextIO
 
 from flywheel_adaptor.flywheel_proxy import ProjectAdaptor
 from s3.s3_client import S3BucketReader
-from tabular_data.site_table import SiteTable, upload_split_table
+from tabular_data.site_table import (
+    SiteTable,
+    is_table_unchanged,
+    split_site_csv,
+    upload_split_files,
+    upload_split_table,
+)
 
 log = logging.getLogger(__name__)
 
@@ -14,21 +22,48 @@ def run(*,
         table_list: List[str],
         s3_client: S3BucketReader,
         project_map: Dict[str, ProjectAdaptor],
-        dry_run: bool = False) -> None:
+        dry_run: bool = False,
+        chunk_size: Optional[int] = None) -> None:
     """Pulls tabular data from S3, splits the data by center, and uploads the
     data to the center-specific FW project indicated by the project map.
 
+    Tables whose S3 ETag matches the one recorded on the site files are
+    skipped, and site files whose contents are unchanged are not uploaded.
+
     Args:
       table_list: the list of metadata table names
       s3_client: the S3 client for accessing files
       bucket_name: name of the source bucket
       project_map: map from ADCID to FW project for upload
+      chunk_size: if given, the number of rows to read at a time while
+        splitting each table
     """
+    if table_list:
+        # get current file info for the center projects
+        for project in project_map.values():
+            project.reload()
 
+    # TODO: need to abstract tag format
+    site_projects: Dict[str, Optional[ProjectAdaptor]] = {
+        key.removeprefix('adcid-'): project
+        for key, project in project_map.items()
+    }
     for filename in table_list:
+        source_etag = s3_client.get_etag(filename)
+        if source_etag and is_table_unchanged(file_name=filename,
+                                              source_etag=source_etag,
+                                              project_map=site_projects):
+            log.info("Table %s is unchanged, skipping", filename)
+            continue
+
         log.info("Downloading %s from S3", filename)
         try:
-            data = s3_client.read_data(filename=filename)
+            data: TextIO
+            if chunk_size:
+                # stream the object rather than load it into memory
+                data = s3_client.read_stream(filename=filename)
+            else:
+                data = s3_client.read_data(filename=filename)
         except s3_client.exceptions.NoSuchKey:
             log.error('File %s not found in bucket %s', filename,
                       s3_client.bucket_name)
@@ -37,6 +72,15 @@ def run(*,
             log.error('Unable to access file %s: %s', filename, obj_error)
             continue
 
+        if chunk_size:
+            split_in_chunks(data=data,
+                            filename=filename,
+                            project_map=project_map,
+                            chunk_size=chunk_size,
+                            dry_run=dry_run,
+                            source_etag=source_etag)
+            continue
+
         table = SiteTable.create_from(data)
         if not table:
             log.error(
@@ -55,4 +99,45 @@ def run(*,
         upload_split_table(table=table,
                            project_map=upload_map,
                            file_name=filename,
-                           dry_run=dry_run)
+                           dry_run=dry_run,
+                           source_etag=source_etag)
+
+
+def split_in_chunks(*,
+                    data: TextIO,
+                    filename: str,
+                    project_map: Dict[str, ProjectAdaptor],
+                    chunk_size: int,
+                    dry_run: bool,
+                    source_etag: Optional[str] = None) -> None:
+    """Splits the table data by center reading chunks of rows, and uploads
+    the data for each center to the project indicated by the project map.
+
+    Args:
+      data: the table data
+      filename: the name of the table
+      project_map: map from ADCID to FW project for upload
+      chunk_size: the number of rows to read at a time
+      dry_run: whether to skip uploads
+      source_etag: the ETag of the table in S3
+    """
+    log.info("Splitting table %s", filename)
+    with TemporaryDirectory() as output_dir:
+        site_files = split_site_csv(object_data=data,
+                                    output_dir=Path(output_dir),
+                                    chunk_size=chunk_size)
+        if site_files is None:
+            log.error(
+                'Table %s does not have a column with recognized center ID',
+                filename)
+            return
+
+        upload_map = {
+            adcid: project_map.get(f'adcid-{adcid}')
+            for adcid in site_files
+        }
+        upload_split_files(site_files=site_files,
+                           project_map=upload_map,
+                           file_name=filename,
+                           dry_run=dry_run,
+                           source_etag=source_etag)
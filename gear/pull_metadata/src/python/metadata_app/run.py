@@ -89,7 +89,8 @@ def main():
         run(table_list=table_list,
             s3_client=s3_client,
             project_map=project_map,
-            dry_run=dry_run)
+            dry_run=dry_run,
+            chunk_size=gear_context.config.get("chunk_size"))
 
 
 if __name__ == "__main__":
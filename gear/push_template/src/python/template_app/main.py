@@ -1,31 +1,87 @@
 """Function to push template projects to pipeline projects in the center groups
 of the the Flywheel instance."""
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional
 
+from centers.center_group import CenterError, CenterGroup
 from centers.nacc_group import NACCGroup
+from flywheel.rest import ApiException
+from flywheel_adaptor.flywheel_proxy import FlywheelError
 from projects.template_project import TemplateProject
 
 log = logging.getLogger(__name__)
 
+DEFAULT_MAX_WORKERS = 4
 
-def run(*, admin_group: NACCGroup, new_only: bool,
-        template: TemplateProject) -> None:
+
+def apply_template(center: CenterGroup,
+                   template: TemplateProject) -> Optional[str]:
+    """Applies the template to the matching projects of the center.
+
+    Args:
+      center: the center group
+      template: the template project
+    Returns:
+      the error message if the template could not be applied. None, otherwise
+    """
+    try:
+        center.apply_template(template)
+    except (ApiException, CenterError, FlywheelError) as error:
+        return str(error)
+
+    return None
+
+
+def run(*,
+        admin_group: NACCGroup,
+        new_only: bool,
+        template: TemplateProject,
+        max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, str]:
     """Applies the template to all matching projects in centers managed by the
     admin group.
 
+    Centers are pushed concurrently, and template rules and files are loaded
+    once and shared across the centers.
+
     Args:
-      proxy: the proxy for the Flywheel instance
-      center_tag_pattern: regex pattern to match center tags
-      template_map: map from datatype name to template projects
+      admin_group: the admin group for the centers
+      new_only: whether to only push to centers tagged as new
+      template: the template project
+      max_workers: the maximum number of centers pushed concurrently
+    Returns:
+      error messages keyed by center ID for centers that failed
     """
     center_list = admin_group.get_centers()
     if not center_list:
         log.warning('no groups found for centers')
-        return
+        return {}
 
-    for center in center_list:
-        if new_only and 'new-center' not in center.get_tags():
-            continue
+    centers = [
+        center for center in center_list
+        if not new_only or 'new-center' in center.get_tags()
+    ]
+    # TODO: remove 'new-center' tag
 
-        center.apply_template(template)
-        # TODO: remove 'new-center' tag
+    start = time.time()
+    errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(apply_template, center, template): center
+            for center in centers
+        }
+        for future in as_completed(futures):
+            center = futures[future]
+            message = future.result()
+            if message:
+                log.error('Failed to apply template to center %s: %s',
+                          center.id, message)
+                errors[center.id] = message
+            else:
+                log.info('Applied template to center %s', center.id)
+
+    log.info('Applied template to %s of %s centers in %.1f seconds',
+             len(centers) - len(errors), len(centers),
+             time.time() - start)
+    return errors
@@ -15,7 +15,7 @@ from inputs.context_parser import get_api_key
 from inputs.parameter_store import ParameterStore
 from projects.template_project import TemplateProject
 
-from template_app.main import run
+from template_app.main import DEFAULT_MAX_WORKERS, run
 
 log = logging.getLogger(__name__)
 
@@ -25,12 +25,14 @@ class TemplatingVisitor(GearExecutionEnvironment):
 
     # pylint: disable=(too-many-arguments)
     def __init__(self, admin_id: str, client: ClientWrapper,
-                 template_group: str, template_label: str, new_only: bool):
+                 template_group: str, template_label: str, new_only: bool,
+                 max_workers: int):
         super().__init__(client=client)
         self.__admin_id = admin_id
         self.__new_only = new_only
         self.__template_group = template_group
         self.__template_label = template_label
+        self.__max_workers = max_workers
 
     @classmethod
     def create(
@@ -66,7 +68,8 @@ class TemplatingVisitor(GearExecutionEnvironment):
             client=client,
             template_group=group_id,
             template_label=template_label,
-            new_only=context.config.get("new_only", False))
+            new_only=context.config.get("new_only", False),
+            max_workers=context.config.get("max_workers", DEFAULT_MAX_WORKERS))
 
     def run(self, context: GearToolkitContext) -> None:
 
@@ -79,9 +82,14 @@ class TemplatingVisitor(GearExecutionEnvironment):
                 f"{self.__template_group}/{self.__template_label}"
                 " does not exist")
 
-        run(admin_group=self.admin_group(admin_id=self.__admin_id),
-            new_only=self.__new_only,
-            template=TemplateProject(project=projects[0], proxy=self.proxy))
+        errors = run(admin_group=self.admin_group(admin_id=self.__admin_id),
+                     new_only=self.__new_only,
+                     template=TemplateProject(project=projects[0],
+                                              proxy=self.proxy),
+                     max_workers=self.__max_workers)
+        if errors:
+            raise GearExecutionError("Failed to apply template to centers: "
+                                     f"{', '.join(sorted(errors.keys()))}")
 
 
 def main():
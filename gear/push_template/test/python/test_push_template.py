@@ -0,0 +1,56 @@
+"""Tests for pushing a template to centers."""
+from unittest.mock import MagicMock
+
+from centers.center_group import CenterError
+from flywheel.rest import ApiException
+from flywheel_adaptor.flywheel_proxy import FlywheelError
+from template_app.main import run
+
+
+def create_center(center_id, tags, error=None):
+    """Creates a mock center group."""
+    center = MagicMock()
+    center.id = center_id
+    center.get_tags.return_value = tags
+    if error:
+        center.apply_template.side_effect = error
+    return center
+
+
+class TestPushTemplate:
+    """Tests for the push template run method."""
+
+    def test_run(self):
+        """Test that failures are summarized by center."""
+        centers = [
+            create_center('alpha', []),
+            create_center('beta', [], ApiException(status=500)),
+            create_center('gamma', []),
+            create_center('delta', [], CenterError('bad center')),
+            create_center('epsilon', [], FlywheelError('no project'))
+        ]
+        admin_group = MagicMock()
+        admin_group.get_centers.return_value = centers
+        template = MagicMock()
+
+        errors = run(admin_group=admin_group,
+                     new_only=False,
+                     template=template,
+                     max_workers=2)
+        assert set(errors.keys()) == {'beta', 'delta', 'epsilon'}
+        for center in centers:
+            center.apply_template.assert_called_once_with(template)
+
+    def test_run_new_only(self):
+        """Test that only new centers are pushed."""
+        centers = [
+            create_center('alpha', ['new-center']),
+            create_center('beta', [])
+        ]
+        admin_group = MagicMock()
+        admin_group.get_centers.return_value = centers
+
+        assert not run(
+            admin_group=admin_group, new_only=True, template=MagicMock())
+        centers[0].apply_template.assert_called_once()
+        centers[1].apply_template.assert_not_called()
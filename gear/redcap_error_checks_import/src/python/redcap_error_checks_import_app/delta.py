@@ -0,0 +1,117 @@
+"""Defines the difference between the error checks loaded from S3 and the
+error checks in the QC checks REDCap project."""
+import logging
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+log = logging.getLogger(__name__)
+
+ErrorCheck = Dict[str, Any]
+
+
+class ErrorCheckDelta(BaseModel):
+    """The error checks to import to or delete from REDCap."""
+    added: List[ErrorCheck] = Field(default_factory=list)
+    changed: List[ErrorCheck] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list)
+
+    def updates(self) -> List[ErrorCheck]:
+        """Returns the error checks to import.
+
+        Returns:
+          the added and changed error checks
+        """
+        return self.added + self.changed
+
+    def is_empty(self) -> bool:
+        """Indicates whether there are no differences.
+
+        Returns:
+          True if no error checks are added, changed or removed
+        """
+        return not (self.added or self.changed or self.removed)
+
+
+def get_form_scope(error_check: ErrorCheck) -> Tuple[str, str]:
+    """Returns the form and packet of the error check.
+
+    Args:
+      error_check: the error check
+    Returns:
+      the form name and packet, where packet is empty if there is none
+    """
+    form_name = error_check.get('form_name') or ''
+    packet = error_check.get('packet') or ''
+    return str(form_name), str(packet)
+
+
+def is_same_check(existing: ErrorCheck, error_check: ErrorCheck) -> bool:
+    """Indicates whether the existing error check has the values of the
+    error check.
+
+    Only the fields of the error check are compared, and values are compared
+    as text since REDCap exports all values as text.
+
+    Args:
+      existing: the error check exported from REDCap
+      error_check: the error check loaded from S3
+    Returns:
+      True if the existing check has the same value for each field
+    """
+    return all(
+        str(existing.get(field) or '') == str(value or '')
+        for field, value in error_check.items())
+
+
+def index_error_checks(records: Iterable[ErrorCheck]) -> Dict[str, ErrorCheck]:
+    """Indexes the error checks by error code.
+
+    Args:
+      records: the error checks
+    Returns:
+      the error checks keyed by error code
+    """
+    return {
+        record['error_code']: record
+        for record in records if record.get('error_code')
+    }
+
+
+def compute_delta(*, existing: Dict[str, ErrorCheck],
+                  error_checks: List[ErrorCheck],
+                  include_removed: bool) -> ErrorCheckDelta:
+    """Computes the error checks to import or delete so that REDCap matches
+    the error checks loaded from S3.
+
+    Removed checks are limited to the forms and packets of the loaded error
+    checks, so that checks for modules that were not loaded are kept.
+
+    Args:
+      existing: the error checks in REDCap keyed by error code
+      error_checks: the error checks loaded from S3
+      include_removed: whether to determine the removed error checks
+    Returns:
+      the delta
+    """
+    delta = ErrorCheckDelta()
+    error_codes: Set[str] = set()
+    for error_check in error_checks:
+        error_code = error_check['error_code']
+        error_codes.add(error_code)
+        existing_check = existing.get(error_code)
+        if existing_check is None:
+            delta.added.append(error_check)
+        elif not is_same_check(existing_check, error_check):
+            delta.changed.append(error_check)
+
+    if include_removed:
+        scope = {get_form_scope(error_check) for error_check in error_checks}
+        delta.removed = sorted(
+            error_code for error_code, existing_check in existing.items()
+            if error_code not in error_codes
+            and get_form_scope(existing_check) in scope)
+
+    log.info('Error check changes: %s added, %s changed, %s removed',
+             len(delta.added), len(delta.changed), len(delta.removed))
+    return delta
@@ -12,6 +12,7 @@ from redcap.redcap_connection import REDCapConnectionError
 from redcap.redcap_project import REDCapProject
 from s3.s3_client import S3BucketReader
 
+from .delta import compute_delta, index_error_checks
 from .utils import ErrorCheckImportStats, ErrorCheckKey
 from .visitor import ErrorCheckCSVVisitor
 
@@ -58,42 +59,148 @@ def load_error_check_csv(key: ErrorCheckKey,
     return error_checks
 
 
+def select_error_check_keys(s3_bucket: S3BucketReader,
+                            modules: List[str]) -> List[ErrorCheckKey]:
+    """Lists the error check CSV files for the modules in the bucket.
+
+    Files are selected from the bucket listing, so that only the selected
+    files are downloaded.
+
+    Args:
+        s3_bucket: The S3BucketReader
+        modules: List of modules to import error checks for, or ['all']
+    Returns:
+        the keys of the error check files for the modules
+    """
+    error_keys = []
+    for s3_obj_info in s3_bucket.iter_objects("CSV"):
+        if not s3_obj_info.key.endswith('.csv'):
+            continue
+
+        error_key = ErrorCheckKey.create_from_key(s3_obj_info.key)
+        if modules != ['all'] and error_key.module not in modules:
+            continue
+
+        error_keys.append(error_key)
+
+    return error_keys
+
+
+def import_file(*, redcap_project: REDCapProject,
+                error_checks: List[Dict[str, Any]], full_path: str,
+                dry_run: bool) -> int:
+    """Imports the error checks from a file.
+
+    Args:
+        redcap_project: The QC Checks REDCapProject
+        error_checks: the error checks loaded from the file
+        full_path: the S3 path of the file
+        dry_run: whether to skip the import
+    Returns:
+        the number of records imported
+    Raises:
+        GearExecutionError if the import fails
+    """
+    if dry_run:
+        log.info("DRY RUN: Skipping import.")
+        return 0
+
+    # Upload to REDCap; import each record in JSON format
+    try:
+        num_records = redcap_project.import_records(json.dumps(error_checks),
+                                                    data_format='json')
+    except REDCapConnectionError as error:
+        raise GearExecutionError(error.message) from error
+
+    log.info(f"Imported {num_records} records from {full_path}")
+    return num_records
+
+
+def import_delta(*, redcap_project: REDCapProject,
+                 error_checks: List[Dict[str, Any]], include_removed: bool,
+                 dry_run: bool) -> int:
+    """Imports the error checks that are not already in the REDCap project,
+    and deletes removed error checks.
+
+    The existing error checks are exported once, and the added and changed
+    error checks are imported in chunks.
+
+    Args:
+        redcap_project: The QC Checks REDCapProject
+        error_checks: the error checks loaded from S3
+        include_removed: whether to delete error checks that were removed
+        dry_run: whether to skip changes to the project
+    Returns:
+        the number of records imported
+    Raises:
+        REDCapConnectionError if a request to REDCap fails
+    """
+    records = redcap_project.export_records(
+        fields=list(ErrorCheckCSVVisitor.REQUIRED_HEADERS))
+    assert isinstance(records, list), "expected JSON records"
+
+    delta = compute_delta(existing=index_error_checks(records),
+                          error_checks=error_checks,
+                          include_removed=include_removed)
+    if delta.is_empty():
+        log.info("Error checks are up to date")
+        return 0
+
+    if dry_run:
+        log.info("DRY RUN: Skipping import.")
+        return 0
+
+    num_records = 0
+    if delta.updates():
+        num_records = redcap_project.import_record_list(delta.updates())
+        log.info(f"Imported {num_records} added or changed records")
+
+    if delta.removed:
+        num_deleted = redcap_project.delete_records(delta.removed)
+        log.info(f"Deleted {num_deleted} removed records: {delta.removed}")
+
+    return num_records
+
+
 def run(*,
         proxy: FlywheelProxy,
         s3_bucket: S3BucketReader,
         redcap_project: REDCapProject,
         modules: List[str],
-        fail_fast: bool = True) -> None:
+        fail_fast: bool = True,
+        delta: bool = False) -> None:
     """Runs the REDCAP Error Checks import process.
 
+    If delta is set, the error checks from all files are compared against
+    the checks in REDCap, and only the differences are imported.
+    Otherwise, the checks from each file are imported.
+
     Args:
         proxy: the proxy for the Flywheel instance
         s3_bucket: The S3BucketReader
         redcap_project: The QC Checks REDCapProject
         modules: List of modules to import error checks for
         fail_fast: Whether or not to fail fast on error
+        delta: Whether to only import the differences
     """
     log.info("Running REDCAP error check import")
     bucket = s3_bucket.bucket_name
-    file_objects = s3_bucket.read_directory("CSV")
+    error_keys = select_error_check_keys(s3_bucket, modules)
 
-    if not file_objects:
+    if not error_keys:
         log.error(f"No files found in {bucket}/CSV")
         return
 
     # keep track of import status
     stats = ErrorCheckImportStats()
-    for key, file in file_objects.items():
-        if not key.endswith('.csv'):
-            continue
-
-        error_key = ErrorCheckKey.create_from_key(key)
-        if modules != ['all'] and error_key.module not in modules:
-            continue
+    loaded_checks: List[Dict[str, Any]] = []
+    for error_key in error_keys:
+        key = error_key.full_path
 
         # Load from files from S3
-        full_path = f"s3://{bucket}/{error_key.full_path}"
+        full_path = f"s3://{bucket}/{key}"
         log.info(f"Loading error checks from {full_path}")
+        file = s3_bucket.get_object(key)
         error_checks = load_error_check_csv(error_key, file, stats)
 
         if not error_checks:
@@ -105,15 +212,23 @@ def run(*,
                 stats.add_failed_file(key)
                 continue
 
-        if proxy.dry_run:
-            log.info("DRY RUN: Skipping import.")
+        if delta:
+            loaded_checks.extend(error_checks)
             continue
 
-        # Upload to REDCap; import each record in JSON format
+        stats.add_to_total_records(
+            import_file(redcap_project=redcap_project,
+                        error_checks=error_checks,
+                        full_path=full_path,
+                        dry_run=proxy.dry_run))
+
+    if delta and loaded_checks:
+        # only delete removed checks if every file was loaded
         try:
-            num_records = redcap_project.import_records(
-                json.dumps(error_checks), data_format='json')
-            log.info(f"Imported {num_records} records from {full_path}")
+            num_records = import_delta(redcap_project=redcap_project,
+                                       error_checks=loaded_checks,
+                                       include_removed=not stats.failed_files,
+                                       dry_run=proxy.dry_run)
             stats.add_to_total_records(num_records)
         except REDCapConnectionError as error:
             raise GearExecutionError(error.message) from error
@@ -29,7 +29,8 @@ class REDCapImportErrorChecksVisitor(GearExecutionEnvironment):
                  s3_bucket: S3BucketReader,
                  redcap_project: REDCapProject,
                  modules: List[str],
-                 fail_fast: bool = True):
+                 fail_fast: bool = True,
+                 delta: bool = False):
         """Initializer."""
         super().__init__(client=client)
 
@@ -37,6 +38,7 @@ class REDCapImportErrorChecksVisitor(GearExecutionEnvironment):
         self.__redcap_project = redcap_project
         self.__modules = modules
         self.__fail_fast = fail_fast
+        self.__delta = delta
 
     @classmethod
     def create(
@@ -69,6 +71,9 @@ class REDCapImportErrorChecksVisitor(GearExecutionEnvironment):
         modules: List[str] = get_config(gear_context=context,
                                         key='modules',
                                         default='all').split(',')
+        delta: bool = get_config(gear_context=context,
+                                 key='delta_import',
+                                 default=True)
 
         try:
             redcap_params = parameter_store.get_redcap_report_parameters(  # type: ignore
@@ -92,14 +97,16 @@ class REDCapImportErrorChecksVisitor(GearExecutionEnvironment):
                                               redcap_project=redcap_project,
                                               s3_bucket=s3_bucket,
                                               modules=modules,
-                                              fail_fast=fail_fast)
+                                              fail_fast=fail_fast,
+                                              delta=delta)
 
     def run(self, context: GearToolkitContext) -> None:
         run(proxy=self.proxy,
             s3_bucket=self.__s3_bucket,
             redcap_project=self.__redcap_project,
             modules=self.__modules,
-            fail_fast=self.__fail_fast)
+            fail_fast=self.__fail_fast,
+            delta=self.__delta)
 
 
 def main():
@@ -0,0 +1,94 @@
+"""Tests the delta of error checks against REDCap."""
+from unittest.mock import MagicMock
+
+from redcap_error_checks_import_app.delta import compute_delta, index_error_checks
+from redcap_error_checks_import_app.main import import_delta
+
+
+def error_check(error_code: str, short_desc: str = 'must be present'):
+    """Creates an error check for the a1 form."""
+    return {
+        'error_code': error_code,
+        'form_name': 'a1',
+        'packet': 'I',
+        'short_desc': short_desc
+    }
+
+
+class TestComputeDelta:
+    """Tests the compute_delta method."""
+
+    def test_up_to_date(self):
+        """Test that unchanged checks are not imported."""
+        existing = index_error_checks([error_check('a1-ivp-m-001')])
+        delta = compute_delta(existing=existing,
+                              error_checks=[error_check('a1-ivp-m-001')],
+                              include_removed=True)
+        assert delta.is_empty()
+
+    def test_changes(self):
+        """Test that added, changed and removed checks are found."""
+        existing = index_error_checks([
+            error_check('a1-ivp-m-001'),
+            error_check('a1-ivp-m-002'),
+            error_check('a1-ivp-m-003'), {
+                'error_code': 'b1-ivp-m-001',
+                'form_name': 'b1',
+                'packet': 'I'
+            }
+        ])
+        delta = compute_delta(existing=existing,
+                              error_checks=[
+                                  error_check('a1-ivp-m-001'),
+                                  error_check('a1-ivp-m-002', 'changed'),
+                                  error_check('a1-ivp-m-004')
+                              ],
+                              include_removed=True)
+        assert [check['error_code']
+                for check in delta.added] == ['a1-ivp-m-004']
+        assert [check['error_code']
+                for check in delta.changed] == ['a1-ivp-m-002']
+        assert delta.removed == ['a1-ivp-m-003']
+
+    def test_without_removed(self):
+        """Test that removed checks are skipped unless requested."""
+        existing = index_error_checks([error_check('a1-ivp-m-003')])
+        delta = compute_delta(existing=existing,
+                              error_checks=[error_check('a1-ivp-m-001')],
+                              include_removed=False)
+        assert not delta.removed
+
+
+class TestImportDelta:
+    """Tests the import_delta method."""
+
+    def test_import(self):
+        """Test that only the delta is imported."""
+        project = MagicMock()
+        project.export_records.return_value = [
+            error_check('a1-ivp-m-001'),
+            error_check('a1-ivp-m-003')
+        ]
+        project.import_record_list.return_value = 1
+        assert import_delta(redcap_project=project,
+                            error_checks=[
+                                error_check('a1-ivp-m-001'),
+                                error_check('a1-ivp-m-002')
+                            ],
+                            include_removed=True,
+                            dry_run=False) == 1
+        project.export_records.assert_called_once()
+        project.import_record_list.assert_called_once_with(
+            [error_check('a1-ivp-m-002')])
+        project.delete_records.assert_called_once_with(['a1-ivp-m-003'])
+
+    def test_dry_run(self):
+        """Test that a dry run does not change the project."""
+        project = MagicMock()
+        project.export_records.return_value = []
+        import_delta(redcap_project=project,
+                     error_checks=[error_check('a1-ivp-m-001')],
+                     include_removed=True,
+                     dry_run=True)
+        project.import_record_list.assert_not_called()
+        project.delete_records.assert_not_called()
@@ -0,0 +1,47 @@
+"""Tests the select_error_check_keys method."""
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+from redcap_error_checks_import_app.main import run, select_error_check_keys
+from s3.s3_client import S3ObjectInfo
+
+
+# pylint: disable=(redefined-outer-name)
+@pytest.fixture(scope='function')
+def s3_bucket():
+    """Creates a mock bucket listing error check files for two modules."""
+    bucket = MagicMock()
+    bucket.bucket_name = 'dummy-bucket'
+    bucket.iter_objects.return_value = [
+        S3ObjectInfo(key='CSV/UDS/4.0/I/form_a1_ivp_error_checks_mc.csv'),
+        S3ObjectInfo(key='CSV/UDS/4.0/I/README.txt'),
+        S3ObjectInfo(key='CSV/FTLD/3.0/I/form_b1_ivp_error_checks_mc.csv'),
+    ]
+    return bucket
+
+
+class TestSelectErrorCheckKeys:
+    """Tests the select_error_check_keys method."""
+
+    def test_all_modules(self, s3_bucket):
+        """Test that all CSV files are selected."""
+        keys = select_error_check_keys(s3_bucket, ['all'])
+        assert [key.module for key in keys] == ['UDS', 'FTLD']
+
+    def test_module_filter(self, s3_bucket):
+        """Test that files are filtered by module."""
+        keys = select_error_check_keys(s3_bucket, ['FTLD'])
+        assert [key.form_name for key in keys] == ['b1']
+
+    def test_run_downloads_selected(self, s3_bucket):
+        """Test that only the selected files are downloaded."""
+        s3_bucket.get_object.return_value = {'Body': BytesIO(b'')}
+        proxy = MagicMock()
+        run(proxy=proxy,
+            s3_bucket=s3_bucket,
+            redcap_project=MagicMock(),
+            modules=['UDS'],
+            fail_fast=True)
+        s3_bucket.get_object.assert_called_once_with(
+            'CSV/UDS/4.0/I/form_a1_ivp_error_checks_mc.csv')
@@ -221,6 +221,12 @@ class REDCapFlywheelTransferVisitor(GearExecutionEnvironment):
                 'REDCap project information not found for '
                 f'{group_id}/{project.label}')
 
+        # load credentials for all projects with one parameter store request
+        try:
+            self.__param_store.prefetch(self.__param_path)
+        except ParameterError as error:
+            log.warning('Failed to prefetch REDCap credentials: %s', error)
+
         failed_count = 0
         for redcap_project in redcap_projects.values():
             redcap_con = self.get_redcap_connection(redcap_project)
@@ -1,35 +1,111 @@
 """Defines REDCap Project Info Management."""
 
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 
-from centers.center_group import REDCapProjectInput
+from centers.center_group import CenterError, REDCapProjectInput
 from centers.nacc_group import NACCGroup
+from flywheel.rest import ApiException
+from flywheel_adaptor.flywheel_proxy import FlywheelError
 
 log = logging.getLogger(__name__)
 
+DEFAULT_MAX_WORKERS = 4
 
-def run(*, project_list: List[REDCapProjectInput], admin_group: NACCGroup):
+
+def group_by_center(
+    project_list: List[REDCapProjectInput]
+) -> Dict[str, List[REDCapProjectInput]]:
+    """Groups the REDCap project information by center.
+
+    Args:
+      project_list: the list of REDCap project information
+    Returns:
+      the project information for each center keyed by center ID
+    """
+    center_projects: Dict[str, List[REDCapProjectInput]] = {}
+    for project_input in project_list:
+        center_projects.setdefault(project_input.center_id,
+                                   []).append(project_input)
+
+    return center_projects
+
+
+def add_center_projects(
+        *, admin_group: NACCGroup, adcid: int,
+        project_list: List[REDCapProjectInput]) -> Optional[str]:
+    """Adds the REDCap project information to the center.
+
+    Args:
+      admin_group: the NACC group object
+      adcid: the ADCID of the center
+      project_list: the REDCap project information for the center
+    Returns:
+      the error message if the information could not be added. None,
+      otherwise
+    """
+    try:
+        center_group = admin_group.get_center(adcid)
+        if not center_group:
+            log.error("Center with ADCID %s not found", adcid)
+            return None
+
+        center_group.add_redcap_projects(project_list)
+    except (ApiException, CenterError, FlywheelError) as error:
+        return str(error)
+
+    return None
+
+
+def run(*,
+        project_list: List[REDCapProjectInput],
+        admin_group: NACCGroup,
+        max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, str]:
     """Adds REDCap project information from the list to the center info object.
 
+    The information is grouped by center, so that the project metadata of
+    each center is read and written once, and centers are updated
+    concurrently.
+
     Args:
       project_list: the list of REDCap project information
       admin_group: the NACC group object
+      max_workers: the maximum number of centers updated concurrently
+    Returns:
+      error messages keyed by center ID for centers that failed
     """
 
     center_map = admin_group.get_center_map()
     id_map = {info.group: info for info in center_map.centers.values()}
 
-    for project_input in project_list:
-        log.info("Adding info to center %s", project_input.center_id)
-        center_info = id_map.get(project_input.center_id)
+    errors: Dict[str, str] = {}
+    center_projects = {}
+    for center_id, projects in group_by_center(project_list).items():
+        center_info = id_map.get(center_id)
         if not center_info:
-            log.error("Center %s not found", project_input.center_id)
+            log.error("Center %s not found", center_id)
             continue
 
-        center_group = admin_group.get_center(center_info.adcid)
-        if not center_group:
-            log.error("Center with ADCID %s not found", center_info.adcid)
-            continue
+        center_projects[center_id] = (center_info.adcid, projects)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(add_center_projects,
+                            admin_group=admin_group,
+                            adcid=adcid,
+                            project_list=projects):
+            center_id
+            for center_id, (adcid, projects) in center_projects.items()
+        }
+        for future in as_completed(futures):
+            center_id = futures[future]
+            message = future.result()
+            if message:
+                log.error("Failed to add info to center %s: %s", center_id,
+                          message)
+                errors[center_id] = message
+            else:
+                log.info("Added info to center %s", center_id)
 
-        center_group.add_redcap_project(project_input)
+    return errors
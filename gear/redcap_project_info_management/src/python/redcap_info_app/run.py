@@ -16,7 +16,7 @@ from inputs.parameter_store import ParameterStore
 from inputs.yaml import YAMLReadError, load_from_stream
 from pydantic import ValidationError
 
-from redcap_info_app.main import run
+from redcap_info_app.main import DEFAULT_MAX_WORKERS, run
 
 log = logging.getLogger(__name__)
 
@@ -24,11 +24,15 @@ log = logging.getLogger(__name__)
 class REDCapProjectInfoVisitor(GearExecutionEnvironment):
     """Visitor for the REDCap Project Info Management gear."""
 
-    def __init__(self, admin_id: str, client: ClientWrapper,
-                 input_filepath: str):
+    def __init__(self,
+                 admin_id: str,
+                 client: ClientWrapper,
+                 input_filepath: str,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
         super().__init__(client=client)
         self.__admin_id = admin_id
         self.__input_file_path = input_filepath
+        self.__max_workers = max_workers
 
     @classmethod
     def create(
@@ -46,20 +50,27 @@ class REDCapProjectInfoVisitor(GearExecutionEnvironment):
         if not input_file_path:
             raise GearExecutionError('No input file provided')
 
-        return REDCapProjectInfoVisitor(admin_id=context.config.get(
-            "admin_group", "nacc"),
-                                        client=client,
-                                        input_filepath=input_file_path)
+        return REDCapProjectInfoVisitor(
+            admin_id=context.config.get("admin_group", "nacc"),
+            client=client,
+            input_filepath=input_file_path,
+            max_workers=context.config.get("max_workers", DEFAULT_MAX_WORKERS))
 
     def run(self, context: GearToolkitContext) -> None:
         """Run the REDCap Project Info Management gear.
 
         Args:
             context: the gear execution context
+        Raises:
+            GearExecutionError: If info could not be added to any center.
         """
         project_list = self.__get_project_list(self.__input_file_path)
-        run(project_list=project_list,
-            admin_group=self.admin_group(admin_id=self.__admin_id))
+        errors = run(project_list=project_list,
+                     admin_group=self.admin_group(admin_id=self.__admin_id),
+                     max_workers=self.__max_workers)
+        if errors:
+            raise GearExecutionError("Failed to add REDCap project info to "
+                                     f"centers: {', '.join(sorted(errors))}")
 
     # pylint: disable=no-self-use
     def __get_project_list(self,
@@ -0,0 +1,95 @@
+"""Tests for REDCap project info management."""
+from unittest.mock import MagicMock
+
+from centers.center_group import (
+    CenterError,
+    REDCapFormProjectMetadata,
+    REDCapProjectInput,
+)
+from centers.center_info import CenterInfo, CenterMapInfo
+from flywheel_adaptor.flywheel_proxy import FlywheelError
+from redcap_info_app.main import run
+
+
+def project_input(center_id: str, label: str) -> REDCapProjectInput:
+    """Creates REDCap project info for the center."""
+    return REDCapProjectInput(
+        center_id=center_id,
+        study_id='adrc',
+        project_label='ingest-form',
+        projects=[REDCapFormProjectMetadata(redcap_pid=1, label=label)])
+
+
+def create_admin_group(centers):
+    """Creates a mock admin group with a center group for each ADCID."""
+    admin_group = MagicMock()
+    admin_group.get_center_map.return_value = CenterMapInfo(
+        centers={
+            adcid: CenterInfo(adcid=adcid, name=group, group=group)
+            for adcid, group in centers.items()
+        })
+    center_groups = {adcid: MagicMock() for adcid in centers}
+    admin_group.get_center.side_effect = center_groups.get
+    return admin_group, center_groups
+
+
+class TestREDCapInfo:
+    """Tests for the REDCap project info run."""
+
+    def test_grouped_by_center(self):
+        """Test that each center is updated once with all of its projects."""
+        admin_group, center_groups = create_admin_group({
+            1: 'alpha',
+            2: 'beta'
+        })
+        errors = run(project_list=[
+            project_input('alpha', 'udsv4'),
+            project_input('beta', 'udsv4'),
+            project_input('alpha', 'ftldv4'),
+            project_input('gamma', 'udsv4')
+        ],
+                     admin_group=admin_group)
+        assert not errors
+        center_groups[1].add_redcap_projects.assert_called_once()
+        projects = center_groups[1].add_redcap_projects.call_args.args[0]
+        assert [project.projects[0].label
+                for project in projects] == ['udsv4', 'ftldv4']
+        center_groups[2].add_redcap_projects.assert_called_once()
+
+    def test_center_error(self):
+        """Test that a failed center is reported and others continue."""
+        admin_group, center_groups = create_admin_group({
+            1: 'alpha',
+            2: 'beta'
+        })
+        center_groups[1].add_redcap_projects.side_effect = CenterError(
+            'bad info')
+        errors = run(project_list=[
+            project_input('alpha', 'udsv4'),
+            project_input('beta', 'udsv4')
+        ],
+                     admin_group=admin_group)
+        assert errors == {'alpha': 'bad info'}
+        center_groups[2].add_redcap_projects.assert_called_once()
+
+    def test_group_error(self):
+        """Test that a center group that cannot be found is reported and
+        others continue."""
+        admin_group, center_groups = create_admin_group({
+            1: 'alpha',
+            2: 'beta'
+        })
+
+        def get_center(adcid):
+            if adcid == 1:
+                raise FlywheelError('no group')
+            return center_groups[adcid]
+
+        admin_group.get_center.side_effect = get_center
+        errors = run(project_list=[
+            project_input('alpha', 'udsv4'),
+            project_input('beta', 'udsv4')
+        ],
+                     admin_group=admin_group)
+        assert errors == {'alpha': 'no group'}
+        center_groups[2].add_redcap_projects.assert_called_once()
@@ -1,7 +1,7 @@
 """The run script for the user management gear."""
 
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from coreapi_client.api.default_api import DefaultApi
 from coreapi_client.api_client import ApiClient
@@ -15,11 +15,16 @@ from gear_execution.gear_execution import (
     GearExecutionError,
 )
 from inputs.parameter_store import ParameterError, ParameterStore
-from inputs.yaml import YAMLReadError, load_from_stream
+from inputs.yaml import YAMLReadError, load_from_file
 from notifications.email import EmailClient, create_ses_client
 from pydantic import ValidationError
 from redcap.redcap_repository import REDCapParametersRepository
 from users.authorizations import AuthMap
+from users.directory_changes import (
+    APPLIED_VERSION,
+    PENDING_EMAILS,
+    DirectoryChangeSet,
+)
 from users.nacc_directory import UserEntry, UserFormatError
 from users.user_processes import (
     NotificationClient,
@@ -59,6 +64,7 @@ class UserManagementVisitor(GearExecutionEnvironment):
         self.__redcap_param_repo = redcap_param_repo
         self.__notification_mode: NotificationModeType = notification_mode
         self.__portal_url = portal_url
+        self.__change_set: Optional[DirectoryChangeSet] = None
 
     @classmethod
     def create(
@@ -129,8 +135,17 @@ class UserManagementVisitor(GearExecutionEnvironment):
     def run(self, context: GearToolkitContext) -> None:
         """Executes the gear.
 
+        Notification emails are queued while users are processed, and sent
+        in bulk at the end of the run.
+        If the user file is a directory change set, the change set is recorded
+        as applied once the users are processed, along with the active users
+        that are not yet fully set up.
+
         Args:
             context: the gear execution context
+        Raises:
+            GearExecutionError if there is a registry error, or notification
+            emails could not be sent
         """
         assert self.__user_filepath, 'User directory file required'
         assert self.__auth_filepath, 'User role file required'
@@ -142,45 +157,71 @@ class UserManagementVisitor(GearExecutionEnvironment):
             admin_group = self.admin_group(admin_id=self.__admin_id)
             admin_group.set_redcap_param_repo(self.__redcap_param_repo)
 
+            notification_client = NotificationClient(
+                configuration_set_name="user-creation-claims",
+                email_client=EmailClient(client=create_ses_client(),
+                                         source=self.__email_source),
+                portal_url=self.__portal_url,
+                mode=self.__notification_mode,
+                batch=True)
             try:
+                environment = UserProcessEnvironment(
+                    admin_group=admin_group,
+                    authorization_map=self.__get_auth_map(
+                        self.__auth_filepath),
+                    notification_client=notification_client,
+                    proxy=self.proxy,
+                    registry=UserRegistry(
+                        api_instance=DefaultApi(comanage_client),
+                        coid=self.__comanage_coid))
                 run(
                     user_queue=self.__get_user_queue(self.__user_filepath),
-                    user_process=UserProcess(
-                        environment=UserProcessEnvironment(
-                            admin_group=admin_group,
-                            authorization_map=self.__get_auth_map(
-                                self.__auth_filepath),
-                            notification_client=NotificationClient(
-                                configuration_set_name="user-creation-claims",
-                                email_client=EmailClient(
-                                    client=create_ses_client(),
-                                    source=self.__email_source),
-                                portal_url=self.__portal_url,
-                                mode=self.__notification_mode),
-                            proxy=self.proxy,
-                            registry=UserRegistry(api_instance=DefaultApi(
-                                comanage_client),
-                                                  coid=self.__comanage_coid))),
+                    user_process=UserProcess(environment=environment),
                 )
+                if self.__change_set is not None and not self.client.dry_run:
+                    self.__record_applied(
+                        context,
+                        pending=sorted(
+                            entry.email
+                            for entry in self.__change_set.entries()
+                            if entry.active and entry.email not in
+                            environment.completed_emails))
             except RegistryError as error:
                 raise GearExecutionError(
                     f'User registry error: {error}') from error
+            finally:
+                # send notifications for the users that were processed
+                failures = [
+                    status for status in notification_client.flush()
+                    if not status.success
+                ]
+
+            if failures:
+                raise GearExecutionError(
+                    f'Failed to send {len(failures)} notification emails')
 
     def __get_user_queue(self, user_file_path: str) -> UserQueue[UserEntry]:
         """Get the active user objects from the user file.
 
+        The user file is either the list of all directory entries, or a
+        change set with the entries added, modified or archived since the
+        previous directory pull.
+
         Args:
             user_file_path: The path to the user file.
         Returns:
             List of user objects
         """
         try:
-            with open(user_file_path, 'r', encoding='utf-8') as user_file:
-                object_list = load_from_stream(user_file)
+            object_list = load_from_file(user_file_path)
         except YAMLReadError as error:
             raise GearExecutionError(
                 f'No users read from user file {user_file_path}: {error}'
             ) from error
+        if DirectoryChangeSet.is_change_set(object_list):
+            self.__change_set = self.__load_change_set(object_list)
+            return self.__get_change_queue(self.__change_set)
+
         if not object_list:
             raise GearExecutionError('No users found in user file')
 
@@ -196,6 +237,70 @@ class UserManagementVisitor(GearExecutionEnvironment):
 
         return user_list
 
+    @staticmethod
+    def __load_change_set(change_object: Dict[str, Any]) -> DirectoryChangeSet:
+        """Creates the directory change set from the user file object.
+
+        Args:
+            change_object: the change set loaded from the user file
+        Returns:
+            the directory change set
+        Raises:
+            GearExecutionError if an entry of the change set is invalid
+        """
+        try:
+            return DirectoryChangeSet.create(change_object)
+        except UserFormatError as error:
+            raise GearExecutionError(
+                f'Error reading directory change set: {error}') from error
+
+    @staticmethod
+    def __get_change_queue(
+            changes: DirectoryChangeSet) -> UserQueue[UserEntry]:
+        """Get the user objects from a directory change set.
+
+        Args:
+            changes: the directory change set
+        Returns:
+            Queue of changed user objects
+        """
+        log.info('Processing %s added, %s modified and %s archived users',
+                 len(changes.added), len(changes.modified),
+                 len(changes.archived))
+        user_list: UserQueue[UserEntry] = UserQueue()
+        for user_entry in changes.entries():
+            user_list.enqueue(user_entry)
+
+        return user_list
+
+    @staticmethod
+    def __record_applied(context: GearToolkitContext,
+                         pending: List[str]) -> None:
+        """Records the version of the change set file as applied in the file
+        info, so that the directory pull advances its snapshot.
+
+        The emails of pending entries are recorded so that the directory pull
+        leaves them out of the snapshot, and they are in the next change set.
+
+        Args:
+            context: the gear execution context
+            pending: emails of active entries whose users are not set up
+        """
+        user_input = context.get_input('user_file')
+        if not user_input:
+            log.warning('No user file input, change set not recorded')
+            return
+
+        version = user_input['object'].get('version')
+        log.info(
+            'Recording version %s of change set as applied, '
+            'with %s pending users', version, len(pending))
+        context.metadata.update_file_metadata(user_input,
+                                              info={
+                                                  APPLIED_VERSION: version,
+                                                  PENDING_EMAILS: pending
+                                              })
+
     def __get_auth_map(self, auth_file_path: str) -> AuthMap:
         """Get the authorization map from the auth file.
 
@@ -205,9 +310,8 @@ class UserManagementVisitor(GearExecutionEnvironment):
             The authorization map
         """
         try:
-            with open(auth_file_path, 'r', encoding='utf-8') as auth_file:
-                auth_object = load_from_stream(auth_file)
-                auth_map = AuthMap(project_authorizations=auth_object)
+            auth_object = load_from_file(auth_file_path)
+            auth_map = AuthMap(project_authorizations=auth_object)
         except YAMLReadError as error:
             raise GearExecutionError('No authorizations read from auth file'
                                      f'{auth_file_path}: {error}') from error